@@ -0,0 +1,243 @@
+"""
+Keeps the pre-scaled frames and backgrounds on disk between runs, so a warm
+start copies raw pixels out of one memory-mapped file instead of cutting
+and scaling them out of the sprite sheets again.  The file is ignored (and
+rewritten on the next save) whenever an image in resources/graphics changes.
+
+    python -m SuperMarioLevel1.data.asset_cache --build
+    python -m SuperMarioLevel1.data.asset_cache --benchmark
+"""
+
+import os
+import hashlib
+import json
+import mmap
+import struct
+import pygame as pg
+
+MAGIC = b'MARIOAC1'
+HEADER = struct.Struct('<8s40sI')
+SOURCE_TYPES = ('.png', '.jpg', '.bmp')
+
+
+def source_digest(directory):
+    """sha1 of the names and contents of the images in directory"""
+    digest = hashlib.sha1()
+    for filename in sorted(os.listdir(directory)):
+        if os.path.splitext(filename)[1].lower() in SOURCE_TYPES:
+            digest.update(filename.encode('utf-8'))
+            with open(os.path.join(directory, filename), 'rb') as source:
+                digest.update(source.read())
+    return digest.hexdigest()
+
+
+def pixel_format(image):
+    """The pygame string format image is stored in.  Per-pixel alpha is
+    stored as BGRA, the layout convert_alpha gives on the usual 32 bit
+    displays, so those images need no conversion when loaded"""
+    return 'BGRA' if image.get_flags() & pg.SRCALPHA else 'RGB'
+
+
+class AssetCache(object):
+    """Surfaces stored by key as raw RGB/RGBA pixels in a single file.
+    The file starts with a header holding the sha1 of the source images
+    and a JSON index of (offset, size, format, colorkey) per key, and is
+    mapped into memory once when the cache is created.  Surfaces put
+    during a run are only written out by save."""
+    def __init__(self, path, source_dir):
+        self.path = path
+        self.digest = source_digest(source_dir)
+        self.index = {}
+        self.data = None
+        self.new = {}
+        self.hits = 0
+        self.misses = 0
+        self.load()
+
+    def load(self):
+        """Maps the cache file if it was built from the current images"""
+        try:
+            with open(self.path, 'rb') as cache_file:
+                data = mmap.mmap(cache_file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (IOError, OSError, ValueError):
+            return False
+        if len(data) < HEADER.size:
+            data.close()
+            return False
+        magic, digest, index_length = HEADER.unpack_from(data)
+        if magic != MAGIC or digest != self.digest.encode('ascii'):
+            data.close()
+            return False
+        start = HEADER.size + index_length
+        index = json.loads(data[HEADER.size:start].decode('utf-8'))
+        self.index = {}
+        for key, (offset, size, fmt, colorkey) in index.items():
+            self.index[key] = (start + offset, tuple(size), fmt, colorkey)
+        self.data = data
+        return True
+
+    def get(self, key, read_only=False):
+        """Returns a Surface with the pixels stored for key, or None.
+        With read_only, images with per-pixel alpha are handed out
+        straight from the mapped file without a copy, and must only be
+        blitted from.  Anything else is copied, and converted if there
+        is a display."""
+        entry = self.index.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        offset, size, fmt, colorkey = entry
+        length = size[0] * size[1] * len(fmt)
+        if read_only:
+            pixels = memoryview(self.data)[offset:offset + length]
+        else:
+            pixels = self.data[offset:offset + length]
+        image = pg.image.frombuffer(pixels, size, fmt)
+        if fmt == 'RGB' and pg.display.get_surface() is not None:
+            image = image.convert()
+        if colorkey is not None:
+            image.set_colorkey(colorkey)
+        return image
+
+    def put(self, key, image):
+        """Adds image under key the next time the cache is saved.  Empty
+        images are left out, they are as cheap to make as to load"""
+        width, height = image.get_size()
+        if width and height:
+            self.new[key] = image
+
+    def save(self):
+        """Rewrites the cache file with everything put since the last load.
+        Returns False when there was nothing new to write"""
+        if not self.new:
+            return False
+        index = {}
+        blobs = []
+        offset = 0
+        for key, (start, size, fmt, colorkey) in self.index.items():
+            if key not in self.new:
+                length = size[0] * size[1] * len(fmt)
+                blobs.append(self.data[start:start + length])
+                index[key] = (offset, size, fmt, colorkey)
+                offset += length
+        for key, image in self.new.items():
+            fmt = pixel_format(image)
+            colorkey = image.get_colorkey()
+            blobs.append(pg.image.tostring(image, fmt))
+            index[key] = (offset, image.get_size(), fmt,
+                          colorkey and list(colorkey[:3]))
+            offset += len(blobs[-1])
+
+        index_bytes = json.dumps(index, sort_keys=True).encode('utf-8')
+        directory = os.path.dirname(self.path)
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory)
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'wb') as cache_file:
+            cache_file.write(HEADER.pack(MAGIC, self.digest.encode('ascii'),
+                                         len(index_bytes)))
+            cache_file.write(index_bytes)
+            for blob in blobs:
+                cache_file.write(blob)
+        try:
+            os.replace(temp_path, self.path)
+        except OSError:
+            # the old file can't be replaced while mapped on some systems
+            os.remove(temp_path)
+            return False
+        self.new = {}
+        self.load()
+        return True
+
+    def clear(self):
+        """Deletes the cache file and forgets what was loaded from it"""
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        self.index = {}
+        self.data = None
+        self.new = {}
+
+
+STARTUP = """import time
+start = time.perf_counter()
+from {package} import setup, headless
+from {package}.states import main_menu, level1
+loaded = time.perf_counter()
+main_menu.Menu()
+level1.Level1().startup(0.0, headless.new_game_info())
+print(time.perf_counter() - start, time.perf_counter() - loaded)
+"""
+
+
+def build():
+    """Starts the menu and the level once, so every frame they cut out
+    of the sprite sheets goes in the cache, and saves it"""
+    from . import setup, headless
+    from .states import main_menu, level1
+    main_menu.Menu()
+    level1.Level1().startup(0.0, headless.new_game_info())
+    setup.ASSETS.save()
+    return setup.ASSETS
+
+
+def time_startup(code, env):
+    """Runs the startup code in a fresh process and returns its times"""
+    import subprocess
+    import sys
+    output = subprocess.check_output([sys.executable, '-c', code], env=env)
+    return [float(seconds) for seconds in output.decode().split()[-2:]]
+
+
+def benchmark(runs):
+    """Median seconds from importing setup to a started Level1, and for
+    just creating the Menu and starting Level1, without and with the
+    cache file.  Cold and warm runs take turns so that system noise hits
+    both alike"""
+    from . import setup
+    assets = setup.ASSETS
+    assets.clear()
+    build()
+    package_root = os.path.dirname(os.path.dirname(
+        os.path.dirname(os.path.abspath(__file__))))
+    env = dict(os.environ, MARIO_HEADLESS='1',
+               PYTHONPATH=os.pathsep.join(
+                   filter(None, [package_root, os.environ.get('PYTHONPATH')])))
+    code = STARTUP.format(package=__package__ or 'SuperMarioLevel1.data')
+    cold = []
+    warm = []
+    for run in range(runs):
+        os.rename(assets.path, assets.path + '.off')
+        try:
+            cold.append(time_startup(code, env))
+        finally:
+            os.rename(assets.path + '.off', assets.path)
+        warm.append(time_startup(code, env))
+    median = lambda times: [sorted(column)[runs // 2] for column in zip(*times)]
+    return median(cold), median(warm)
+
+
+def main():
+    import argparse
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    os.environ.setdefault('MARIO_HEADLESS', '1')
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--build', action='store_true')
+    parser.add_argument('--benchmark', action='store_true')
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    if args.benchmark:
+        cold, warm = benchmark(args.runs)
+        print('median of {} runs    import to level   menu + level'.format(args.runs))
+        for name, (total, states) in (('cold', cold), ('warm', warm)):
+            print('{}               {:8.1f} ms    {:8.1f} ms'.format(
+                name, total * 1000, states * 1000))
+    elif args.build:
+        assets = build()
+        print('{} surfaces in {}'.format(len(assets.index), assets.path))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,157 @@
+"""
+Steps many independent copies of 1-1 in lockstep, for agent training.
+Every copy is a headless.Simulator with its own Level1, while the images,
+sounds, frame bank and static LevelTemplate they use are loaded once and
+shared read-only.  step takes one key bitmask per copy and returns the
+observations, rewards and done flags stacked into NumPy arrays.
+
+    python -m SuperMarioLevel1.data.batch_env --envs 16 --steps 1000
+"""
+
+import os
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+os.environ.setdefault('MARIO_HEADLESS', '1')
+
+import time
+import numpy as np
+from . import headless
+from . import tools
+from . import constants as c
+
+
+class StateObservation(object):
+    """Mario's position, speed and form, the camera position and the time
+    left, as one row of floats per level"""
+    shape = (9,)
+    dtype = np.float32
+    names = ('x', 'y', 'x_vel', 'y_vel', 'big', 'fire', 'dead',
+             'viewport_x', 'time')
+    render = False
+
+    def reset(self, index):
+        """Called when copy index starts over"""
+
+    def fill(self, simulators, out):
+        """Writes the observation of each simulator's level into its row
+        of out"""
+        levels = [simulator.level for simulator in simulators]
+        out[:] = [(level.mario.rect.x, level.mario.rect.y,
+                   level.mario.x_vel, level.mario.y_vel,
+                   level.mario.big, level.mario.fire, level.mario.dead,
+                   level.viewport.x, level.overhead_info_display.time)
+                  for level in levels]
+
+
+class BatchEnv(object):
+    """N Level1 simulations stepped together.  The reward for a step is
+    how far right Mario got (in pixels) plus score_weight times the points
+    scored.  An episode is done when Mario dies or the level is finished,
+    and that copy starts over from the beginning of the level on the next
+    step, by restoring a snapshot taken when it was created."""
+    def __init__(self, n, observation=None, score_weight=0.01, fps=60):
+        self.observation = observation or StateObservation()
+        self.simulators = [headless.Simulator(render=self.observation.render, fps=fps)
+                           for index in range(n)]
+        self.levels = [simulator.level for simulator in self.simulators]
+        self.starts = [simulator.snapshot() for simulator in self.simulators]
+        self.score_weight = score_weight
+        self.observations = np.zeros((n,) + self.observation.shape,
+                                     self.observation.dtype)
+        self.rewards = np.zeros(n, np.float32)
+        self.dones = np.zeros(n, bool)
+        self.episodes = np.zeros(n, np.int64)
+        self.progress = [(level.mario.rect.x, 0) for level in self.levels]
+        self.steps = 0
+        self.seconds = 0.0
+
+    def __len__(self):
+        return len(self.simulators)
+
+    def reset(self):
+        """Starts every copy over and returns the observations"""
+        for index in range(len(self.simulators)):
+            self.reset_one(index)
+        self.dones[:] = False
+        self.observation.fill(self.simulators, self.observations)
+        return self.observations
+
+    def reset_one(self, index):
+        """Puts copy index back to the start of the level, redrawing it if
+        the observation is rendered"""
+        simulator = self.simulators[index]
+        simulator.restore(self.starts[index])
+        if simulator.surface is not None:
+            simulator.level.blit_everything(simulator.surface)
+        self.observation.reset(index)
+        self.progress[index] = (self.levels[index].mario.rect.x, 0)
+
+    def step(self, actions, repeat=1):
+        """Advances every copy repeat frames with the keys in its mask of
+        actions held down, drawing only the last.  Returns the (n,) +
+        observation.shape observations and the (n,) rewards and done
+        flags, the rewards summed over the frames.  The arrays are reused
+        by the next step, so copy them to keep them."""
+        start = time.perf_counter()
+        if hasattr(actions, 'tolist'):
+            actions = actions.tolist()
+        rewards = []
+        dones = []
+        frames = 0
+        score_weight = self.score_weight
+        for index, simulator in enumerate(self.simulators):
+            if self.dones[index]:
+                self.reset_one(index)
+            frame = simulator.frame
+            finished = simulator.step(actions[index], repeat)
+            frames += simulator.frame - frame
+            level = simulator.level
+            mario = level.mario
+            x, points = self.progress[index]
+            score = level.game_info[c.SCORE]
+            self.progress[index] = (mario.rect.x, score)
+            rewards.append(mario.rect.x - x + (score - points) * score_weight)
+            dones.append(finished or mario.dead)
+        self.rewards[:] = rewards
+        self.dones[:] = dones
+        self.episodes += self.dones
+        self.observation.fill(self.simulators, self.observations)
+        self.steps += frames
+        self.seconds += time.perf_counter() - start
+        return self.observations, self.rewards, self.dones
+
+    def steps_per_second(self):
+        """Environment steps (frames of one copy, counting only those that
+        ran when a copy ended partway through a repeat) per second over
+        every step so far"""
+        if not self.seconds:
+            return 0.0
+        return self.steps / self.seconds
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--envs', type=int, default=16)
+    parser.add_argument('--steps', type=int, default=1000,
+                        help='lockstep steps, each repeat frames of every copy')
+    parser.add_argument('--repeat', type=int, default=1,
+                        help='frames each action is held for')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    keys = tools.KEY_BITS
+    run = keys[tools.keybinding['right']] | keys[tools.keybinding['action']]
+    jump = keys[tools.keybinding['jump']]
+    rng = np.random.default_rng(args.seed)
+    env = BatchEnv(args.envs)
+    env.reset()
+    for step in range(args.steps):
+        env.step(np.where(rng.random(args.envs) < 0.3, run | jump, run), args.repeat)
+    print('{} envs x {} steps in {:.2f}s - {:.0f} env-steps/sec, {} episodes '
+          'finished'.format(args.envs, args.steps, env.seconds,
+                            env.steps_per_second(), int(env.episodes.sum())))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,354 @@
+"""
+Times the game on named scenarios.  Each one is the title screen or a
+real Level1, readied without being timed and then driven by a scripted
+input trace, and reports frames/sec, per-phase times and allocations per
+frame.  Results are written as JSON, and compare flags regressions
+against a stored baseline.
+
+    python -m SuperMarioLevel1.data.benchmark run --output bench.json
+    python -m SuperMarioLevel1.data.benchmark compare bench.json
+    python -m SuperMarioLevel1.data.benchmark record
+    python -m SuperMarioLevel1.data.benchmark memory
+
+record searches for a new 1-1 run trace, needed if the level's rules
+change so the stored one no longer reaches the flag.  memory reports the
+bytes a level's invisible ground, pipe and step colliders take.
+"""
+
+import os
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+# open a (dummy) display as the game does, so images are converted to its
+# format.  Unconverted per-pixel alpha images make every blit several
+# times slower than in the game
+os.environ.setdefault('MARIO_HEADLESS', '0')
+
+import gc
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+import pygame as pg
+from . import headless
+from . import tools
+from . import constants as c
+from .replay import Recording
+from .components import collider
+
+RESOURCES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                         'resources', 'benchmark')
+RUN_TRACE = os.path.join(RESOURCES, 'level_1_1.replay')
+BASELINE = os.path.join(RESOURCES, 'baseline.json')
+
+RIGHT = tools.KEY_BITS[tools.keybinding['right']]
+RUN = RIGHT | tools.KEY_BITS[tools.keybinding['action']]
+JUMP = tools.KEY_BITS[tools.keybinding['jump']]
+
+# phases faster than this are too noisy to call a regression
+MIN_PHASE_MS = 0.02
+
+
+def level_run():
+    """The masks of the stored run through 1-1, from Level1.startup to
+    the end of the fireworks"""
+    return list(Recording.load(RUN_TRACE).masks())
+
+
+def play_until(simulator, masks, done):
+    """Steps through masks until done(level) is true and returns the
+    masks left over"""
+    for index, mask in enumerate(masks):
+        if done(simulator.level):
+            return masks[index:]
+        simulator.step(mask)
+    return []
+
+
+def title_screen():
+    """The main menu left alone for ten seconds"""
+    from .states import main_menu
+    menu = main_menu.Menu()
+    surface = pg.Surface(c.SCREEN_SIZE)
+    clock = tools.FixedStepClock()
+    step = lambda mask: menu.update(surface, tools.KeyMask(mask), clock.tick())
+    return menu, step, [0] * 600
+
+
+def full_run():
+    """The whole of 1-1 from the start to the end of the fireworks"""
+    simulator = headless.Simulator(render=True)
+    return simulator.level, simulator.step, level_run()
+
+
+def enemies():
+    """The stretch of the run from checkpoint 5, where five groups of
+    enemies are let loose within 1400 pixels"""
+    simulator = headless.Simulator(render=True)
+    masks = play_until(simulator, level_run(),
+                       lambda level: level.mario.rect.x >= 3700)
+    return simulator.level, simulator.step, masks[:300]
+
+
+def bricks():
+    """Big Mario hopping along under the first row of bricks, smashing
+    them and bumping the coin boxes between them"""
+    simulator = headless.Simulator(render=True)
+    level = simulator.level
+    level.mario.become_big()
+    level.mario.rect.x = 780
+    level.viewport.x = 500
+    hop = [RIGHT] * 8 + [RIGHT | JUMP] * 4 + [JUMP] * 26 + [0] * 16
+    return level, simulator.step, hop * 8
+
+
+def fireballs():
+    """Fire Mario running from the start, firing as fast as he can"""
+    simulator = headless.Simulator(render=True)
+    level = simulator.level
+    level.mario.become_big()
+    level.mario.fire = True
+    return level, simulator.step, ([RUN] * 4 + [RIGHT] * 4) * 75
+
+
+def ending():
+    """The flag pole, the walk to the castle and the fireworks at the
+    end of the run"""
+    simulator = headless.Simulator(render=True)
+    masks = play_until(simulator, level_run(),
+                       lambda level: level.mario.state == c.FLAGPOLE)
+    return simulator.level, simulator.step, masks
+
+
+SCENARIOS = [('title_screen', title_screen),
+             ('full_run', full_run),
+             ('enemies', enemies),
+             ('bricks', bricks),
+             ('fireballs', fireballs),
+             ('ending', ending)]
+
+
+def time_scenario(setup):
+    """Runs a fresh copy of the scenario and returns its seconds and the
+    FrameProfiler with every frame's phase times"""
+    state, step, masks = setup()
+    profiler = state.profiler = tools.FrameProfiler(window=len(masks))
+    gc.collect()
+    start = time.perf_counter()
+    for mask in masks:
+        profiler.start('frame')
+        step(mask)
+        profiler.stop('frame')
+        profiler.end_frame()
+    return time.perf_counter() - start, profiler
+
+
+def measure_allocations(setup):
+    """Mean bytes allocated within a frame (the tracemalloc peak above
+    the frame's starting point) and mean bytes still held after it"""
+    state, step, masks = setup()
+    gc.collect()
+    tracemalloc.start()
+    first = tracemalloc.get_traced_memory()[0]
+    allocated = 0
+    for mask in masks:
+        current = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        step(mask)
+        allocated += tracemalloc.get_traced_memory()[1] - current
+    retained = tracemalloc.get_traced_memory()[0] - first
+    tracemalloc.stop()
+    return allocated / len(masks), retained / len(masks)
+
+
+def measure_activation(setup):
+    """Mean sprites per frame awake and asleep in the level's
+    ActivationWindow, or None for a scenario without one"""
+    state, step, masks = setup()
+    if not hasattr(state, 'activation'):
+        return None
+    active = sleeping = 0
+    for mask in masks:
+        step(mask)
+        active += state.activation.active
+        sleeping += state.activation.sleeping
+    return {'active': active / len(masks), 'sleeping': sleeping / len(masks)}
+
+
+def run_scenario(setup, repeat=3):
+    """The result for one scenario, timed from the fastest of repeat runs"""
+    seconds, profiler = min((time_scenario(setup) for attempt in range(repeat)),
+                            key=lambda timed: timed[0])
+    allocated, retained = measure_allocations(setup)
+    phases = {}
+    for phase in profiler.phases:
+        phases[phase] = dict(zip(('p50', 'p95', 'p99'), profiler.percentiles(phase)))
+    return {'frames': profiler.frames,
+            'seconds': seconds,
+            'fps': profiler.frames / seconds,
+            'phases_ms': phases,
+            'alloc_bytes_per_frame': allocated,
+            'retained_bytes_per_frame': retained,
+            'sprites_per_frame': measure_activation(setup)}
+
+
+def run(names=None, repeat=3):
+    """Results for the named scenarios (all of them by default)"""
+    results = {}
+    for name, setup in SCENARIOS:
+        if names is None or name in names:
+            results[name] = run_scenario(setup, repeat)
+    return {'python': platform.python_version(),
+            'pygame': pg.version.ver,
+            'machine': platform.machine(),
+            'scenarios': results}
+
+
+def compare(baseline, current, tolerance=0.1):
+    """Returns a (scenario, metric, baseline, current, regressed) row for
+    every metric both runs have.  Frames/sec regress when they drop, and
+    phase p50s and allocations when they rise, by more than tolerance"""
+    rows = []
+    for name, result in current['scenarios'].items():
+        old = baseline['scenarios'].get(name)
+        if old is None:
+            continue
+        rows.append((name, 'fps', old['fps'], result['fps'],
+                     result['fps'] < old['fps'] * (1 - tolerance)))
+        for phase, times in sorted(result['phases_ms'].items()):
+            if phase in old['phases_ms']:
+                before, after = old['phases_ms'][phase]['p50'], times['p50']
+                rows.append((name, phase + ' p50 ms', before, after,
+                             after > before * (1 + tolerance)
+                             and after - before > MIN_PHASE_MS))
+        before, after = old['alloc_bytes_per_frame'], result['alloc_bytes_per_frame']
+        rows.append((name, 'alloc bytes/frame', before, after,
+                     after > before * (1 + tolerance)))
+    return rows
+
+
+def footprint(obj):
+    """Bytes held by obj: the object, its attribute dict if it has one,
+    and the Rects, lists, sets and Surfaces (with their pixels) in its
+    attributes"""
+    if hasattr(obj, '__dict__'):
+        values = list(vars(obj).values())
+        total = sys.getsizeof(obj) + sys.getsizeof(vars(obj))
+    else:
+        values = [getattr(obj, name) for name in type(obj).__slots__]
+        total = sys.getsizeof(obj)
+    for value in values:
+        if isinstance(value, (pg.Rect, list, set)):
+            total += sys.getsizeof(value)
+        elif isinstance(value, pg.Surface):
+            total += sys.getsizeof(value) + value.get_pitch() * value.get_height()
+    return total
+
+
+def memory_report():
+    """Bytes taken by the invisible ground, pipe and step colliders of one
+    Level1, against the bytes Collider sprites with image Surfaces took
+    for the same rects"""
+    level = headless.Simulator().level
+    light = list(level.ground_step_pipe_group)
+    heavy = [collider.Collider(*thing.rect) for thing in light]
+    return {'count': len(light),
+            'bytes': sum(footprint(thing) for thing in light),
+            'sprite_bytes': sum(footprint(sprite) for sprite in heavy)}
+
+
+def find_level_run(seed=1, max_moves=100000):
+    """Searches for inputs that take Mario from the start of 1-1 to the
+    end of the fireworks.  Moves (a run, or a jump held for 8 to 40
+    frames) are picked by a seeded RNG, and whenever Mario dies or stops
+    getting anywhere the search backs up a few moves with
+    Simulator.restore.  Returns the masks, or None if max_moves run out"""
+    rng = random.Random(seed)
+    moves = [[RUN] * 8, [RUN] * 8, [RUN] * 8, [RIGHT] * 8]
+    moves += [[RUN | JUMP] * (8 * held) + [RUN] * 2 for held in range(1, 6)]
+    simulator = headless.Simulator()
+    level = simulator.level
+    history = [(simulator.snapshot(), [], level.mario.rect.x)]
+    for move in range(max_moves):
+        masks = rng.choice(moves)
+        dead = False
+        for mask in masks:
+            simulator.step(mask)
+            if level.mario.dead:
+                dead = True
+                break
+        x = level.mario.rect.x
+        stuck = len(history) > 30 and x <= history[-30][2]
+        if dead or stuck:
+            back = rng.randint(10, 40) if stuck else rng.randint(1, 10)
+            del history[max(1, len(history) - back):]
+            simulator.restore(history[-1][0])
+            continue
+        trace = history[-1][1] + masks
+        if level.mario.state == c.FLAGPOLE:
+            while not simulator.step(RUN):
+                trace.append(RUN)
+            return trace + [RUN]
+        history.append((simulator.snapshot(), trace, x))
+    return None
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    commands = parser.add_subparsers(dest='command')
+    run_parser = commands.add_parser('run')
+    run_parser.add_argument('scenarios', nargs='*')
+    run_parser.add_argument('--output', default='benchmark.json')
+    run_parser.add_argument('--repeat', type=int, default=3)
+    compare_parser = commands.add_parser('compare')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument('--baseline', default=BASELINE)
+    compare_parser.add_argument('--tolerance', type=float, default=0.1)
+    record_parser = commands.add_parser('record')
+    record_parser.add_argument('--seed', type=int, default=1)
+    commands.add_parser('memory')
+    args = parser.parse_args()
+
+    if args.command == 'run':
+        results = run(args.scenarios or None, args.repeat)
+        with open(args.output, 'w') as output:
+            json.dump(results, output, indent=2, sort_keys=True)
+        for name, result in results['scenarios'].items():
+            sprites = result['sprites_per_frame']
+            print('{:<14}{:6d} frames {:9.1f} fps {:10.0f} alloc bytes/frame{}'.format(
+                name, result['frames'], result['fps'],
+                result['alloc_bytes_per_frame'],
+                ', {active:.1f} sprites awake {sleeping:.1f} asleep'.format(**sprites)
+                if sprites else ''))
+    elif args.command == 'compare':
+        with open(args.baseline) as baseline, open(args.current) as current:
+            rows = compare(json.load(baseline), json.load(current), args.tolerance)
+        for name, metric, before, after, regressed in rows:
+            change = (after - before) / before * 100 if before else 0.0
+            print('{:<14}{:<22}{:12.3f}{:12.3f}{:+8.1f}%{}'.format(
+                name, metric, before, after, change,
+                '  REGRESSION' if regressed else ''))
+        sys.exit(1 if any(row[4] for row in rows) else 0)
+    elif args.command == 'record':
+        masks = find_level_run(args.seed)
+        if masks is None:
+            sys.exit('no run found with seed {}'.format(args.seed))
+        recording = Recording()
+        for mask in masks:
+            recording.add(mask)
+        recording.save(RUN_TRACE)
+        print('{} frames, {} bytes in {}'.format(len(masks), len(recording.to_bytes()),
+                                                 RUN_TRACE))
+    elif args.command == 'memory':
+        report = memory_report()
+        print('{count} colliders: {bytes:,} bytes, against '
+              '{sprite_bytes:,} as Collider sprites with Surfaces'.format(**report))
+        print('{:,} bytes saved per level'.format(report['sprite_bytes'] - report['bytes']))
+    else:
+        parser.print_help()
+
+
+if __name__ == '__main__':
+    main()
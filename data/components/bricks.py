@@ -36,15 +36,8 @@ class Brick(pg.sprite.Sprite):
 
     def get_image(self, x, y, width, height):
         """Extracts the image from the sprite sheet"""
-        image = pg.Surface([width, height]).convert()
-        rect = image.get_rect()
-
-        image.blit(self.sprite_sheet, (0, 0), (x, y, width, height))
-        image.set_colorkey(c.BLACK)
-        image = pg.transform.scale(image,
-                                   (int(rect.width * c.BRICK_SIZE_MULTIPLIER),
-                                    int(rect.height * c.BRICK_SIZE_MULTIPLIER)))
-        return image
+        return setup.FRAMES.get_image(self.sprite_sheet, x, y, width, height,
+                                      c.BRICK_SIZE_MULTIPLIER, c.BLACK)
 
     def setup_frames(self):
         """Set the frames to a list"""
@@ -145,22 +138,15 @@ class BrickPiece(pg.sprite.Sprite):
         self.frames = []
 
         image = self.get_image(68, 20, 8, 8)
-        reversed_image = pg.transform.flip(image, True, False)
+        reversed_image = setup.FRAMES.flip(image, True, False)
 
         self.frames.append(image)
         self.frames.append(reversed_image)
 
     def get_image(self, x, y, width, height):
         """Extract image from sprite sheet"""
-        image = pg.Surface([width, height]).convert()
-        rect = image.get_rect()
-
-        image.blit(self.sprite_sheet, (0, 0), (x, y, width, height))
-        image.set_colorkey(c.BLACK)
-        image = pg.transform.scale(image,
-                                   (int(rect.width * c.BRICK_SIZE_MULTIPLIER),
-                                    int(rect.height * c.BRICK_SIZE_MULTIPLIER)))
-        return image
+        return setup.FRAMES.get_image(self.sprite_sheet, x, y, width, height,
+                                      c.BRICK_SIZE_MULTIPLIER, c.BLACK)
 
     def update(self):
         """Update brick piece"""
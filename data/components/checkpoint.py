@@ -1,18 +1,45 @@
 __author__ = 'justinarmstrong'
 
 import pygame as pg
-from .. import constants as c
 
 
-class Checkpoint(pg.sprite.Sprite):
-    """Invisible sprite used to add enemies, special boxes
-    and trigger sliding down the flag pole"""
+ENEMIES = 'enemies'
+FLAG_POLE = 'flag pole'
+CASTLE = 'castle'
+SECRET_MUSHROOM = 'secret mushroom'
 
-    def __init__(self, x, name, y=0, width=10, height=600):
-        super(Checkpoint, self).__init__()
-        self.image = pg.Surface((width, height))
-        self.image.fill(c.BLACK)
-        self.rect = self.image.get_rect()
-        self.rect.x = x
-        self.rect.y = y
-        self.name = name
+
+class Trigger(object):
+    """An invisible rect that sets off its action the first time Mario
+    touches it.  For ENEMIES, group is the index of the enemies to let
+    loose in Level1.enemy_group_list"""
+    __slots__ = ('rect', 'action', 'group')
+
+    def __init__(self, x, action, group=None, y=0, width=10, height=600):
+        self.rect = pg.Rect(x, y, width, height)
+        self.action = action
+        self.group = group
+
+
+def trigger_table(*triggers):
+    """The triggers sorted by their left edge, as a tuple a LevelTemplate
+    can share between levels"""
+    return tuple(sorted(triggers, key=lambda trigger: trigger.rect.x))
+
+
+def next_trigger(armed, rect, left):
+    """Removes and returns the trigger in armed (a list in trigger_table
+    order) that rect touches, or None.  Nearly every frame that is one
+    comparison against the left edge of the first armed trigger.  Triggers
+    ending before left, the left edge of the viewport, can never be
+    reached again and are dropped."""
+    if not armed or rect.right <= armed[0].rect.x:
+        return None
+    while armed and armed[0].rect.right <= left:
+        del armed[0]
+    for index, trigger in enumerate(armed):
+        if trigger.rect.x >= rect.right:
+            break
+        if trigger.rect.colliderect(rect):
+            return armed.pop(index)
+    return None
@@ -28,16 +28,8 @@ class Coin(pg.sprite.Sprite):
 
     def get_image(self, x, y, width, height):
         """Get the image frames from the sprite sheet"""
-        image = pg.Surface([width, height]).convert()
-        rect = image.get_rect()
-
-        image.blit(self.sprite_sheet, (0, 0), (x, y, width, height))
-        image.set_colorkey(c.BLACK)
-
-        image = pg.transform.scale(image,
-                                   (int(rect.width * c.SIZE_MULTIPLIER),
-                                    int(rect.height * c.SIZE_MULTIPLIER)))
-        return image
+        return setup.FRAMES.get_image(self.sprite_sheet, x, y, width, height,
+                                      c.SIZE_MULTIPLIER, c.BLACK)
 
     def setup_frames(self):
         """create the frame list"""
@@ -69,6 +61,6 @@ class Coin(pg.sprite.Sprite):
 
         if self.rect.bottom > self.initial_height:
             self.kill()
-            self.score_group.append(score.Score(self.rect.centerx - self.viewport.x,
+            self.score_group.append(score.spawn(self.rect.centerx - self.viewport.x,
                                                 self.rect.y,
                                                 200))
@@ -1,5 +1,8 @@
 __author__ = 'justinarmstrong'
 
+from bisect import bisect_left
+from collections import namedtuple
+
 import pygame as pg
 from .. import constants as c
 
@@ -10,9 +13,181 @@ class Collider(pg.sprite.Sprite):
 
     def __init__(self, x, y, width, height, name='collider'):
         pg.sprite.Sprite.__init__(self)
-        self.image = pg.Surface((width, height)).convert()
+        self.image = pg.Surface((width, height))
+        if pg.display.get_surface() is not None:
+            self.image = self.image.convert()
         # self.image.fill(c.RED)
         self.rect = self.image.get_rect()
         self.rect.x = x
         self.rect.y = y
         self.state = None
+
+
+class RectCollider(object):
+    """Invisible collider that is nothing but a rect: no image Surface
+    and, with __slots__, no attribute dict.  It has just the parts of the
+    Sprite protocol that sprite groups, ColliderGrid and
+    pg.sprite.spritecollideany use, so it collides like a Collider but
+    can never be drawn"""
+    __slots__ = ('rect', 'state', 'name', 'sprite_groups')
+
+    def __init__(self, x, y, width, height, name='collider'):
+        self.rect = pg.Rect(x, y, width, height)
+        self.state = None
+        self.name = name
+        self.sprite_groups = []
+
+    def add_internal(self, group):
+        self.sprite_groups.append(group)
+
+    def remove_internal(self, group):
+        self.sprite_groups.remove(group)
+
+    def update(self, *args, **kwargs):
+        pass
+
+    def kill(self):
+        """Takes the collider out of every group it is in"""
+        for group in self.sprite_groups:
+            group.remove_internal(self)
+        self.sprite_groups = []
+
+    def alive(self):
+        return bool(self.sprite_groups)
+
+
+class ColliderGrid(pg.sprite.Group):
+    """Sprite group that also files its sprites into a uniform grid of
+    cells, so collision checks only look at colliders near a sprite"""
+
+    def __init__(self, *sprites, **kwargs):
+        self.cell_size = kwargs.get('cell_size', c.COLLIDER_CELL_SIZE)
+        self.padding = kwargs.get('padding', 0)
+        self.cells = {}
+        self.sprite_cells = {}
+        self.order = {}
+        self.next_order = 0
+        pg.sprite.Group.__init__(self, *sprites)
+
+    def copy(self):
+        """A new grid of the same sprites, cell size and padding"""
+        return self.__class__(self.sprites(), cell_size=self.cell_size,
+                              padding=self.padding)
+
+    def get_cells(self, rect):
+        """Returns the grid cells a rect overlaps"""
+        size = self.cell_size
+        left = rect.left // size
+        right = (rect.right - 1) // size
+        top = rect.top // size
+        bottom = (rect.bottom - 1) // size
+        return [(x, y) for x in range(left, right + 1)
+                for y in range(top, bottom + 1)]
+
+    def add_internal(self, sprite, layer=None, cells=None):
+        """Files a new sprite into every cell its padded rect covers, or
+        into the given cells (used to put a grid back the way it was)"""
+        pg.sprite.Group.add_internal(self, sprite)
+        if cells is None:
+            cells = self.get_cells(sprite.rect.inflate(self.padding * 2,
+                                                       self.padding * 2))
+        for cell in cells:
+            self.cells.setdefault(cell, []).append(sprite)
+        self.sprite_cells[sprite] = cells
+        self.order[sprite] = self.next_order
+        self.next_order += 1
+
+    def remove_internal(self, sprite):
+        """Takes a sprite (e.g. a broken brick) back out of the grid"""
+        pg.sprite.Group.remove_internal(self, sprite)
+        for cell in self.sprite_cells.pop(sprite):
+            bucket = self.cells[cell]
+            bucket.remove(sprite)
+            if not bucket:
+                del self.cells[cell]
+        del self.order[sprite]
+
+    def nearby(self, sprite):
+        """Returns the colliders sharing a cell with sprite, in the order
+        they were added, ready to pass to pg.sprite.spritecollideany"""
+        return self.within(sprite.rect)
+
+    def within(self, rect):
+        """Returns the colliders filed in the cells rect overlaps, in the
+        order they were added"""
+        cells = self.cells
+        candidates = set()
+        for cell in self.get_cells(rect):
+            if cell in cells:
+                candidates.update(cells[cell])
+        return sorted(candidates, key=self.order.__getitem__)
+
+
+class ActivationWindow(object):
+    """The stretch of level around the camera where the sprites of a
+    ColliderGrid are simulated: the viewport widened by margin on each
+    side.  Sprites outside it sleep.  They aren't updated, and since grid
+    collision checks only look near the moving sprite and draw_visible
+    only draws the viewport, they aren't touched at all until the camera
+    comes close.  active and sleeping count this frame's sprites.
+
+    Bricks and coin boxes never move sideways, so each grid's sprites are
+    kept sorted by x and the awake ones found with two bisects.  The
+    sort is redone whenever a sprite is added to or removed from the grid."""
+
+    def __init__(self, margin=c.ACTIVATION_MARGIN):
+        self.margin = margin
+        self.rect = pg.Rect(0, 0, 0, 0)
+        self.active = 0
+        self.sleeping = 0
+        self.sorted = {}
+
+    def move(self, viewport):
+        """Puts the window around viewport and starts a new frame's counts"""
+        self.rect.update(viewport.x - self.margin, viewport.y,
+                         viewport.width + 2 * self.margin, viewport.height)
+        self.active = 0
+        self.sleeping = 0
+
+    def sort(self, grid):
+        """grid's sprites ordered by x, their lefts and the widest one"""
+        version = (grid.next_order, len(grid))
+        cached = self.sorted.get(grid)
+        if cached is None or cached[0] != version:
+            sprites = sorted(grid, key=lambda sprite: (sprite.rect.x, grid.order[sprite]))
+            lefts = [sprite.rect.x for sprite in sprites]
+            widest = max([sprite.rect.width for sprite in sprites] or [0])
+            cached = self.sorted[grid] = (version, sprites, lefts, widest)
+        return cached[1:]
+
+    def awake(self, grid):
+        """The sprites of grid that overlap the window, left to right"""
+        sprites, lefts, widest = self.sort(grid)
+        rect = self.rect
+        first = bisect_left(lefts, rect.left - widest)
+        last = bisect_left(lefts, rect.right, first)
+        awake = [sprite for sprite in sprites[first:last]
+                 if sprite.rect.right > rect.left]
+        self.active += len(awake)
+        self.sleeping += len(sprites) - len(awake)
+        return awake
+
+    def update(self, grid, *args):
+        """Calls update(*args) on the awake sprites of grid"""
+        for sprite in self.awake(grid):
+            sprite.update(*args)
+
+
+Contact = namedtuple('Contact', ['kind', 'sprite'])
+
+
+def contacts(sprite, groups):
+    """Yields a Contact for each (kind, group) pair that sprite overlaps,
+    in the order given.  Groups are only tested as the caller asks for
+    more contacts, so stopping at the first one skips the rest"""
+    for kind, group in groups:
+        if isinstance(group, ColliderGrid):
+            group = group.nearby(sprite)
+        hit = pg.sprite.spritecollideany(sprite, group)
+        if hit:
+            yield Contact(kind, hit)
@@ -42,16 +42,8 @@ class Enemy(pg.sprite.Sprite):
 
     def get_image(self, x, y, width, height):
         """Get the image frames from the sprite sheet"""
-        image = pg.Surface([width, height]).convert()
-        rect = image.get_rect()
-
-        image.blit(self.sprite_sheet, (0, 0), (x, y, width, height))
-        image.set_colorkey(c.BLACK)
-
-        image = pg.transform.scale(image,
-                                   (int(rect.width * c.SIZE_MULTIPLIER),
-                                    int(rect.height * c.SIZE_MULTIPLIER)))
-        return image
+        return setup.FRAMES.get_image(self.sprite_sheet, x, y, width, height,
+                                      c.SIZE_MULTIPLIER, c.BLACK)
 
     def handle_state(self):
         """Enemy behavior based on state"""
@@ -132,7 +124,7 @@ class Goomba(Enemy):
             self.get_image(30, 4, 16, 16))
         self.frames.append(
             self.get_image(61, 0, 16, 16))
-        self.frames.append(pg.transform.flip(self.frames[1], False, True))
+        self.frames.append(setup.FRAMES.flip(self.frames[1], False, True))
 
     def jumped_on(self):
         """When Mario squishes him"""
@@ -156,7 +148,7 @@ class Koopa(Enemy):
             self.get_image(180, 0, 16, 24))
         self.frames.append(
             self.get_image(360, 5, 16, 15))
-        self.frames.append(pg.transform.flip(self.frames[2], False, True))
+        self.frames.append(setup.FRAMES.flip(self.frames[2], False, True))
 
     def jumped_on(self):
         """When Mario jumps on the Koopa and puts him in his shell"""
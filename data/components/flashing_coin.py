@@ -31,15 +31,8 @@ class Coin(pg.sprite.Sprite):
 
     def get_image(self, x, y, width, height):
         """Extracts image from sprite sheet"""
-        image = pg.Surface([width, height])
-        rect = image.get_rect()
-
-        image.blit(self.sprite_sheet, (0, 0), (x, y, width, height))
-        image.set_colorkey(c.BLACK)
-        image = pg.transform.scale(image,
-                                   (int(rect.width * c.BRICK_SIZE_MULTIPLIER),
-                                    int(rect.height * c.BRICK_SIZE_MULTIPLIER)))
-        return image
+        return setup.FRAMES.get_image(self.sprite_sheet, x, y, width, height,
+                                      c.BRICK_SIZE_MULTIPLIER, c.BLACK)
 
     def update(self, current_time):
         """Animates flashing coin"""
@@ -6,6 +6,11 @@ from .. import constants as c
 from . import flashing_coin
 
 
+# background of the text sheet, keyed out of every character and used as
+# the colorkey of the cached HUD band
+TEXT_COLORKEY = (92, 148, 252)
+
+
 class Character(pg.sprite.Sprite):
     """Parent class for all characters used for the overhead level info"""
 
@@ -29,6 +34,7 @@ class OverheadInfo(object):
         self.state = state
         self.special_state = None
         self.game_info = game_info
+        self.label_values = {}
 
         self.create_image_dict()
         self.create_score_group()
@@ -41,6 +47,7 @@ class OverheadInfo(object):
         self.create_game_over_label()
         self.create_time_out_label()
         self.create_main_menu_labels()
+        self.create_hud_image()
 
     def create_image_dict(self):
         """Creates the initial images for the score"""
@@ -96,15 +103,8 @@ class OverheadInfo(object):
 
     def get_image(self, x, y, width, height):
         """Extracts image from sprite sheet"""
-        image = pg.Surface([width, height])
-        rect = image.get_rect()
-
-        image.blit(self.sprite_sheet, (0, 0), (x, y, width, height))
-        image.set_colorkey((92, 148, 252))
-        image = pg.transform.scale(image,
-                                   (int(rect.width * 2.9),
-                                    int(rect.height * 2.9)))
-        return image
+        return setup.FRAMES.get_image(self.sprite_sheet, x, y, width, height,
+                                      2.9, TEXT_COLORKEY)
 
     def create_score_group(self):
         """Creates the initial empty score (000000)"""
@@ -212,6 +212,32 @@ class OverheadInfo(object):
         self.main_menu_labels = [player_one_game, player_two_game,
                                  top, top_score]
 
+    def create_hud_image(self):
+        """Creates the cached image of the band along the top of the
+        screen holding the labels, score, coin total and time, and the
+        area of each label on it.  The flashing coin inside the band is
+        blitted on its own"""
+        self.hud_labels = [self.score_images, self.coin_count_images,
+                           self.count_down_images] + self.label_list
+        rects = [letter.rect for label in self.hud_labels for letter in label]
+        self.hud_rect = rects[0].unionall(rects[1:])
+        self.hud_image = pg.Surface(self.hud_rect.size)
+        if pg.display.get_surface() is not None:
+            self.hud_image = self.hud_image.convert()
+        self.hud_image.set_colorkey(TEXT_COLORKEY)
+        self.hud_image.fill(TEXT_COLORKEY)
+        self.hud_areas = []
+        for label in self.hud_labels:
+            rect = label[0].rect.unionall([letter.rect for letter in label[1:]])
+            self.hud_areas.append((rect, rect.move(-self.hud_rect.x, -self.hud_rect.y)))
+        self.invalidate_hud()
+
+    def invalidate_hud(self):
+        """Has the next draw repaint every label of the HUD band"""
+        self.hud_dirty = set(id(label) for label in self.hud_labels)
+        self.hud_clock = None
+        self.hud_coin_image = None
+
     def update(self, level_info, mario=None):
         """Updates all overhead info"""
         self.mario = mario
@@ -267,14 +293,28 @@ class OverheadInfo(object):
 
     def update_score_images(self, images, score):
         """Updates what numbers are to be blitted for the score"""
+        if self.label_values.get(id(images)) == score:
+            return
+        self.label_values[id(images)] = score
         index = len(images) - 1
 
         for digit in reversed(str(score)):
-            rect = images[index].rect
-            images[index] = Character(self.image_dict[digit])
-            images[index].rect = rect
+            self.set_character_image(images, images[index], digit)
             index -= 1
 
+    def update_label(self, label_list, string):
+        """Changes the characters of an existing label in place"""
+        for letter, character in zip(label_list, string):
+            self.set_character_image(label_list, letter, character)
+
+    def set_character_image(self, label_list, letter, character):
+        """Swaps the image of one character, marking its label for a
+        repaint"""
+        image = self.image_dict[character]
+        if letter.image is not image:
+            letter.image = image
+            self.hud_dirty.add(id(label_list))
+
     def update_count_down_clock(self, level_info):
         """Updates current time"""
         if self.state == c.FAST_COUNT_DOWN:
@@ -283,19 +323,17 @@ class OverheadInfo(object):
         elif (level_info[c.CURRENT_TIME] - self.current_time) > 400:
             self.current_time = level_info[c.CURRENT_TIME]
             self.time -= 1
-        self.count_down_images = []
-        self.create_label(self.count_down_images, str(self.time), 645, 55)
-        if len(self.count_down_images) < 2:
-            for i in range(2):
-                self.count_down_images.insert(0, Character(self.image_dict['0']))
-            self.set_label_rects(self.count_down_images, 645, 55)
-        elif len(self.count_down_images) < 3:
-            self.count_down_images.insert(0, Character(self.image_dict['0']))
-            self.set_label_rects(self.count_down_images, 645, 55)
+
+        if self.label_values.get(id(self.count_down_images)) != self.time:
+            self.label_values[id(self.count_down_images)] = self.time
+            self.update_label(self.count_down_images, str(self.time).rjust(3, '0'))
 
     def update_coin_total(self, level_info):
         """Updates the coin total and adjusts label accordingly"""
         self.coin_total = level_info[c.COIN_TOTAL]
+        if self.label_values.get(id(self.coin_count_images)) == self.coin_total:
+            return
+        self.label_values[id(self.coin_count_images)] = self.coin_total
 
         coin_string = str(self.coin_total)
         if len(coin_string) < 2:
@@ -305,12 +343,21 @@ class OverheadInfo(object):
         else:
             coin_string = '*' + coin_string
 
-        x = self.coin_count_images[0].rect.x
-        y = self.coin_count_images[0].rect.y
+        self.update_label(self.coin_count_images, coin_string)
 
-        self.coin_count_images = []
+    def shows_clock(self):
+        """Whether the count down clock is drawn in the current state"""
+        return self.state in (c.LEVEL, c.FAST_COUNT_DOWN, c.END_OF_LEVEL)
 
-        self.create_label(self.coin_count_images, coin_string, x, y)
+    def changed_rect(self):
+        """The part of the screen the next draw changes: the HUD band if
+        one of its labels changed, the flashing coin if only it moved to
+        another frame, or None"""
+        if self.hud_dirty or self.hud_clock != self.shows_clock():
+            return self.hud_rect
+        if self.hud_coin_image is not self.flashing_coin.image:
+            return self.flashing_coin.rect
+        return None
 
     def draw(self, surface):
         """Draws overhead info based on state"""
@@ -330,29 +377,45 @@ class OverheadInfo(object):
             self.draw_time_out_screen_info(surface)
         else:
             pass
+        self.hud_coin_image = self.flashing_coin.image
+
+    def draw_hud(self, surface, clock=False):
+        """Blits the labels of the cached HUD band, first repainting the
+        ones that changed"""
+        if clock != self.hud_clock:
+            self.hud_clock = clock
+            self.hud_dirty.add(id(self.count_down_images))
+        if self.hud_dirty:
+            for label, (rect, area) in zip(self.hud_labels, self.hud_areas):
+                if id(label) in self.hud_dirty:
+                    self.paint_label(label, area,
+                                     clock or label is not self.count_down_images)
+            self.hud_dirty = set()
+        for rect, area in self.hud_areas:
+            surface.blit(self.hud_image, rect, area)
+
+    def paint_label(self, label_list, area, visible=True):
+        """Repaints one label in its area of the HUD image, or just clears
+        the area when the label is not visible"""
+        self.hud_image.fill(TEXT_COLORKEY, area)
+        if visible:
+            x, y = self.hud_rect.topleft
+            for letter in label_list:
+                self.hud_image.blit(letter.image, letter.rect.move(-x, -y))
 
     def draw_main_menu_info(self, surface):
         """Draws info for main menu"""
-        for info in self.score_images:
-            surface.blit(info.image, info.rect)
+        self.draw_hud(surface)
 
         for label in self.main_menu_labels:
             for letter in label:
                 surface.blit(letter.image, letter.rect)
 
-        for character in self.coin_count_images:
-            surface.blit(character.image, character.rect)
-
-        for label in self.label_list:
-            for letter in label:
-                surface.blit(letter.image, letter.rect)
-
         surface.blit(self.flashing_coin.image, self.flashing_coin.rect)
 
     def draw_loading_screen_info(self, surface):
         """Draws info for loading screen"""
-        for info in self.score_images:
-            surface.blit(info.image, info.rect)
+        self.draw_hud(surface)
 
         for word in self.center_labels:
             for letter in word:
@@ -364,64 +427,30 @@ class OverheadInfo(object):
         surface.blit(self.mario_image, self.mario_rect)
         surface.blit(self.life_times_image, self.life_times_rect)
 
-        for character in self.coin_count_images:
-            surface.blit(character.image, character.rect)
-
-        for label in self.label_list:
-            for letter in label:
-                surface.blit(letter.image, letter.rect)
-
         surface.blit(self.flashing_coin.image, self.flashing_coin.rect)
 
     def draw_level_screen_info(self, surface):
         """Draws info during regular game play"""
-        for info in self.score_images:
-            surface.blit(info.image, info.rect)
-
-        for digit in self.count_down_images:
-            surface.blit(digit.image, digit.rect)
-
-        for character in self.coin_count_images:
-            surface.blit(character.image, character.rect)
-
-        for label in self.label_list:
-            for letter in label:
-                surface.blit(letter.image, letter.rect)
+        self.draw_hud(surface, clock=True)
 
         surface.blit(self.flashing_coin.image, self.flashing_coin.rect)
 
     def draw_game_over_screen_info(self, surface):
         """Draws info when game over"""
-        for info in self.score_images:
-            surface.blit(info.image, info.rect)
+        self.draw_hud(surface)
 
         for word in self.game_over_label:
             for letter in word:
                 surface.blit(letter.image, letter.rect)
 
-        for character in self.coin_count_images:
-            surface.blit(character.image, character.rect)
-
-        for label in self.label_list:
-            for letter in label:
-                surface.blit(letter.image, letter.rect)
-
         surface.blit(self.flashing_coin.image, self.flashing_coin.rect)
 
     def draw_time_out_screen_info(self, surface):
         """Draws info when on the time out screen"""
-        for info in self.score_images:
-            surface.blit(info.image, info.rect)
+        self.draw_hud(surface)
 
         for word in self.time_out_label:
             for letter in word:
                 surface.blit(letter.image, letter.rect)
 
-        for character in self.coin_count_images:
-            surface.blit(character.image, character.rect)
-
-        for label in self.label_list:
-            for letter in label:
-                surface.blit(letter.image, letter.rect)
-
         surface.blit(self.flashing_coin.image, self.flashing_coin.rect)
@@ -48,6 +48,7 @@ class Mario(pg.sprite.Sprite):
         self.allow_fireball = True
         self.in_transition_state = False
         self.hurt_invincible = False
+        self.visible = True
         self.in_castle = False
         self.crouching = False
         self.losing_invincibility = False
@@ -278,39 +279,39 @@ class Mario(pg.sprite.Sprite):
         # frames but are simply reversed.
 
         for frame in self.right_small_normal_frames:
-            new_image = pg.transform.flip(frame, True, False)
+            new_image = setup.FRAMES.flip(frame, True, False)
             self.left_small_normal_frames.append(new_image)
 
         for frame in self.right_small_green_frames:
-            new_image = pg.transform.flip(frame, True, False)
+            new_image = setup.FRAMES.flip(frame, True, False)
             self.left_small_green_frames.append(new_image)
 
         for frame in self.right_small_red_frames:
-            new_image = pg.transform.flip(frame, True, False)
+            new_image = setup.FRAMES.flip(frame, True, False)
             self.left_small_red_frames.append(new_image)
 
         for frame in self.right_small_black_frames:
-            new_image = pg.transform.flip(frame, True, False)
+            new_image = setup.FRAMES.flip(frame, True, False)
             self.left_small_black_frames.append(new_image)
 
         for frame in self.right_big_normal_frames:
-            new_image = pg.transform.flip(frame, True, False)
+            new_image = setup.FRAMES.flip(frame, True, False)
             self.left_big_normal_frames.append(new_image)
 
         for frame in self.right_big_green_frames:
-            new_image = pg.transform.flip(frame, True, False)
+            new_image = setup.FRAMES.flip(frame, True, False)
             self.left_big_green_frames.append(new_image)
 
         for frame in self.right_big_red_frames:
-            new_image = pg.transform.flip(frame, True, False)
+            new_image = setup.FRAMES.flip(frame, True, False)
             self.left_big_red_frames.append(new_image)
 
         for frame in self.right_big_black_frames:
-            new_image = pg.transform.flip(frame, True, False)
+            new_image = setup.FRAMES.flip(frame, True, False)
             self.left_big_black_frames.append(new_image)
 
         for frame in self.right_fire_frames:
-            new_image = pg.transform.flip(frame, True, False)
+            new_image = setup.FRAMES.flip(frame, True, False)
             self.left_fire_frames.append(new_image)
 
         self.normal_small_frames = [self.right_small_normal_frames,
@@ -372,15 +373,8 @@ class Mario(pg.sprite.Sprite):
 
     def get_image(self, x, y, width, height):
         """Extracts image from sprite sheet"""
-        image = pg.Surface([width, height])
-        rect = image.get_rect()
-
-        image.blit(self.sprite_sheet, (0, 0), (x, y, width, height))
-        image.set_colorkey(c.BLACK)
-        image = pg.transform.scale(image,
-                                   (int(rect.width * c.SIZE_MULTIPLIER),
-                                    int(rect.height * c.SIZE_MULTIPLIER)))
-        return image
+        return setup.FRAMES.get_image(self.sprite_sheet, x, y, width, height,
+                                      c.SIZE_MULTIPLIER, c.BLACK)
 
     def update(self, keys, game_info, fire_group):
         """Updates Mario's states and animations once per frame"""
@@ -667,6 +661,7 @@ class Mario(pg.sprite.Sprite):
         self.gravity = .5
         self.frame_index = 6
         self.image = self.right_frames[self.frame_index]
+        self.visible = True
         self.state = c.DEATH_JUMP
         self.in_transition_state = True
 
@@ -1037,18 +1032,18 @@ class Mario(pg.sprite.Sprite):
                 self.hurt_invincible = False
                 self.hurt_invisible_timer = 0
                 self.hurt_invisible_timer2 = 0
-                for frames in self.all_images:
-                    for image in frames:
-                        image.set_alpha(255)
+                self.visible = True
 
     def hurt_invincible_check(self):
-        """Makes Mario invincible on a fixed interval"""
+        """Makes Mario flicker on a fixed interval.  The frames are shared
+        with every other Mario, so rather than fading them he is just
+        left undrawn while visible is False"""
         if self.hurt_invisible_timer == 0:
             self.hurt_invisible_timer = self.current_time
         elif (self.current_time - self.hurt_invisible_timer) < 35:
-            self.image.set_alpha(0)
+            self.visible = False
         elif (self.current_time - self.hurt_invisible_timer) < 70:
-            self.image.set_alpha(255)
+            self.visible = True
             self.hurt_invisible_timer = self.current_time
 
     def check_if_crouching(self):
@@ -5,6 +5,55 @@ from .. import setup
 from .. import constants as c
 
 
+IMAGE_DICT = {}
+POOL = []
+
+
+def spawn(x, y, score, flag_pole=False):
+    """Returns a floating score, reusing a retired one if there is one"""
+    if POOL:
+        floating_score = POOL.pop()
+        floating_score.reset(x, y, score, flag_pole)
+        return floating_score
+    return Score(x, y, score, flag_pole)
+
+
+def retire(floating_score):
+    """Puts a score that finished floating back in the pool"""
+    POOL.append(floating_score)
+
+
+def rebuild(saved):
+    """A floating score, from the pool if there is one, put back in the
+    state Score.save returned"""
+    x, y, y_vel, score_string, flag_pole, digit_y = saved
+    floating_score = spawn(x, y, score_string, flag_pole)
+    floating_score.y_vel = y_vel
+    for digit in floating_score.digit_list:
+        digit.rect.y = digit_y
+    return floating_score
+
+
+def update_scores(score_list, level_info):
+    """Moves every score in score_list, then removes the finished ones"""
+    for floating_score in score_list:
+        floating_score.update(None, level_info)
+    delete_finished_scores(score_list)
+
+
+def delete_finished_scores(score_list):
+    """Removes finished scores from score_list in one compacting pass and
+    returns them to the pool"""
+    keep = 0
+    for floating_score in score_list:
+        if floating_score.finished():
+            retire(floating_score)
+        else:
+            score_list[keep] = floating_score
+            keep += 1
+    del score_list[keep:]
+
+
 class Digit(pg.sprite.Sprite):
     """Individual digit for score"""
 
@@ -18,21 +67,34 @@ class Score(object):
     """Scores that appear, float up, and disappear"""
 
     def __init__(self, x, y, score, flag_pole=False):
+        self.sprite_sheet = setup.GFX['item_objects']
+        self.create_image_dict()
+        self.digit_list = []
+        self.reset(x, y, score, flag_pole)
+
+    def reset(self, x, y, score, flag_pole=False):
+        """Starts the score floating up from x, y"""
         self.x = x
         self.y = y
         if flag_pole:
             self.y_vel = -4
         else:
             self.y_vel = -3
-        self.sprite_sheet = setup.GFX['item_objects']
-        self.create_image_dict()
         self.score_string = str(score)
         self.create_digit_list()
         self.flag_pole_score = flag_pole
 
+    def save(self):
+        """The score's state by value, for rebuild"""
+        return (self.x, self.y, self.y_vel, self.score_string,
+                self.flag_pole_score, self.digit_list[0].rect.y)
+
     def create_image_dict(self):
-        """Creates the dictionary for all the number images needed"""
-        self.image_dict = {}
+        """Points image_dict at the digit images shared by every score,
+        extracting them from the sprite sheet the first time"""
+        self.image_dict = IMAGE_DICT
+        if IMAGE_DICT:
+            return
 
         image0 = self.get_image(1, 168, 3, 8)
         image1 = self.get_image(5, 168, 3, 8)
@@ -56,30 +118,26 @@ class Score(object):
 
     def get_image(self, x, y, width, height):
         """Extracts image from sprite sheet"""
-        image = pg.Surface([width, height]).convert()
-        rect = image.get_rect()
-
-        image.blit(self.sprite_sheet, (0, 0), (x, y, width, height))
-        image.set_colorkey(c.BLACK)
-        image = pg.transform.scale(image,
-                                   (int(rect.width * c.BRICK_SIZE_MULTIPLIER),
-                                    int(rect.height * c.BRICK_SIZE_MULTIPLIER)))
-        return image
+        return setup.FRAMES.get_image(self.sprite_sheet, x, y, width, height,
+                                      c.BRICK_SIZE_MULTIPLIER, c.BLACK)
 
     def create_digit_list(self):
-        """Creates the group of images based on score received"""
-        self.digit_list = []
-        self.digit_group = pg.sprite.Group()
+        """Creates the digit sprites for the score received, reusing the
+        ones left from this score's last use"""
+        del self.digit_list[len(self.score_string):]
 
-        for digit in self.score_string:
-            self.digit_list.append(Digit(self.image_dict[digit]))
+        for i, digit in enumerate(self.score_string):
+            if i < len(self.digit_list):
+                self.digit_list[i].image = self.image_dict[digit]
+            else:
+                self.digit_list.append(Digit(self.image_dict[digit]))
 
         self.set_rects_for_images()
 
     def set_rects_for_images(self):
         """Set the rect attributes for each image in self.image_list"""
         for i, digit in enumerate(self.digit_list):
-            digit.rect = digit.image.get_rect()
+            digit.rect.size = digit.image.get_size()
             digit.rect.x = self.x + (i * 10)
             digit.rect.y = self.y
 
@@ -95,18 +153,19 @@ class Score(object):
             if self.digit_list[0].rect.y <= 120:
                 self.y_vel = 0
 
-    def draw(self, screen):
-        """Draws score numbers onto screen"""
-        for digit in self.digit_list:
-            screen.blit(digit.image, digit.rect)
+    def draw(self, screen, offset_x=0):
+        """Draws score numbers onto screen, shifted left by offset_x for
+        scores placed in level coordinates.  Returns the area drawn over"""
+        rects = [screen.blit(digit.image, (digit.rect.x - offset_x, digit.rect.y))
+                 for digit in self.digit_list]
+        return rects[0].unionall(rects[1:])
 
     def check_to_delete_floating_scores(self, score_list, level_info):
         """Check if scores need to be deleted"""
-        for i, score in enumerate(score_list):
-            if int(score.score_string) == 1000:
-                if (score.y - score.digit_list[0].rect.y) > 130:
-                    score_list.pop(i)
+        delete_finished_scores(score_list)
 
-            else:
-                if (score.y - score.digit_list[0].rect.y) > 75:
-                    score_list.pop(i)
+    def finished(self):
+        """Whether the score has floated far enough to disappear"""
+        if self.score_string == '1000':
+            return (self.y - self.digit_list[0].rect.y) > 130
+        return (self.y - self.digit_list[0].rect.y) > 75
@@ -33,6 +33,9 @@ SIZE_MULTIPLIER = 2.5
 BRICK_SIZE_MULTIPLIER = 2.69
 BACKGROUND_MULTIPLER = 2.679
 GROUND_HEIGHT = SCREEN_HEIGHT - 62
+COLLIDER_CELL_SIZE = 128
+COLLIDER_BUMP_PADDING = 24
+ACTIVATION_MARGIN = SCREEN_WIDTH // 2
 
 #MARIO FORCES
 WALK_ACCEL = .15
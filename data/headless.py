@@ -0,0 +1,187 @@
+"""
+Runs Level1 without a window or a real-time clock, as fast as the CPU
+allows.  Used for scripted playthroughs and throughput measurements:
+
+    python -m SuperMarioLevel1.data.headless --frames 5000
+    python -m SuperMarioLevel1.data.headless --snapshots
+"""
+
+import os
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+os.environ.setdefault('MARIO_HEADLESS', '1')
+
+import time
+import pygame as pg
+from . import tools
+from . import pixels
+from . import constants as c
+from .states import level1
+
+
+def new_game_info():
+    """Game info for a fresh game, the same values the main menu uses"""
+    return {c.COIN_TOTAL: 0,
+            c.SCORE: 0,
+            c.LIVES: 3,
+            c.TOP_SCORE: 0,
+            c.CURRENT_TIME: 0.0,
+            c.LEVEL_STATE: None,
+            c.CAMERA_START_X: 0,
+            c.MARIO_DEAD: False}
+
+
+class Simulator(object):
+    """Steps a Level1 on a tools.FixedStepClock, a synthetic frame counter
+    in place of pg.time.get_ticks().  Nothing is rendered unless render is True."""
+    def __init__(self, game_info=None, render=False, fps=60):
+        self.clock = tools.FixedStepClock(fps)
+        self.render = render
+        self.surface = pg.Surface(c.SCREEN_SIZE) if render else None
+        self.level = level1.Level1()
+        self.steps = 0
+        self.seconds = 0.0
+        self.reset_times = []
+        self.reset(game_info)
+
+    def reset(self, game_info=None):
+        """Starts the level over with a new frame counter.  The time the
+        level took to start is added to reset_times"""
+        if game_info is None:
+            game_info = new_game_info()
+        self.clock.frame = 0
+        self.done = self.level.done = False
+        start = time.perf_counter()
+        self.level.startup(self.clock.get_ticks(), game_info)
+        self.reset_times.append(time.perf_counter() - start)
+
+    def snapshot(self):
+        """Returns the frame counter and level state, for restore"""
+        return self.clock.frame, self.done, self.level.snapshot()
+
+    def restore(self, snap):
+        """Goes back to a frame saved by snapshot"""
+        self.clock.frame, self.done, level_snap = snap
+        self.level.restore(level_snap)
+
+    @property
+    def frame(self):
+        return self.clock.frame
+
+    def pixels(self):
+        """The last frame drawn, as a pixels.view of the surface (no copy)"""
+        return pixels.view(self.surface)
+
+    def step(self, mask=0, repeat=1):
+        """Advances the level repeat frames with the keys in mask held
+        down.  Only the last frame is drawn (or the one the level ended
+        on).  Returns True once the level is finished"""
+        if repeat < 1:
+            raise ValueError('repeat must be at least 1, not {}'.format(repeat))
+        if self.done:
+            return True
+        keys = tools.KeyMask(mask)
+        level = self.level
+        for tick in range(repeat - 1):
+            level.update(None, keys, self.clock.tick())
+            if level.done:
+                if self.surface is not None:
+                    level.blit_everything(self.surface)
+                self.done = True
+                return True
+        level.update(self.surface, keys, self.clock.tick())
+        self.done = level.done
+        return self.done
+
+    def run(self, masks, repeat=1):
+        """Steps through every mask in masks, each held for repeat frames
+        (stopping early if the level ends), and returns throughput numbers
+        for the run"""
+        steps = 0
+        start = time.perf_counter()
+        for mask in masks:
+            frame = self.clock.frame
+            done = self.step(mask, repeat)
+            steps += self.clock.frame - frame
+            if done:
+                break
+        seconds = time.perf_counter() - start
+        self.steps += steps
+        self.seconds += seconds
+        return {'steps': steps,
+                'seconds': seconds,
+                'steps_per_second': steps / seconds if seconds else 0.0}
+
+    def steps_per_second(self):
+        """Average throughput over every run so far"""
+        if not self.seconds:
+            return 0.0
+        return self.steps / self.seconds
+
+
+def snapshot_benchmark(frames, every):
+    """Runs right through frames (jumping every other 20 frames, starting
+    over when Mario dies), snapshotting every few frames, then restores
+    each snapshot.  Returns the mean bytes per snapshot, and the mean
+    seconds to take and to restore one"""
+    keys = tools.KEY_BITS
+    run = keys[tools.keybinding['right']] | keys[tools.keybinding['action']]
+    jump = keys[tools.keybinding['jump']]
+    simulator = Simulator()
+    snapshots = []
+    take_seconds = 0.0
+    for frame in range(frames):
+        if simulator.step(run | jump if frame // 20 % 2 else run):
+            simulator.reset()
+        if frame % every == 0:
+            start = time.perf_counter()
+            snapshots.append(simulator.snapshot())
+            take_seconds += time.perf_counter() - start
+    start = time.perf_counter()
+    for snap in snapshots:
+        simulator.restore(snap)
+    restore_seconds = time.perf_counter() - start
+    count = len(snapshots)
+    nbytes = sum(level_snap.nbytes() for frame, done, level_snap in snapshots)
+    return nbytes / count, take_seconds / count, restore_seconds / count
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--frames', type=int, default=3000)
+    parser.add_argument('--render', action='store_true')
+    parser.add_argument('--repeat', type=int, default=1,
+                        help='frames each input is held for, only the last drawn')
+    parser.add_argument('--snapshots', action='store_true',
+                        help='time Level1.snapshot and restore instead')
+    args = parser.parse_args()
+
+    if args.snapshots:
+        nbytes, take_seconds, restore_seconds = snapshot_benchmark(args.frames, 10)
+        print('{:.0f} bytes per snapshot, snapshot {:.1f} us, restore {:.1f} us '
+              '({:.0f} restores/sec)'.format(nbytes, take_seconds * 1e6,
+                                             restore_seconds * 1e6,
+                                             1 / restore_seconds))
+        return
+
+    right = tools.KEY_BITS[tools.keybinding['right']]
+    simulator = Simulator(render=args.render)
+    while simulator.steps < args.frames:
+        simulator.run([right] * ((args.frames - simulator.steps) // args.repeat or 1),
+                      args.repeat)
+        if simulator.done:
+            simulator.reset()
+    print('{} steps in {:.3f}s - {:.1f} steps/sec'.format(
+        simulator.steps, simulator.seconds, simulator.steps_per_second()))
+    restarts = simulator.reset_times[1:]
+    if restarts:
+        print('level startup {:.2f} ms, then {} restarts averaging {:.2f} ms '
+              '(max {:.2f} ms)'.format(simulator.reset_times[0] * 1000,
+                                       len(restarts),
+                                       sum(restarts) / len(restarts) * 1000,
+                                       max(restarts) * 1000))
+
+
+if __name__ == '__main__':
+    main()
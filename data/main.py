@@ -1,21 +1,50 @@
 __author__ = 'justinarmstrong'
 
 from . import setup,tools
+from . import replay
 from .states import main_menu,load_screen,level1
 from . import constants as c
 
 
-def main():
-    """Add states to control here."""
-    run_it = tools.Control(setup.ORIGINAL_CAPTION)
-    state_dict = {c.MAIN_MENU: main_menu.Menu(),
-                  c.LOAD_SCREEN: load_screen.LoadScreen(),
-                  c.TIME_OUT: load_screen.TimeOut(),
-                  c.GAME_OVER: load_screen.GameOver(),
-                  c.LEVEL1: level1.Level1()}
-
-    run_it.setup_states(state_dict, c.MAIN_MENU)
-    run_it.main()
+def create_states():
+    """The states the game moves between, by name"""
+    return {c.MAIN_MENU: main_menu.Menu(),
+            c.LOAD_SCREEN: load_screen.LoadScreen(),
+            c.TIME_OUT: load_screen.TimeOut(),
+            c.GAME_OVER: load_screen.GameOver(),
+            c.LEVEL1: level1.Level1()}
 
 
+def main(fixed_step=False, dirty_rects=False, profile_path=None,
+         record_path=None, replay_path=None):
+    """Add states to control here.  With fixed_step the game runs on a
+    deterministic tools.FixedStepClock instead of the wall clock, and
+    with dirty_rects only the changed parts of the screen are pushed
+    to the display each frame.  F6 shows the frame profiler, and its
+    percentiles are written to profile_path on exit.  With record_path
+    the keys held on every step are saved there as a replay.Recording
+    when the game closes, and with replay_path such a recording is
+    played back in place of the keyboard.  Both use the fixed step."""
+    replay_input = None
+    if record_path:
+        replay_input = replay.Recorder()
+    elif replay_path:
+        replay_input = replay.Player(replay.Recording.load(replay_path))
+    if replay_input is not None:
+        fixed_step = True
+    game_clock = tools.FixedStepClock() if fixed_step else None
+    run_it = tools.Control(setup.ORIGINAL_CAPTION, game_clock, dirty_rects,
+                           profile_path, setup.FONTS.get('Fixedsys500c'),
+                           replay_input)
+    run_it.setup_states(create_states(), c.MAIN_MENU)
+    run_it.main()
+    setup.ASSETS.save()
 
+    if record_path:
+        replay_input.finish(run_it).save(record_path)
+    elif replay_path:
+        result = replay_input.finish(run_it)
+        expected = replay_input.recording.outcome
+        if expected is not None and result != expected:
+            print('replay ended at {}, recorded {}'.format(tuple(result),
+                                                        tuple(expected)))
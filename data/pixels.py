@@ -0,0 +1,147 @@
+"""
+Pixel observations of the rendered game.  view() hands out a frame as a
+NumPy view of the surface's own memory (pg.surfarray.pixels3d), and
+FrameProcessor turns that into a smaller copy, downsampled and optionally
+grayscale, in one pass of vectorized writes.  PixelObservation plugs that
+into batch_env.BatchEnv, with frame stacking.
+
+    python -m SuperMarioLevel1.data.pixels
+
+times it against copying the frame out with pg.image.tostring first.
+"""
+
+import os
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+os.environ.setdefault('MARIO_HEADLESS', '1')
+
+import timeit
+import numpy as np
+import pygame as pg
+from . import constants as c
+
+# integer luma weights, summing to 256
+GRAY_WEIGHTS = (77, 150, 29)
+
+
+def view(surface):
+    """The (height, width, 3) RGB pixels of surface as a uint8 view of
+    its memory.  The surface is locked, and can't be blitted to, until
+    the view and everything sliced from it are gone."""
+    return pg.surfarray.pixels3d(surface).transpose(1, 0, 2)
+
+
+class FrameProcessor(object):
+    """Writes a surface's pixels into an array, keeping every scale-th
+    pixel in each direction and, if grayscale is True, mixing the channels
+    to luma with integer weights.  Nothing is allocated per frame."""
+    def __init__(self, scale=1, grayscale=False, size=c.SCREEN_SIZE):
+        width, height = size
+        self.scale = scale
+        self.grayscale = grayscale
+        self.shape = ((height + scale - 1) // scale, (width + scale - 1) // scale)
+        if grayscale:
+            self.total = np.empty(self.shape, np.uint16)
+            self.term = np.empty(self.shape, np.uint16)
+        else:
+            self.shape += (3,)
+
+    def process(self, surface, out):
+        """Writes the processed pixels of surface into out"""
+        pixels = view(surface)[::self.scale, ::self.scale]
+        if self.grayscale:
+            red, green, blue = GRAY_WEIGHTS
+            np.multiply(pixels[..., 0], red, out=self.total, dtype=np.uint16)
+            np.multiply(pixels[..., 1], green, out=self.term, dtype=np.uint16)
+            self.total += self.term
+            np.multiply(pixels[..., 2], blue, out=self.term, dtype=np.uint16)
+            self.total += self.term
+            np.right_shift(self.total, 8, out=out, casting='unsafe')
+        else:
+            # a channel at a time: copying all three at once walks the
+            # surface's reversed BGRA channel order byte by byte, 3x slower
+            for channel in range(3):
+                out[..., channel] = pixels[..., channel]
+
+
+class PixelObservation(object):
+    """BatchEnv observation of each copy's rendered frame, run through a
+    FrameProcessor, with the last stack frames stacked oldest first.  A
+    copy that starts over has its stack filled with its first frame."""
+    render = True
+    dtype = np.uint8
+
+    def __init__(self, scale=1, grayscale=False, stack=1):
+        self.processor = FrameProcessor(scale, grayscale)
+        self.stack = stack
+        self.shape = (stack,) + self.processor.shape
+        self.history = None
+        self.position = 0
+        self.fresh = set()
+
+    def reset(self, index):
+        self.fresh.add(index)
+
+    def fill(self, simulators, out):
+        """Writes each simulator's latest frame into its row of out"""
+        process = self.processor.process
+        if self.stack == 1:
+            for index, simulator in enumerate(simulators):
+                process(simulator.surface, out[index, 0])
+            return
+        if self.history is None:
+            self.history = np.zeros((len(simulators),) + self.shape, self.dtype)
+            self.fresh.update(range(len(simulators)))
+        self.position = position = (self.position + 1) % self.stack
+        history = self.history
+        for index, simulator in enumerate(simulators):
+            frames = history[index]
+            process(simulator.surface, frames[position])
+            if index in self.fresh:
+                frames[:] = frames[position]
+            # the ring from the oldest frame (just after position) round
+            out[index, :self.stack - position - 1] = frames[position + 1:]
+            out[index, self.stack - position - 1:] = frames[:position + 1]
+        self.fresh.clear()
+
+
+def naive(surface, scale, grayscale):
+    """The frame copied out with pg.image.tostring, then processed"""
+    width, height = surface.get_size()
+    pixels = np.frombuffer(pg.image.tostring(surface, 'RGB'), np.uint8)
+    pixels = pixels.reshape(height, width, 3)[::scale, ::scale]
+    if grayscale:
+        return np.dot(pixels, np.array(GRAY_WEIGHTS) / 256.0).astype(np.uint8)
+    return np.ascontiguousarray(pixels)
+
+
+def main():
+    import argparse
+    from . import headless
+    from . import tools
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--number', type=int, default=200)
+    args = parser.parse_args()
+
+    simulator = headless.Simulator(render=True)
+    for frame in range(120):
+        simulator.step(tools.KEY_BITS[tools.keybinding['right']])
+    surface = simulator.surface
+    start = timeit.default_timer()
+    for attempt in range(args.number):
+        simulator.pixels()
+    print('view: {:.1f} us'.format((timeit.default_timer() - start) / args.number * 1e6))
+    for scale, grayscale in ((1, False), (2, False), (1, True), (2, True), (4, True)):
+        processor = FrameProcessor(scale, grayscale, surface.get_size())
+        out = np.empty(processor.shape, np.uint8)
+        fused = min(timeit.repeat(lambda: processor.process(surface, out),
+                                  number=args.number, repeat=3)) / args.number
+        copied = min(timeit.repeat(lambda: naive(surface, scale, grayscale),
+                                   number=args.number, repeat=3)) / args.number
+        print('scale {} {:<5}: fused {:7.0f} us, tostring copy {:7.0f} us '
+              '({:.1f}x)'.format(scale, 'gray' if grayscale else 'rgb',
+                                 fused * 1e6, copied * 1e6, copied / fused))
+
+
+if __name__ == '__main__':
+    main()
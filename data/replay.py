@@ -0,0 +1,209 @@
+"""
+Records the keys held on every fixed step of a game as a run-length
+encoded file, and plays such files back through tools.Control in place
+of the keyboard.  A recording also keeps the outcome of the run it was
+made from (score, level time, Mario's position, ...) so a playback can
+be checked against it.
+
+    python mario_level_1.py --record run.replay
+    python mario_level_1.py --replay run.replay
+    python -m SuperMarioLevel1.data.replay run.replay [more.replay ...]
+
+The last form plays the files headless as fast as possible and exits
+with status 1 if any of them doesn't end the way it was recorded.
+"""
+
+import struct
+import time
+from collections import namedtuple
+from itertools import repeat
+from . import tools
+from . import constants as c
+
+MAGIC = b'MARIORP1'
+HEADER = struct.Struct('<8sHB')
+OUTCOME = struct.Struct('<7i')
+
+Outcome = namedtuple('Outcome', ['frames', 'score', 'coins', 'lives',
+                                 'time', 'x', 'y'])
+
+
+def write_varint(out, value):
+    """Appends value to the bytearray out, 7 bits per byte"""
+    while value > 0x7f:
+        out.append(value & 0x7f | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def read_varint(data, pos):
+    """Returns the varint at data[pos] and the position after it"""
+    value = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+class Recording(object):
+    """One tools.KEY_BITS mask per fixed step, kept as [mask, count] runs.
+    On disk that is the header, the outcome if there is one, then a mask
+    byte and a varint count per run, so a held key costs two bytes
+    however long it is held."""
+    def __init__(self, fps=60, runs=None, outcome=None):
+        self.fps = fps
+        self.runs = runs if runs is not None else []
+        self.outcome = outcome
+
+    @property
+    def frames(self):
+        return sum(count for mask, count in self.runs)
+
+    def add(self, mask, count=1):
+        """Adds count steps with mask held"""
+        if self.runs and self.runs[-1][0] == mask:
+            self.runs[-1][1] += count
+        else:
+            self.runs.append([mask, count])
+
+    def masks(self):
+        """Yields the mask for each step in order"""
+        for mask, count in self.runs:
+            for held in repeat(mask, count):
+                yield held
+
+    def to_bytes(self):
+        data = bytearray(HEADER.pack(MAGIC, self.fps, self.outcome is not None))
+        if self.outcome is not None:
+            data += OUTCOME.pack(*self.outcome)
+        for mask, count in self.runs:
+            data.append(mask)
+            write_varint(data, count)
+        return bytes(data)
+
+    @classmethod
+    def from_bytes(cls, data):
+        magic, fps, has_outcome = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError('not a replay file')
+        pos = HEADER.size
+        outcome = None
+        if has_outcome:
+            outcome = Outcome(*OUTCOME.unpack_from(data, pos))
+            pos += OUTCOME.size
+        runs = []
+        while pos < len(data):
+            mask = data[pos]
+            count, pos = read_varint(data, pos + 1)
+            runs.append([mask, count])
+        return cls(fps, runs, outcome)
+
+    def save(self, path):
+        with open(path, 'wb') as replay_file:
+            replay_file.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as replay_file:
+            return cls.from_bytes(replay_file.read())
+
+
+class Recorder(object):
+    """Control.replay that adds the keys held on each step to a Recording"""
+    def __init__(self, fps=60):
+        self.recording = Recording(fps)
+        self.done = False
+
+    def step(self, keys):
+        self.recording.add(tools.mask_from_keys(keys))
+        return keys
+
+    def finish(self, control):
+        """Stores how the run ended and returns the Recording"""
+        self.recording.outcome = outcome(control, self.recording.frames)
+        return self.recording
+
+
+class Player(object):
+    """Control.replay that hands out the recorded keys in place of the
+    keyboard, and is done when they run out"""
+    def __init__(self, recording):
+        self.recording = recording
+        self.masks = recording.masks()
+        self.frame = 0
+        self.done = False
+
+    def step(self, keys):
+        mask = next(self.masks, None)
+        if mask is None:
+            self.done = True
+            return keys
+        self.frame += 1
+        return tools.KeyMask(mask)
+
+    def finish(self, control):
+        """How the playback ended, to compare with recording.outcome"""
+        return outcome(control, self.frame)
+
+
+def outcome(control, frames):
+    """The Outcome of a run of control, taken from its Level1 (all zeros
+    but frames if the level was never started)"""
+    level = control.state_dict.get(c.LEVEL1)
+    if level is None or not hasattr(level, 'mario'):
+        return Outcome(frames, 0, 0, 0, 0, 0, 0)
+    game_info = level.game_info
+    return Outcome(frames, game_info[c.SCORE], game_info[c.COIN_TOTAL],
+                   game_info[c.LIVES], level.overhead_info_display.time,
+                   level.mario.rect.x, level.mario.rect.y)
+
+
+def play(recording, render=False):
+    """Plays recording through a new Control as fast as possible and
+    returns the Outcome"""
+    from . import main
+    player = Player(recording)
+    control = tools.Control(c.ORIGINAL_CAPTION,
+                            tools.FixedStepClock(recording.fps), replay=player)
+    control.setup_states(main.create_states(), c.MAIN_MENU)
+    control.fast_main(render)
+    return player.finish(control)
+
+
+def main():
+    import argparse
+    import os
+    import sys
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    os.environ.setdefault('MARIO_HEADLESS', '1')
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('paths', nargs='+')
+    parser.add_argument('--render', action='store_true')
+    args = parser.parse_args()
+
+    failed = 0
+    for path in args.paths:
+        recording = Recording.load(path)
+        start = time.perf_counter()
+        result = play(recording, args.render)
+        seconds = time.perf_counter() - start
+        if recording.outcome is None:
+            status = 'no outcome recorded'
+        elif result == recording.outcome:
+            status = 'ok'
+        else:
+            status = 'MISMATCH, recorded {}'.format(tuple(recording.outcome))
+            failed += 1
+        print('{}: {} steps in {:.2f}s ({:.0f} steps/sec), {} - {}'.format(
+            path, result.frames, seconds, result.frames / seconds,
+            tuple(result), status))
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
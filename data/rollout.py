@@ -0,0 +1,225 @@
+"""
+Runs BatchEnvs in worker processes so rollouts can use every core.  The
+workers are forked after the assets, frame bank and LevelTemplate are
+loaded (and the heap is frozen out of the garbage collector), so they
+share those pages copy-on-write instead of each loading its own.
+
+Observations, rewards and done flags go through a ring of steps in a
+multiprocessing.shared_memory block: each worker writes its rows of a
+step straight into the ring and only a step number goes through its
+pipe, so nothing the size of an observation is ever pickled.
+
+    python -m SuperMarioLevel1.data.rollout --workers 4 --envs 8 --steps 1000
+"""
+
+import os
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+os.environ.setdefault('MARIO_HEADLESS', '1')
+
+import gc
+import multiprocessing
+import time
+from multiprocessing import shared_memory
+import numpy as np
+from . import batch_env
+from . import headless
+from . import tools
+
+
+class Ring(object):
+    """ring steps of observations, rewards and done flags for n envs, plus
+    the actions for the next step, as NumPy views of one SharedMemory
+    block"""
+    def __init__(self, ring, n, observation, shm=None):
+        shapes = [('observations', (ring, n) + observation.shape, observation.dtype),
+                  ('rewards', (ring, n), np.float32),
+                  ('dones', (ring, n), np.bool_),
+                  ('actions', (n,), np.int64)]
+        size = sum(int(np.prod(shape)) * np.dtype(dtype).itemsize
+                   for name, shape, dtype in shapes)
+        self.shm = shm or shared_memory.SharedMemory(create=True, size=size)
+        offset = 0
+        for name, shape, dtype in shapes:
+            array = np.ndarray(shape, dtype, self.shm.buf, offset)
+            setattr(self, name, array)
+            offset += array.nbytes
+        self.nbytes = offset
+
+    def close(self, unlink=False):
+        """Lets go of the block, and frees it if unlink is True"""
+        self.observations = self.rewards = self.dones = self.actions = None
+        try:
+            self.shm.close()
+        except BufferError:
+            # views handed out by step are still alive; the mapping goes
+            # when they do
+            pass
+        if unlink:
+            self.shm.unlink()
+
+
+def worker(conn, ring, lo, hi, observation):
+    """Worker process loop.  Hosts a BatchEnv for envs lo to hi and, for
+    each command from the runner, steps or resets it into the given ring
+    slot"""
+    env = batch_env.BatchEnv(hi - lo, observation)
+    try:
+        while True:
+            command, slot, repeat = conn.recv()
+            if command == 'close':
+                break
+            env.observations = ring.observations[slot, lo:hi]
+            if command == 'reset':
+                env.reset()
+                ring.rewards[slot, lo:hi] = 0
+                ring.dones[slot, lo:hi] = False
+            elif command == 'step':
+                steps = env.steps
+                env.step(ring.actions[lo:hi], repeat)
+                ring.rewards[slot, lo:hi] = env.rewards
+                ring.dones[slot, lo:hi] = env.dones
+                conn.send(env.steps - steps)
+                continue
+            elif command == 'stats':
+                conn.send((env.steps, env.seconds))
+                continue
+            conn.send(None)
+    finally:
+        ring.close()
+        conn.close()
+
+
+class RolloutRunner(object):
+    """workers processes, each stepping envs_per_worker copies of 1-1.
+    step hands every worker its slice of the actions and returns the
+    step's rows of the shared ring.  Those are views, good until the ring
+    wraps around ring steps later."""
+    def __init__(self, workers, envs_per_worker=1, ring=64, observation=None):
+        self.observation = observation or batch_env.StateObservation()
+        self.n = workers * envs_per_worker
+        # load everything the workers share before they are forked
+        headless.Simulator()
+        self.ring = Ring(ring, self.n, self.observation)
+        self.size = ring
+        self.frame = 0
+        self.steps = 0
+        self.seconds = 0.0
+        context = multiprocessing.get_context('fork')
+        self.conns = []
+        self.processes = []
+        gc.collect()
+        gc.freeze()
+        try:
+            for index in range(workers):
+                parent, child = context.Pipe()
+                lo = index * envs_per_worker
+                process = context.Process(
+                    target=worker, daemon=True,
+                    args=(child, self.ring, lo, lo + envs_per_worker,
+                          self.observation))
+                process.start()
+                child.close()
+                self.conns.append(parent)
+                self.processes.append(process)
+        finally:
+            gc.unfreeze()
+
+    def __len__(self):
+        return self.n
+
+    def send_all(self, command, slot, repeat=1):
+        """Sends every worker a command and returns their replies"""
+        for conn in self.conns:
+            conn.send((command, slot, repeat))
+        return [conn.recv() for conn in self.conns]
+
+    def views(self, slot):
+        return (self.ring.observations[slot], self.ring.rewards[slot],
+                self.ring.dones[slot])
+
+    def reset(self):
+        """Starts every env over and returns the observations"""
+        slot = self.frame % self.size
+        self.send_all('reset', slot)
+        return self.ring.observations[slot]
+
+    def step(self, actions, repeat=1):
+        """Steps every env repeat frames with its key bitmask in actions
+        and returns the observations, rewards and done flags, as
+        BatchEnv.step does"""
+        start = time.perf_counter()
+        self.frame += 1
+        slot = self.frame % self.size
+        self.ring.actions[:] = actions
+        self.steps += sum(self.send_all('step', slot, repeat))
+        self.seconds += time.perf_counter() - start
+        return self.views(slot)
+
+    def recent(self, count):
+        """The observations of the last count steps, oldest first (copied,
+        since they may wrap around the end of the ring)"""
+        if count > self.size:
+            raise ValueError('only the last {} steps are kept'.format(self.size))
+        slots = np.arange(self.frame - count + 1, self.frame + 1) % self.size
+        return self.ring.observations[slots]
+
+    def worker_stats(self):
+        """(env-steps, seconds spent stepping) for each worker"""
+        for conn in self.conns:
+            conn.send(('stats', None, 1))
+        return [conn.recv() for conn in self.conns]
+
+    def steps_per_second(self):
+        """Env-steps per second of wall time across all workers"""
+        if not self.seconds:
+            return 0.0
+        return self.steps / self.seconds
+
+    def close(self):
+        for conn in self.conns:
+            conn.send(('close', None, 1))
+            conn.close()
+        for process in self.processes:
+            process.join()
+        self.conns = []
+        self.processes = []
+        if self.ring.shm is not None:
+            self.ring.close(unlink=True)
+            self.ring.shm = None
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--envs', type=int, default=8,
+                        help='envs per worker')
+    parser.add_argument('--steps', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=1,
+                        help='frames each action is held for')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    keys = tools.KEY_BITS
+    run = keys[tools.keybinding['right']] | keys[tools.keybinding['action']]
+    jump = keys[tools.keybinding['jump']]
+    rng = np.random.default_rng(args.seed)
+    runner = RolloutRunner(args.workers, args.envs)
+    try:
+        runner.reset()
+        for step in range(args.steps):
+            runner.step(np.where(rng.random(len(runner)) < 0.3, run | jump, run),
+                        args.repeat)
+        stats = runner.worker_stats()
+    finally:
+        runner.close()
+    for index, (steps, seconds) in enumerate(stats):
+        print('worker {}: {} env-steps, {:.0f} env-steps/sec'.format(
+            index, steps, steps / seconds))
+    print('{} workers x {} envs: {:.0f} env-steps/sec on {} cores'.format(
+        args.workers, args.envs, runner.steps_per_second(), os.cpu_count()))
+
+
+if __name__ == '__main__':
+    main()
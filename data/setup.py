@@ -2,22 +2,30 @@ __author__ = 'justinarmstrong'
 
 """
 This module initializes the display and creates dictionaries of resources.
+Images and sounds are only loaded the first time they are looked up.  With
+MARIO_HEADLESS=1 in the environment no display is opened, and SCREEN is a
+plain surface of the same size.
 """
 
 import os
 import sys
 import pygame as pg
-from SuperMarioLevel1.data.tools import load_all_gfx, load_all_music, load_all_fonts, load_all_sfx
+from SuperMarioLevel1.data.tools import lazy_gfx, load_all_music, load_all_fonts, lazy_sfx, FrameBank
 from SuperMarioLevel1.data import constants as c
+from SuperMarioLevel1.data.asset_cache import AssetCache
 
 ORIGINAL_CAPTION = c.ORIGINAL_CAPTION
+HEADLESS = os.environ.get('MARIO_HEADLESS') == '1'
 
 
 os.environ['SDL_VIDEO_CENTERED'] = '1'
 pg.init()
 pg.event.set_allowed([pg.KEYDOWN, pg.KEYUP, pg.QUIT])
-pg.display.set_caption(c.ORIGINAL_CAPTION)
-SCREEN = pg.display.set_mode(c.SCREEN_SIZE)
+if HEADLESS:
+    SCREEN = pg.Surface(c.SCREEN_SIZE)
+else:
+    pg.display.set_caption(c.ORIGINAL_CAPTION)
+    SCREEN = pg.display.set_mode(c.SCREEN_SIZE)
 SCREEN_RECT = SCREEN.get_rect()
 
 current_path = os.path.abspath(__file__)
@@ -25,6 +33,8 @@ current_path = os.path.abspath(__file__)
 resource_path = os.path.join(os.path.dirname(os.path.dirname(current_path)), 'resources')
 FONTS = load_all_fonts(os.path.join(resource_path, 'fonts'))
 MUSIC = load_all_music(os.path.join(resource_path, 'music'))
-GFX = load_all_gfx(os.path.join(resource_path, 'graphics'))
-SFX = load_all_sfx(os.path.join(resource_path, 'sound'))
-
+GFX = lazy_gfx(os.path.join(resource_path, 'graphics'))
+SFX = lazy_sfx(os.path.join(resource_path, 'sound'))
+ASSETS = AssetCache(os.path.join(resource_path, 'cache', 'assets.bin'),
+                    os.path.join(resource_path, 'graphics'))
+FRAMES = FrameBank(GFX, ASSETS)
@@ -0,0 +1,209 @@
+"""
+Captures the whole simulation state of a Level1 and puts it back, for
+search and rollback.  A snapshot keeps references to the level's own
+objects plus copies of everything about them that changes as the level is
+played, so restoring it is a handful of dict updates and slice
+assignments.  Surfaces are only ever referenced, never copied.
+
+Floating scores are the exception: they come from a pool shared by every
+level in the process, so one the snapshot saw may be floating for another
+level by the time it is restored.  They are saved by value instead and
+rebuilt from the pool on restore.
+"""
+
+import sys
+import pygame as pg
+from . import game_sound
+from .components import collider
+from .components import info
+from .components import score
+
+STATE_TYPES = (pg.sprite.Sprite, info.OverheadInfo, game_sound.Sound)
+CONSTANT_TYPES = frozenset([int, float, str, bool, type(None), tuple,
+                            pg.Surface, pg.mask.Mask])
+LEVEL_SKIP = ('dirty_rects', 'profiler', 'drawn_rects', 'drawn_viewport')
+# held by value, and counted by nbytes
+VALUE_TYPES = frozenset([int, float, str, tuple])
+
+
+class Snapshot(object):
+    """The state of a level at one frame.  objects pairs every sprite and
+    helper object with a copy of its attributes, containers and rects pair
+    the lists, dicts and Rects they hold with copies of their contents,
+    and groups pairs each sprite group with its members (and, for a
+    ColliderGrid, the cells they were filed in).  scores pairs each
+    floating score with its saved state, and holders lists the objects
+    and containers whose copies refer to one."""
+    def __init__(self, objects, containers, rects, groups, scores=(),
+                 holders=()):
+        self.objects = objects
+        self.containers = containers
+        self.rects = rects
+        self.groups = groups
+        self.scores = scores
+        self.holders = holders
+
+    def nbytes(self):
+        """Bytes the snapshot keeps alive by itself: its copies of
+        attributes, containers, rects and group members, and the numbers,
+        strings and tuples in them, each counted once.  The sprites,
+        groups and Surfaces it refers to belong to the level and are not
+        counted, nor are the small ints Python caches."""
+        counted = set()
+
+        def size(value):
+            if type(value) not in VALUE_TYPES or id(value) in counted:
+                return 0
+            if type(value) is int and -5 <= value <= 256:
+                return 0
+            counted.add(id(value))
+            if type(value) is tuple:
+                return sys.getsizeof(value) + sum(map(size, value))
+            return sys.getsizeof(value)
+
+        total = sum(sys.getsizeof(part) for part in (
+            self, self.objects, self.containers, self.rects, self.groups,
+            self.scores, self.holders))
+        for obj, attrs in self.objects:
+            total += sys.getsizeof(attrs) + sum(map(size, attrs.values()))
+        for container, copy in self.containers:
+            items = copy.values() if isinstance(copy, dict) else copy
+            total += sys.getsizeof(copy) + sum(map(size, items))
+        for rect, values in self.rects:
+            total += size(values)
+        for group, members, cells in self.groups:
+            total += sys.getsizeof(members) + sys.getsizeof(cells)
+        for floating_score, saved in self.scores:
+            total += size(saved)
+        return total
+
+
+def take(level, frozen=()):
+    """Returns a Snapshot of everything reachable from level's attributes.
+    Objects in frozen (and the sprites of frozen groups) never change and
+    are left out."""
+    seen = set(id(obj) for obj in frozen)
+    for group in frozen:
+        if isinstance(group, pg.sprite.AbstractGroup):
+            seen.update(id(sprite) for sprite in group)
+    seen.add(id(level))
+    objects = []
+    containers = []
+    rects = []
+    groups = []
+    scores = []
+    holders = []
+    Score = score.Score
+
+    attrs = dict(level.__dict__)
+    for name in LEVEL_SKIP:
+        attrs.pop(name, None)
+    objects.append((level, attrs))
+    pending = [value for value in attrs.values()
+               if type(value) not in CONSTANT_TYPES]
+    if Score in map(type, pending):
+        holders.append((level, attrs))
+    while pending:
+        value = pending.pop()
+        if id(value) in seen:
+            continue
+        seen.add(id(value))
+        if isinstance(value, STATE_TYPES):
+            attrs = dict(value.__dict__)
+            attrs.pop('_Sprite__g', None)
+            record = (value, attrs)
+            objects.append(record)
+            items = attrs.values()
+        elif isinstance(value, Score):
+            scores.append((value, value.save()))
+            continue
+        elif isinstance(value, pg.sprite.AbstractGroup):
+            items = value.sprites()
+            cells = None
+            if isinstance(value, collider.ColliderGrid):
+                cells = [value.sprite_cells[sprite] for sprite in items]
+            groups.append((value, items, cells))
+        elif isinstance(value, pg.Rect):
+            rects.append((value, tuple(value)))
+            continue
+        elif isinstance(value, list):
+            items = list(value)
+            record = (value, items)
+            containers.append(record)
+        elif isinstance(value, dict):
+            copy = dict(value)
+            record = (value, copy)
+            containers.append(record)
+            items = copy.values()
+        else:
+            continue
+        found = [item for item in items if type(item) not in CONSTANT_TYPES]
+        if Score in map(type, found):
+            holders.append(record)
+        pending.extend(found)
+    return Snapshot(objects, containers, rects, groups, scores, holders)
+
+
+def restore(snapshot):
+    """Puts every object in snapshot back the way it was.  Containers and
+    Rects are refilled in place, since several objects share them (the
+    game_info dict, the viewport), and a group is only rebuilt when its
+    members changed.  The snapshot itself is left untouched, so it can be
+    restored any number of times."""
+    floating = live_scores(snapshot.holders)
+    for obj, attrs in snapshot.objects:
+        obj.__dict__.update(attrs)
+    for container, copy in snapshot.containers:
+        if isinstance(container, list):
+            container[:] = copy
+        else:
+            container.clear()
+            container.update(copy)
+    for rect, values in snapshot.rects:
+        rect.update(values)
+    for group, members, cells in snapshot.groups:
+        if group.sprites() == members:
+            continue
+        group.empty()
+        if cells is None:
+            group.add(*members)
+        else:
+            for sprite, sprite_cells in zip(members, cells):
+                group.add_internal(sprite, cells=sprite_cells)
+                sprite.add_internal(group)
+    for floating_score in floating:
+        score.retire(floating_score)
+    if snapshot.scores:
+        rebuild_scores(snapshot)
+
+
+def live_scores(holders):
+    """The scores floating in the level's score holders before a restore.
+    The restore drops them, so they can go back to the pool."""
+    floating = {}
+    for live, copy in holders:
+        if isinstance(live, list):
+            items = live
+        elif isinstance(live, dict):
+            items = live.values()
+        else:
+            items = live.__dict__.values()
+        for item in items:
+            if isinstance(item, score.Score):
+                floating[id(item)] = item
+    return floating.values()
+
+
+def rebuild_scores(snapshot):
+    """Rebuilds the floating scores from their saved state and puts the
+    new ones wherever the snapshot saw the old ones"""
+    fresh = dict((id(old), score.rebuild(saved))
+                 for old, saved in snapshot.scores)
+    for live, copy in snapshot.holders:
+        if isinstance(live, list):
+            live[:] = [fresh.get(id(item), item) for item in copy]
+            continue
+        values = live if isinstance(live, dict) else live.__dict__
+        for name, value in copy.items():
+            if id(value) in fresh:
+                values[name] = fresh[id(value)]
@@ -5,6 +5,7 @@ import pygame as pg
 from .. import setup, tools
 from .. import constants as c
 from .. import game_sound
+from .. import snapshot
 from .. components import mario
 from .. components import collider
 from .. components import bricks
@@ -17,12 +18,39 @@ from .. components import score
 from .. components import castle_flag
 
 
+class LevelTemplate(object):
+    """The parts of the level that never change while it is played: the
+    ground, pipe and step colliders with their grid, and the checkpoint
+    triggers.
+    Built by the first Level1 startup and shared by every startup after
+    it, so its sprites are only ever removed from a level's own groups,
+    never killed."""
+    def __init__(self, level):
+        self.ground_group = level.ground_group
+        self.pipe_group = level.pipe_group
+        self.step_group = level.step_group
+        self.ground_step_pipe_group = level.ground_step_pipe_group
+        self.triggers = level.trigger_list
+
+    def apply(self, level):
+        """Gives level the shared colliders and its own list of the
+        triggers still to fire"""
+        level.ground_group = self.ground_group
+        level.pipe_group = self.pipe_group
+        level.step_group = self.step_group
+        level.ground_step_pipe_group = self.ground_step_pipe_group
+        level.trigger_list = list(self.triggers)
+
+
 class Level1(tools._State):
+    template = None
+
     def __init__(self):
         tools._State.__init__(self)
 
     def startup(self, current_time, persist):
         """Called when the State object is created"""
+        self.profiler.start('startup')
         self.game_info = persist
         self.persist = self.game_info
         self.game_info[c.CURRENT_TIME] = current_time
@@ -36,20 +64,21 @@ class Level1(tools._State):
         self.flag_score_total = 0
 
         self.moving_score_list = []
+        self.activation = collider.ActivationWindow()
+        self.drawn_rects = []
+        self.drawn_viewport = None
         self.overhead_info_display = info.OverheadInfo(self.game_info, c.LEVEL)
         self.sound_manager = game_sound.Sound(self.overhead_info_display)
 
         self.setup_background()
-        self.setup_ground()
-        self.setup_pipes()
-        self.setup_steps()
+        self.setup_template()
         self.setup_bricks()
         self.setup_coin_boxes()
         self.setup_flag_pole()
         self.setup_enemies()
         self.setup_mario()
-        self.setup_checkpoints()
         self.setup_spritegroups()
+        self.profiler.stop('startup')
 
 
     def setup_background(self):
@@ -57,26 +86,37 @@ class Level1(tools._State):
         proportions"""
         self.background = setup.GFX['level_1']
         self.back_rect = self.background.get_rect()
-        self.background = pg.transform.scale(self.background,
+        self.background = setup.FRAMES.get_scaled(self.background,
                                   (int(self.back_rect.width*c.BACKGROUND_MULTIPLER),
                                   int(self.back_rect.height*c.BACKGROUND_MULTIPLER)))
         self.back_rect = self.background.get_rect()
-        width = self.back_rect.width
-        height = self.back_rect.height
-
-        self.level = pg.Surface((width, height)).convert()
-        self.level_rect = self.level.get_rect()
+        self.level_rect = self.back_rect.copy()
         self.viewport = setup.SCREEN.get_rect(bottom=self.level_rect.bottom)
         self.viewport.x = self.game_info[c.CAMERA_START_X]
 
 
+    def setup_template(self):
+        """Takes the static colliders and checkpoints from the shared
+        LevelTemplate, building it first if this is the first startup"""
+        if Level1.template is None:
+            self.setup_ground()
+            self.setup_pipes()
+            self.setup_steps()
+            self.setup_checkpoints()
+            self.ground_step_pipe_group = collider.ColliderGrid(self.ground_group,
+                                                                self.pipe_group,
+                                                                self.step_group)
+            Level1.template = LevelTemplate(self)
+        Level1.template.apply(self)
+
+
     def setup_ground(self):
         """Creates collideable, invisible rectangles over top of the ground for
         sprites to walk on"""
-        ground_rect1 = collider.Collider(0, c.GROUND_HEIGHT,    2953, 60)
-        ground_rect2 = collider.Collider(3048, c.GROUND_HEIGHT,  635, 60)
-        ground_rect3 = collider.Collider(3819, c.GROUND_HEIGHT, 2735, 60)
-        ground_rect4 = collider.Collider(6647, c.GROUND_HEIGHT, 2300, 60)
+        ground_rect1 = collider.RectCollider(0, c.GROUND_HEIGHT,    2953, 60)
+        ground_rect2 = collider.RectCollider(3048, c.GROUND_HEIGHT,  635, 60)
+        ground_rect3 = collider.RectCollider(3819, c.GROUND_HEIGHT, 2735, 60)
+        ground_rect4 = collider.RectCollider(6647, c.GROUND_HEIGHT, 2300, 60)
 
         self.ground_group = pg.sprite.Group(ground_rect1,
                                            ground_rect2,
@@ -87,12 +127,12 @@ class Level1(tools._State):
     def setup_pipes(self):
         """Create collideable rects for all the pipes"""
 
-        pipe1 = collider.Collider(1202, 452, 83, 82)
-        pipe2 = collider.Collider(1631, 409, 83, 140)
-        pipe3 = collider.Collider(1973, 366, 83, 170)
-        pipe4 = collider.Collider(2445, 366, 83, 170)
-        pipe5 = collider.Collider(6989, 452, 83, 82)
-        pipe6 = collider.Collider(7675, 452, 83, 82)
+        pipe1 = collider.RectCollider(1202, 452, 83, 82)
+        pipe2 = collider.RectCollider(1631, 409, 83, 140)
+        pipe3 = collider.RectCollider(1973, 366, 83, 170)
+        pipe4 = collider.RectCollider(2445, 366, 83, 170)
+        pipe5 = collider.RectCollider(6989, 452, 83, 82)
+        pipe6 = collider.RectCollider(7675, 452, 83, 82)
 
         self.pipe_group = pg.sprite.Group(pipe1, pipe2,
                                           pipe3, pipe4,
@@ -101,39 +141,39 @@ class Level1(tools._State):
 
     def setup_steps(self):
         """Create collideable rects for all the steps"""
-        step1 = collider.Collider(5745, 495, 40, 44)
-        step2 = collider.Collider(5788, 452, 40, 44)
-        step3 = collider.Collider(5831, 409, 40, 44)
-        step4 = collider.Collider(5874, 366, 40, 176)
-
-
-        step5 = collider.Collider(6001, 366, 40, 176)
-        step6 = collider.Collider(6044, 408, 40, 40)
-        step7 = collider.Collider(6087, 452, 40, 40)
-        step8 = collider.Collider(6130, 495, 40, 40)
-
-        step9 = collider.Collider(6345, 495, 40, 40)
-        step10 = collider.Collider(6388, 452, 40, 40)
-        step11 = collider.Collider(6431, 409, 40, 40)
-        step12 = collider.Collider(6474, 366, 40, 40)
-        step13 = collider.Collider(6517, 366, 40, 176)
-
-        step14 = collider.Collider(6644, 366, 40, 176)
-        step15 = collider.Collider(6687, 408, 40, 40)
-        step16 = collider.Collider(6728, 452, 40, 40)
-        step17 = collider.Collider(6771, 495, 40, 40)
-
-        step18 = collider.Collider(7760, 495, 40, 40)
-        step19 = collider.Collider(7803, 452, 40, 40)
-        step20 = collider.Collider(7845, 409, 40, 40)
-        step21 = collider.Collider(7888, 366, 40, 40)
-        step22 = collider.Collider(7931, 323, 40, 40)
-        step23 = collider.Collider(7974, 280, 40, 40)
-        step24 = collider.Collider(8017, 237, 40, 40)
-        step25 = collider.Collider(8060, 194, 40, 40)
-        step26 = collider.Collider(8103, 194, 40, 360)
-
-        step27 = collider.Collider(8488, 495, 40, 40)
+        step1 = collider.RectCollider(5745, 495, 40, 44)
+        step2 = collider.RectCollider(5788, 452, 40, 44)
+        step3 = collider.RectCollider(5831, 409, 40, 44)
+        step4 = collider.RectCollider(5874, 366, 40, 176)
+
+
+        step5 = collider.RectCollider(6001, 366, 40, 176)
+        step6 = collider.RectCollider(6044, 408, 40, 40)
+        step7 = collider.RectCollider(6087, 452, 40, 40)
+        step8 = collider.RectCollider(6130, 495, 40, 40)
+
+        step9 = collider.RectCollider(6345, 495, 40, 40)
+        step10 = collider.RectCollider(6388, 452, 40, 40)
+        step11 = collider.RectCollider(6431, 409, 40, 40)
+        step12 = collider.RectCollider(6474, 366, 40, 40)
+        step13 = collider.RectCollider(6517, 366, 40, 176)
+
+        step14 = collider.RectCollider(6644, 366, 40, 176)
+        step15 = collider.RectCollider(6687, 408, 40, 40)
+        step16 = collider.RectCollider(6728, 452, 40, 40)
+        step17 = collider.RectCollider(6771, 495, 40, 40)
+
+        step18 = collider.RectCollider(7760, 495, 40, 40)
+        step19 = collider.RectCollider(7803, 452, 40, 40)
+        step20 = collider.RectCollider(7845, 409, 40, 40)
+        step21 = collider.RectCollider(7888, 366, 40, 40)
+        step22 = collider.RectCollider(7931, 323, 40, 40)
+        step23 = collider.RectCollider(7974, 280, 40, 40)
+        step24 = collider.RectCollider(8017, 237, 40, 40)
+        step25 = collider.RectCollider(8060, 194, 40, 40)
+        step26 = collider.RectCollider(8103, 194, 40, 360)
+
+        step27 = collider.RectCollider(8488, 495, 40, 40)
 
         self.step_group = pg.sprite.Group(step1,  step2,
                                           step3,  step4,
@@ -190,22 +230,23 @@ class Level1(tools._State):
         brick30 = bricks.Brick(7245, 365)
         brick31 = bricks.Brick(7331, 365)
 
-        self.brick_group = pg.sprite.Group(brick1,  brick2,
-                                           brick3,  brick4,
-                                           brick5,  brick6,
-                                           brick7,  brick8,
-                                           brick9,  brick10,
-                                           brick11, brick12,
-                                           brick13, brick14,
-                                           brick15, brick16,
-                                           brick17, brick18,
-                                           brick19, brick20,
-                                           brick21, brick22,
-                                           brick23, brick24,
-                                           brick25, brick26,
-                                           brick27, brick28,
-                                           brick29, brick30,
-                                           brick31)
+        self.brick_group = collider.ColliderGrid(brick1,  brick2,
+                                                 brick3,  brick4,
+                                                 brick5,  brick6,
+                                                 brick7,  brick8,
+                                                 brick9,  brick10,
+                                                 brick11, brick12,
+                                                 brick13, brick14,
+                                                 brick15, brick16,
+                                                 brick17, brick18,
+                                                 brick19, brick20,
+                                                 brick21, brick22,
+                                                 brick23, brick24,
+                                                 brick25, brick26,
+                                                 brick27, brick28,
+                                                 brick29, brick30,
+                                                 brick31,
+                                                 padding=c.COLLIDER_BUMP_PADDING)
 
 
     def setup_coin_boxes(self):
@@ -223,12 +264,13 @@ class Level1(tools._State):
         coin_box11 = coin_box.Coin_box(5531, 193, c.COIN, self.coin_group)
         coin_box12 = coin_box.Coin_box(7288, 365, c.COIN, self.coin_group)
 
-        self.coin_box_group = pg.sprite.Group(coin_box1,  coin_box2,
-                                              coin_box3,  coin_box4,
-                                              coin_box5,  coin_box6,
-                                              coin_box7,  coin_box8,
-                                              coin_box9,  coin_box10,
-                                              coin_box11, coin_box12)
+        self.coin_box_group = collider.ColliderGrid(coin_box1,  coin_box2,
+                                                    coin_box3,  coin_box4,
+                                                    coin_box5,  coin_box6,
+                                                    coin_box7,  coin_box8,
+                                                    coin_box9,  coin_box10,
+                                                    coin_box11, coin_box12,
+                                                    padding=c.COLLIDER_BUMP_PADDING)
 
 
     def setup_flag_pole(self):
@@ -314,27 +356,20 @@ class Level1(tools._State):
 
 
     def setup_checkpoints(self):
-        """Creates invisible checkpoints that when collided will trigger
-        the creation of enemies from the self.enemy_group_list"""
-        check1 = checkpoint.Checkpoint(510, "1")
-        check2 = checkpoint.Checkpoint(1400, '2')
-        check3 = checkpoint.Checkpoint(1740, '3')
-        check4 = checkpoint.Checkpoint(3080, '4')
-        check5 = checkpoint.Checkpoint(3750, '5')
-        check6 = checkpoint.Checkpoint(4150, '6')
-        check7 = checkpoint.Checkpoint(4470, '7')
-        check8 = checkpoint.Checkpoint(4950, '8')
-        check9 = checkpoint.Checkpoint(5100, '9')
-        check10 = checkpoint.Checkpoint(6800, '10')
-        check11 = checkpoint.Checkpoint(8504, '11', 5, 6)
-        check12 = checkpoint.Checkpoint(8775, '12')
-        check13 = checkpoint.Checkpoint(2740, 'secret_mushroom', 360, 40, 12)
-
-        self.check_point_group = pg.sprite.Group(check1, check2, check3,
-                                                 check4, check5, check6,
-                                                 check7, check8, check9,
-                                                 check10, check11, check12,
-                                                 check13)
+        """Creates the invisible triggers that let loose the enemies in
+        self.enemy_group_list, start the slide down the flag pole, end the
+        level at the castle and bring out the secret 1up mushroom box"""
+        enemy_x = [510, 1400, 1740, 3080, 3750, 4150, 4470, 4950, 5100, 6800]
+        enemies = [checkpoint.Trigger(x, checkpoint.ENEMIES, group)
+                   for group, x in enumerate(enemy_x)]
+        flag_pole = checkpoint.Trigger(8504, checkpoint.FLAG_POLE,
+                                       y=5, width=6)
+        castle = checkpoint.Trigger(8775, checkpoint.CASTLE)
+        secret_mushroom = checkpoint.Trigger(2740, checkpoint.SECRET_MUSHROOM,
+                                             y=360, width=40, height=12)
+
+        self.trigger_list = checkpoint.trigger_table(flag_pole, castle,
+                                                     secret_mushroom, *enemies)
 
 
     def setup_spritegroups(self):
@@ -343,23 +378,43 @@ class Level1(tools._State):
         self.shell_group = pg.sprite.Group()
         self.enemy_group = pg.sprite.Group()
 
-        self.ground_step_pipe_group = pg.sprite.Group(self.ground_group,
-                                                      self.pipe_group,
-                                                      self.step_group)
-
         self.mario_and_enemy_group = pg.sprite.Group(self.mario,
                                                      self.enemy_group)
 
 
     def update(self, surface, keys, current_time):
-        """Updates Entire level using states.  Called by the control object"""
+        """Updates Entire level using states.  Called by the control object.
+        Nothing is drawn when surface is None (headless simulation)"""
         self.game_info[c.CURRENT_TIME] = self.current_time = current_time
+        self.profiler.start('sprites')
         self.handle_states(keys)
+        self.profiler.stop('sprites')
         self.check_if_time_out()
-        self.blit_everything(surface)
+        if surface is not None:
+            self.profiler.start('blit')
+            self.blit_everything(surface)
+            self.profiler.stop('blit')
         self.sound_manager.update(self.game_info, self.mario)
 
 
+    def snapshot(self):
+        """Returns a snapshot.Snapshot of the level's simulation state,
+        leaving out the shared LevelTemplate parts"""
+        template = Level1.template
+        return snapshot.take(self, (template.ground_step_pipe_group,
+                                    template.ground_group,
+                                    template.pipe_group,
+                                    template.step_group))
+
+
+    def restore(self, snap):
+        """Puts the level back to the state in snap and has the next
+        blit_everything repaint the whole screen"""
+        snapshot.restore(snap)
+        self.drawn_viewport = None
+        self.overhead_info_display.invalidate_hud()
+
+
 
     def handle_states(self, keys):
         """If the level is in a FROZEN state, only mario will update"""
@@ -378,12 +433,12 @@ class Level1(tools._State):
          or dies). Checks if he leaves the transition state or dies to
          change the level state back"""
         self.mario.update(keys, self.game_info, self.powerup_group)
-        for score in self.moving_score_list:
-            score.update(self.moving_score_list, self.game_info)
+        score.update_scores(self.moving_score_list, self.game_info)
         if self.flag_score:
             self.flag_score.update(None, self.game_info)
             self.check_to_add_flag_score()
-        self.coin_box_group.update(self.game_info)
+        self.activation.move(self.viewport)
+        self.activation.update(self.coin_box_group, self.game_info)
         self.flag_pole_group.update(self.game_info)
         self.check_if_mario_in_transition_state()
         self.check_flag()
@@ -404,8 +459,7 @@ class Level1(tools._State):
     def update_all_sprites(self, keys):
         """Updates the location of all sprites on the screen."""
         self.mario.update(keys, self.game_info, self.powerup_group)
-        for score in self.moving_score_list:
-            score.update(self.moving_score_list, self.game_info)
+        score.update_scores(self.moving_score_list, self.game_info)
         if self.flag_score:
             self.flag_score.update(None, self.game_info)
             self.check_to_add_flag_score()
@@ -414,12 +468,15 @@ class Level1(tools._State):
         self.enemy_group.update(self.game_info)
         self.sprites_about_to_die_group.update(self.game_info, self.viewport)
         self.shell_group.update(self.game_info)
-        self.brick_group.update()
-        self.coin_box_group.update(self.game_info)
+        self.activation.move(self.viewport)
+        self.activation.update(self.brick_group)
+        self.activation.update(self.coin_box_group, self.game_info)
         self.powerup_group.update(self.game_info, self.viewport)
         self.coin_group.update(self.game_info, self.viewport)
         self.brick_pieces_group.update()
+        self.profiler.start('collisions')
         self.adjust_sprite_positions()
+        self.profiler.stop('collisions')
         self.check_if_mario_in_transition_state()
         self.check_for_mario_death()
         self.update_viewport()
@@ -427,29 +484,28 @@ class Level1(tools._State):
 
 
     def check_points_check(self):
-        """Detect if checkpoint collision occurs, delete checkpoint,
-        add enemies to self.enemy_group"""
-        checkpoint = pg.sprite.spritecollideany(self.mario,
-                                                 self.check_point_group)
-        if checkpoint:
-            checkpoint.kill()
-
-            for i in range(1,11):
-                if checkpoint.name == str(i):
-                    for index, enemy in enumerate(self.enemy_group_list[i -1]):
-                        enemy.rect.x = self.viewport.right + (index * 60)
-                    self.enemy_group.add(self.enemy_group_list[i-1])
-
-            if checkpoint.name == '11':
+        """Fires the trigger Mario has run into, if any: adds enemies to
+        self.enemy_group, or starts the flag pole, castle or secret
+        mushroom"""
+        trigger = checkpoint.next_trigger(self.trigger_list, self.mario.rect,
+                                          self.viewport.x)
+        if trigger:
+            if trigger.action == checkpoint.ENEMIES:
+                enemies = self.enemy_group_list[trigger.group]
+                for index, enemy in enumerate(enemies):
+                    enemy.rect.x = self.viewport.right + (index * 60)
+                self.enemy_group.add(enemies)
+
+            elif trigger.action == checkpoint.FLAG_POLE:
                 self.mario.state = c.FLAGPOLE
                 self.mario.invincible = False
-                self.mario.flag_pole_right = checkpoint.rect.right
+                self.mario.flag_pole_right = trigger.rect.right
                 if self.mario.rect.bottom < self.flag.rect.y:
                     self.mario.rect.bottom = self.flag.rect.y
                 self.flag.state = c.SLIDE_DOWN
                 self.create_flag_points()
 
-            elif checkpoint.name == '12':
+            elif trigger.action == checkpoint.CASTLE:
                 self.state = c.IN_CASTLE
                 self.mario.kill()
                 self.mario.state == c.STAND
@@ -457,9 +513,10 @@ class Level1(tools._State):
                 self.overhead_info_display.state = c.FAST_COUNT_DOWN
 
 
-            elif checkpoint.name == 'secret_mushroom' and self.mario.y_vel < 0:
-                mushroom_box = coin_box.Coin_box(checkpoint.rect.x,
-                                        checkpoint.rect.bottom - 40,
+            elif (trigger.action == checkpoint.SECRET_MUSHROOM
+                  and self.mario.y_vel < 0):
+                mushroom_box = coin_box.Coin_box(trigger.rect.x,
+                                        trigger.rect.bottom - 40,
                                         '1up_mushroom',
                                         self.powerup_group)
                 mushroom_box.start_bump(self.moving_score_list)
@@ -480,19 +537,19 @@ class Level1(tools._State):
         mario_bottom = self.mario.rect.bottom
 
         if mario_bottom > (c.GROUND_HEIGHT - 40 - 40):
-            self.flag_score = score.Score(x, y, 100, True)
+            self.flag_score = score.spawn(x, y, 100, True)
             self.flag_score_total = 100
         elif mario_bottom > (c.GROUND_HEIGHT - 40 - 160):
-            self.flag_score = score.Score(x, y, 400, True)
+            self.flag_score = score.spawn(x, y, 400, True)
             self.flag_score_total = 400
         elif mario_bottom > (c.GROUND_HEIGHT - 40 - 240):
-            self.flag_score = score.Score(x, y, 800, True)
+            self.flag_score = score.spawn(x, y, 800, True)
             self.flag_score_total = 800
         elif mario_bottom > (c.GROUND_HEIGHT - 40 - 360):
-            self.flag_score = score.Score(x, y, 2000, True)
+            self.flag_score = score.spawn(x, y, 2000, True)
             self.flag_score_total = 2000
         else:
-            self.flag_score = score.Score(x, y, 5000, True)
+            self.flag_score = score.spawn(x, y, 5000, True)
             self.flag_score_total = 5000
 
 
@@ -519,34 +576,38 @@ class Level1(tools._State):
             self.mario.rect.x = (self.viewport.x + 5)
 
 
-    def check_mario_x_collisions(self):
-        """Check for collisions after Mario is moved on the x axis"""
-        collider = pg.sprite.spritecollideany(self.mario, self.ground_step_pipe_group)
-        coin_box = pg.sprite.spritecollideany(self.mario, self.coin_box_group)
-        brick = pg.sprite.spritecollideany(self.mario, self.brick_group)
-        enemy = pg.sprite.spritecollideany(self.mario, self.enemy_group)
-        shell = pg.sprite.spritecollideany(self.mario, self.shell_group)
-        powerup = pg.sprite.spritecollideany(self.mario, self.powerup_group)
+    def contacts(self, sprite, *kinds):
+        """Lazily yields sprite's contacts with the named sprite groups
+        (e.g. 'brick' for self.brick_group) in priority order"""
+        return collider.contacts(sprite, [(kind, getattr(self, kind + '_group'))
+                                          for kind in kinds])
 
-        if coin_box:
-            self.adjust_mario_for_x_collisions(coin_box)
 
-        elif brick:
-            self.adjust_mario_for_x_collisions(brick)
+    def first_contact(self, sprite, *kinds):
+        """Returns the highest priority contact for sprite, or a contact
+        of kind None if it touches nothing"""
+        return next(self.contacts(sprite, *kinds), collider.Contact(None, None))
 
-        elif collider:
-            self.adjust_mario_for_x_collisions(collider)
 
-        elif enemy:
+    def check_mario_x_collisions(self):
+        """Check for collisions after Mario is moved on the x axis"""
+        kind, hit = self.first_contact(self.mario, 'coin_box', 'brick',
+                                       'ground_step_pipe', 'enemy',
+                                       'shell', 'powerup')
+
+        if kind in ('coin_box', 'brick', 'ground_step_pipe'):
+            self.adjust_mario_for_x_collisions(hit)
+
+        elif kind == 'enemy':
             if self.mario.invincible:
                 setup.SFX['kick'].play()
                 self.game_info[c.SCORE] += 100
                 self.moving_score_list.append(
-                    score.Score(self.mario.rect.right - self.viewport.x,
+                    score.spawn(self.mario.rect.right - self.viewport.x,
                                 self.mario.rect.y, 100))
-                enemy.kill()
-                enemy.start_death_jump(c.RIGHT)
-                self.sprites_about_to_die_group.add(enemy)
+                hit.kill()
+                hit.start_death_jump(c.RIGHT)
+                self.sprites_about_to_die_group.add(hit)
             elif self.mario.big:
                 setup.SFX['pipe'].play()
                 self.mario.fire = False
@@ -559,42 +620,42 @@ class Level1(tools._State):
                 self.mario.start_death_jump(self.game_info)
                 self.state = c.FROZEN
 
-        elif shell:
-            self.adjust_mario_for_x_shell_collisions(shell)
+        elif kind == 'shell':
+            self.adjust_mario_for_x_shell_collisions(hit)
 
-        elif powerup:
-            if powerup.name == c.STAR:
+        elif kind == 'powerup':
+            if hit.name == c.STAR:
                 self.game_info[c.SCORE] += 1000
 
                 self.moving_score_list.append(
-                    score.Score(self.mario.rect.centerx - self.viewport.x,
+                    score.spawn(self.mario.rect.centerx - self.viewport.x,
                                 self.mario.rect.y, 1000))
                 self.mario.invincible = True
                 self.mario.invincible_start_timer = self.current_time
-            elif powerup.name == c.MUSHROOM:
+            elif hit.name == c.MUSHROOM:
                 setup.SFX['powerup'].play()
                 self.game_info[c.SCORE] += 1000
                 self.moving_score_list.append(
-                    score.Score(self.mario.rect.centerx - self.viewport.x,
+                    score.spawn(self.mario.rect.centerx - self.viewport.x,
                                 self.mario.rect.y - 20, 1000))
 
                 self.mario.y_vel = -1
                 self.mario.state = c.SMALL_TO_BIG
                 self.mario.in_transition_state = True
                 self.convert_mushrooms_to_fireflowers()
-            elif powerup.name == c.LIFE_MUSHROOM:
+            elif hit.name == c.LIFE_MUSHROOM:
                 self.moving_score_list.append(
-                    score.Score(powerup.rect.right - self.viewport.x,
-                                powerup.rect.y,
+                    score.spawn(hit.rect.right - self.viewport.x,
+                                hit.rect.y,
                                 c.ONEUP))
 
                 self.game_info[c.LIVES] += 1
                 setup.SFX['one_up'].play()
-            elif powerup.name == c.FIREFLOWER:
+            elif hit.name == c.FIREFLOWER:
                 setup.SFX['powerup'].play()
                 self.game_info[c.SCORE] += 1000
                 self.moving_score_list.append(
-                    score.Score(self.mario.rect.centerx - self.viewport.x,
+                    score.spawn(self.mario.rect.centerx - self.viewport.x,
                                 self.mario.rect.y, 1000))
 
                 if self.mario.big and self.mario.fire == False:
@@ -605,8 +666,8 @@ class Level1(tools._State):
                     self.mario.in_transition_state = True
                     self.convert_mushrooms_to_fireflowers()
 
-            if powerup.name != c.FIREBALL:
-                powerup.kill()
+            if hit.name != c.FIREBALL:
+                hit.kill()
 
 
     def convert_mushrooms_to_fireflowers(self):
@@ -647,7 +708,7 @@ class Level1(tools._State):
             if self.mario.rect.x < shell.rect.x:
                 self.game_info[c.SCORE] += 400
                 self.moving_score_list.append(
-                    score.Score(shell.rect.centerx - self.viewport.x,
+                    score.spawn(shell.rect.centerx - self.viewport.x,
                                 shell.rect.y,
                                 400))
                 self.mario.rect.right = shell.rect.left
@@ -669,7 +730,7 @@ class Level1(tools._State):
             elif self.mario.invincible:
                 self.game_info[c.SCORE] += 200
                 self.moving_score_list.append(
-                    score.Score(shell.rect.right - self.viewport.x,
+                    score.spawn(shell.rect.right - self.viewport.x,
                                 shell.rect.y, 200))
                 shell.kill()
                 self.sprites_about_to_die_group.add(shell)
@@ -682,46 +743,54 @@ class Level1(tools._State):
 
     def check_mario_y_collisions(self):
         """Checks for collisions when Mario moves along the y-axis"""
-        ground_step_or_pipe = pg.sprite.spritecollideany(self.mario, self.ground_step_pipe_group)
-        enemy = pg.sprite.spritecollideany(self.mario, self.enemy_group)
-        shell = pg.sprite.spritecollideany(self.mario, self.shell_group)
-        brick = pg.sprite.spritecollideany(self.mario, self.brick_group)
-        coin_box = pg.sprite.spritecollideany(self.mario, self.coin_box_group)
-        powerup = pg.sprite.spritecollideany(self.mario, self.powerup_group)
+        kind, hit = self.first_contact(self.mario, 'coin_box', 'brick',
+                                       'ground_step_pipe', 'enemy',
+                                       'shell', 'powerup')
 
-        brick, coin_box = self.prevent_collision_conflict(brick, coin_box)
+        if kind == 'coin_box':
+            kind, hit = self.check_for_closer_brick(hit)
 
-        if coin_box:
-            self.adjust_mario_for_y_coin_box_collisions(coin_box)
+        if kind == 'coin_box':
+            self.adjust_mario_for_y_coin_box_collisions(hit)
 
-        elif brick:
-            self.adjust_mario_for_y_brick_collisions(brick)
+        elif kind == 'brick':
+            self.adjust_mario_for_y_brick_collisions(hit)
 
-        elif ground_step_or_pipe:
-            self.adjust_mario_for_y_ground_pipe_collisions(ground_step_or_pipe)
+        elif kind == 'ground_step_pipe':
+            self.adjust_mario_for_y_ground_pipe_collisions(hit)
 
-        elif enemy:
+        elif kind == 'enemy':
             if self.mario.invincible:
                 setup.SFX['kick'].play()
-                enemy.kill()
-                self.sprites_about_to_die_group.add(enemy)
-                enemy.start_death_jump(c.RIGHT)
+                hit.kill()
+                self.sprites_about_to_die_group.add(hit)
+                hit.start_death_jump(c.RIGHT)
             else:
-                self.adjust_mario_for_y_enemy_collisions(enemy)
+                self.adjust_mario_for_y_enemy_collisions(hit)
 
-        elif shell:
-            self.adjust_mario_for_y_shell_collisions(shell)
+        elif kind == 'shell':
+            self.adjust_mario_for_y_shell_collisions(hit)
 
-        elif powerup:
-            if powerup.name == c.STAR:
+        elif kind == 'powerup':
+            if hit.name == c.STAR:
                 setup.SFX['powerup'].play()
-                powerup.kill()
+                hit.kill()
                 self.mario.invincible = True
                 self.mario.invincible_start_timer = self.current_time
 
         self.test_if_mario_is_falling()
 
 
+    def check_for_closer_brick(self, coin_box):
+        """Swaps a coin box contact for a brick Mario also touches if the
+        brick is closer to his centerx"""
+        for kind, brick in self.contacts(self.mario, 'brick'):
+            brick, coin_box = self.prevent_collision_conflict(brick, coin_box)
+            if brick:
+                return collider.Contact(kind, brick)
+        return collider.Contact('coin_box', coin_box)
+
+
     def prevent_collision_conflict(self, obstacle1, obstacle2):
         """Allows collisions only for the item closest to marios centerx"""
         if obstacle1 and obstacle2:
@@ -814,7 +883,7 @@ class Level1(tools._State):
             setup.SFX['kick'].play()
             self.game_info[c.SCORE] += 100
             self.moving_score_list.append(
-                score.Score(enemy.rect.centerx - self.viewport.x,
+                score.spawn(enemy.rect.centerx - self.viewport.x,
                             enemy.rect.y,
                             100))
             enemy.kill()
@@ -847,12 +916,10 @@ class Level1(tools._State):
         """Changes Mario to a FALL state if more than a pixel above a pipe,
         ground, step or box"""
         self.mario.rect.y += 1
-        test_collide_group = pg.sprite.Group(self.ground_step_pipe_group,
-                                                 self.brick_group,
-                                                 self.coin_box_group)
+        kind, _ = self.first_contact(self.mario, 'ground_step_pipe',
+                                     'brick', 'coin_box')
 
-
-        if pg.sprite.spritecollideany(self.mario, test_collide_group) is None:
+        if kind is None:
             if self.mario.state != c.JUMP \
                 and self.mario.state != c.DEATH_JUMP \
                 and self.mario.state != c.SMALL_TO_BIG \
@@ -875,7 +942,7 @@ class Level1(tools._State):
             setup.SFX['stomp'].play()
             self.game_info[c.SCORE] += 100
             self.moving_score_list.append(
-                score.Score(enemy.rect.centerx - self.viewport.x,
+                score.spawn(enemy.rect.centerx - self.viewport.x,
                             enemy.rect.y, 100))
             enemy.state = c.JUMPED_ON
             enemy.kill()
@@ -896,7 +963,7 @@ class Level1(tools._State):
         if self.mario.y_vel > 0:
             self.game_info[c.SCORE] += 400
             self.moving_score_list.append(
-                score.Score(self.mario.rect.centerx - self.viewport.x,
+                score.spawn(self.mario.rect.centerx - self.viewport.x,
                             self.mario.rect.y, 400))
             if shell.state == c.JUMPED_ON:
                 setup.SFX['kick'].play()
@@ -927,33 +994,32 @@ class Level1(tools._State):
         in order to check against all other enemies then adds it back."""
         enemy.kill()
 
-        collider = pg.sprite.spritecollideany(enemy, self.ground_step_pipe_group)
-        enemy_collider = pg.sprite.spritecollideany(enemy, self.enemy_group)
+        kind, hit = self.first_contact(enemy, 'ground_step_pipe', 'enemy')
 
-        if collider:
+        if kind == 'ground_step_pipe':
             if enemy.direction == c.RIGHT:
-                enemy.rect.right = collider.rect.left
+                enemy.rect.right = hit.rect.left
                 enemy.direction = c.LEFT
                 enemy.x_vel = -2
             elif enemy.direction == c.LEFT:
-                enemy.rect.left = collider.rect.right
+                enemy.rect.left = hit.rect.right
                 enemy.direction = c.RIGHT
                 enemy.x_vel = 2
 
 
-        elif enemy_collider:
+        elif kind == 'enemy':
             if enemy.direction == c.RIGHT:
-                enemy.rect.right = enemy_collider.rect.left
+                enemy.rect.right = hit.rect.left
                 enemy.direction = c.LEFT
-                enemy_collider.direction = c.RIGHT
+                hit.direction = c.RIGHT
                 enemy.x_vel = -2
-                enemy_collider.x_vel = 2
+                hit.x_vel = 2
             elif enemy.direction == c.LEFT:
-                enemy.rect.left = enemy_collider.rect.right
+                enemy.rect.left = hit.rect.right
                 enemy.direction = c.RIGHT
-                enemy_collider.direction = c.LEFT
+                hit.direction = c.LEFT
                 enemy.x_vel = 2
-                enemy_collider.x_vel = -2
+                hit.x_vel = -2
 
         self.enemy_group.add(enemy)
         self.mario_and_enemy_group.add(self.enemy_group)
@@ -961,11 +1027,10 @@ class Level1(tools._State):
 
     def check_enemy_y_collisions(self, enemy):
         """Enemy collisions on the y axis"""
-        collider = pg.sprite.spritecollideany(enemy, self.ground_step_pipe_group)
-        brick = pg.sprite.spritecollideany(enemy, self.brick_group)
-        coin_box = pg.sprite.spritecollideany(enemy, self.coin_box_group)
+        kind, collider = self.first_contact(enemy, 'ground_step_pipe',
+                                            'brick', 'coin_box')
 
-        if collider:
+        if kind == 'ground_step_pipe':
             if enemy.rect.bottom > collider.rect.bottom:
                 enemy.y_vel = 7
                 enemy.rect.top = collider.rect.bottom
@@ -976,53 +1041,52 @@ class Level1(tools._State):
                 enemy.rect.bottom = collider.rect.top
                 enemy.state = c.WALK
 
-        elif brick:
-            if brick.state == c.BUMPED:
+        elif kind == 'brick':
+            if collider.state == c.BUMPED:
                 enemy.kill()
                 self.sprites_about_to_die_group.add(enemy)
-                if self.mario.rect.centerx > brick.rect.centerx:
+                if self.mario.rect.centerx > collider.rect.centerx:
                     enemy.start_death_jump('right')
                 else:
                     enemy.start_death_jump('left')
 
-            elif enemy.rect.x > brick.rect.x:
+            elif enemy.rect.x > collider.rect.x:
                 enemy.y_vel = 7
-                enemy.rect.top = brick.rect.bottom
+                enemy.rect.top = collider.rect.bottom
                 enemy.state = c.FALL
             else:
                 enemy.y_vel = 0
-                enemy.rect.bottom = brick.rect.top
+                enemy.rect.bottom = collider.rect.top
                 enemy.state = c.WALK
 
-        elif coin_box:
-            if coin_box.state == c.BUMPED:
+        elif kind == 'coin_box':
+            if collider.state == c.BUMPED:
                 self.game_info[c.SCORE] += 100
                 self.moving_score_list.append(
-                    score.Score(enemy.rect.centerx - self.viewport.x,
+                    score.spawn(enemy.rect.centerx - self.viewport.x,
                                 enemy.rect.y, 100))
                 enemy.kill()
                 self.sprites_about_to_die_group.add(enemy)
-                if self.mario.rect.centerx > coin_box.rect.centerx:
+                if self.mario.rect.centerx > collider.rect.centerx:
                     enemy.start_death_jump('right')
                 else:
                     enemy.start_death_jump('left')
 
-            elif enemy.rect.x > coin_box.rect.x:
+            elif enemy.rect.x > collider.rect.x:
                 enemy.y_vel = 7
-                enemy.rect.top = coin_box.rect.bottom
+                enemy.rect.top = collider.rect.bottom
                 enemy.state = c.FALL
             else:
                 enemy.y_vel = 0
-                enemy.rect.bottom = coin_box.rect.top
+                enemy.rect.bottom = collider.rect.top
                 enemy.state = c.WALK
 
 
         else:
             enemy.rect.y += 1
-            test_group = pg.sprite.Group(self.ground_step_pipe_group,
-                                         self.coin_box_group,
-                                         self.brick_group)
-            if pg.sprite.spritecollideany(enemy, test_group) is None:
+            kind, _ = self.first_contact(enemy, 'ground_step_pipe',
+                                         'coin_box', 'brick')
+            if kind is None:
                 if enemy.state != c.JUMP:
                     enemy.state = c.FALL
 
@@ -1042,9 +1106,11 @@ class Level1(tools._State):
 
 
     def check_shell_x_collisions(self, shell):
-        """Shell collisions along the x axis"""
-        collider = pg.sprite.spritecollideany(shell, self.ground_step_pipe_group)
-        enemy = pg.sprite.spritecollideany(shell, self.enemy_group)
+        """Shell collisions along the x axis.  Both contacts are found
+        before the shell is pushed out of a collider, so an enemy it
+        overlapped is still kicked"""
+        collider = self.first_contact(shell, 'ground_step_pipe').sprite
+        enemy = self.first_contact(shell, 'enemy').sprite
 
         if collider:
             setup.SFX['bump'].play()
@@ -1059,7 +1125,7 @@ class Level1(tools._State):
             setup.SFX['kick'].play()
             self.game_info[c.SCORE] += 100
             self.moving_score_list.append(
-                score.Score(enemy.rect.right - self.viewport.x,
+                score.spawn(enemy.rect.right - self.viewport.x,
                             enemy.rect.y, 100))
             enemy.kill()
             self.sprites_about_to_die_group.add(enemy)
@@ -1068,7 +1134,7 @@ class Level1(tools._State):
 
     def check_shell_y_collisions(self, shell):
         """Shell collisions along the y axis"""
-        collider = pg.sprite.spritecollideany(shell, self.ground_step_pipe_group)
+        collider = self.first_contact(shell, 'ground_step_pipe').sprite
 
         if collider:
             shell.y_vel = 0
@@ -1077,7 +1143,7 @@ class Level1(tools._State):
 
         else:
             shell.rect.y += 1
-            if pg.sprite.spritecollideany(shell, self.ground_step_pipe_group) is None:
+            if self.first_contact(shell, 'ground_step_pipe').kind is None:
                 shell.state = c.FALL
             shell.rect.y -= 1
 
@@ -1108,32 +1174,20 @@ class Level1(tools._State):
 
     def check_mushroom_x_collisions(self, mushroom):
         """Mushroom collisions along the x axis"""
-        collider = pg.sprite.spritecollideany(mushroom, self.ground_step_pipe_group)
-        brick = pg.sprite.spritecollideany(mushroom, self.brick_group)
-        coin_box = pg.sprite.spritecollideany(mushroom, self.coin_box_group)
+        collider = self.first_contact(mushroom, 'ground_step_pipe',
+                                      'brick', 'coin_box').sprite
 
         if collider:
             self.adjust_mushroom_for_collision_x(mushroom, collider)
 
-        elif brick:
-            self.adjust_mushroom_for_collision_x(mushroom, brick)
-
-        elif coin_box:
-            self.adjust_mushroom_for_collision_x(mushroom, coin_box)
-
 
     def check_mushroom_y_collisions(self, mushroom):
         """Mushroom collisions along the y axis"""
-        collider = pg.sprite.spritecollideany(mushroom, self.ground_step_pipe_group)
-        brick = pg.sprite.spritecollideany(mushroom, self.brick_group)
-        coin_box = pg.sprite.spritecollideany(mushroom, self.coin_box_group)
+        collider = self.first_contact(mushroom, 'ground_step_pipe',
+                                      'brick', 'coin_box').sprite
 
         if collider:
             self.adjust_mushroom_for_collision_y(mushroom, collider)
-        elif brick:
-            self.adjust_mushroom_for_collision_y(mushroom, brick)
-        elif coin_box:
-            self.adjust_mushroom_for_collision_y(mushroom, coin_box)
         else:
             self.check_if_falling(mushroom, self.ground_step_pipe_group)
             self.check_if_falling(mushroom, self.brick_group)
@@ -1170,16 +1224,11 @@ class Level1(tools._State):
 
     def check_star_y_collisions(self, star):
         """Invincible star collisions along y axis"""
-        collider = pg.sprite.spritecollideany(star, self.ground_step_pipe_group)
-        brick = pg.sprite.spritecollideany(star, self.brick_group)
-        coin_box = pg.sprite.spritecollideany(star, self.coin_box_group)
+        collider = self.first_contact(star, 'ground_step_pipe',
+                                      'brick', 'coin_box').sprite
 
         if collider:
             self.adjust_star_for_collision_y(star, collider)
-        elif brick:
-            self.adjust_star_for_collision_y(star, brick)
-        elif coin_box:
-            self.adjust_star_for_collision_y(star, coin_box)
 
 
     def adjust_star_for_collision_y(self, star, collider):
@@ -1223,13 +1272,8 @@ class Level1(tools._State):
 
     def check_fireball_x_collisions(self, fireball):
         """Fireball collisions along x axis"""
-        collide_group = pg.sprite.Group(self.ground_group,
-                                        self.pipe_group,
-                                        self.step_group,
-                                        self.coin_box_group,
-                                        self.brick_group)
-
-        collider = pg.sprite.spritecollideany(fireball, collide_group)
+        collider = self.first_contact(fireball, 'ground_step_pipe',
+                                      'coin_box', 'brick').sprite
 
         if collider:
             fireball.kill()
@@ -1240,25 +1284,16 @@ class Level1(tools._State):
 
     def check_fireball_y_collisions(self, fireball):
         """Fireball collisions along y axis"""
-        collide_group = pg.sprite.Group(self.ground_group,
-                                        self.pipe_group,
-                                        self.step_group,
-                                        self.coin_box_group,
-                                        self.brick_group)
-
-        collider = pg.sprite.spritecollideany(fireball, collide_group)
-        enemy = pg.sprite.spritecollideany(fireball, self.enemy_group)
-        shell = pg.sprite.spritecollideany(fireball, self.shell_group)
-
-        if collider and (fireball in self.powerup_group):
-            fireball.rect.bottom = collider.rect.y
-            self.bounce_fireball(fireball)
-
-        elif enemy:
-            self.fireball_kill(fireball, enemy)
-
-        elif shell:
-            self.fireball_kill(fireball, shell)
+        for kind, hit in self.contacts(fireball, 'ground_step_pipe',
+                                       'coin_box', 'brick',
+                                       'enemy', 'shell'):
+            if kind in ('enemy', 'shell'):
+                self.fireball_kill(fireball, hit)
+                break
+            elif fireball in self.powerup_group:
+                fireball.rect.bottom = hit.rect.y
+                self.bounce_fireball(fireball)
+                break
 
 
     def fireball_kill(self, fireball, enemy):
@@ -1266,7 +1301,7 @@ class Level1(tools._State):
         setup.SFX['kick'].play()
         self.game_info[c.SCORE] += 100
         self.moving_score_list.append(
-            score.Score(enemy.rect.centerx - self.viewport.x,
+            score.spawn(enemy.rect.centerx - self.viewport.x,
                         enemy.rect.y,100))
         fireball.kill()
         enemy.kill()
@@ -1279,7 +1314,7 @@ class Level1(tools._State):
         """Checks if sprite should enter a falling state"""
         sprite.rect.y += 1
 
-        if pg.sprite.spritecollideany(sprite, sprite_group) is None:
+        if pg.sprite.spritecollideany(sprite, sprite_group.nearby(sprite)) is None:
             if sprite.state != c.JUMP:
                 sprite.state = c.FALL
 
@@ -1380,8 +1415,7 @@ class Level1(tools._State):
 
     def update_while_in_castle(self):
         """Updates while Mario is in castle at the end of the level"""
-        for score in self.moving_score_list:
-            score.update(self.moving_score_list, self.game_info)
+        score.update_scores(self.moving_score_list, self.game_info)
         self.overhead_info_display.update(self.game_info)
 
         if self.overhead_info_display.state == c.END_OF_LEVEL:
@@ -1391,8 +1425,7 @@ class Level1(tools._State):
 
     def update_flag_and_fireworks(self):
         """Updates the level for the fireworks and castle flag"""
-        for score in self.moving_score_list:
-            score.update(self.moving_score_list, self.game_info)
+        score.update_scores(self.moving_score_list, self.game_info)
         self.overhead_info_display.update(self.game_info)
         self.flag_pole_group.update()
 
@@ -1411,24 +1444,60 @@ class Level1(tools._State):
 
 
     def blit_everything(self, surface):
-        """Blit all sprites to the main surface"""
-        self.level.blit(self.background, self.viewport, self.viewport)
+        """Blit all sprites to the main surface, offset by the viewport.
+        Sprites outside the viewport are skipped.  When dirty rects are
+        tracked and the camera hasn't moved, only the areas drawn over
+        last frame are restored from the background and reported."""
+        info = self.overhead_info_display
+        repaint = self.dirty_rects is None or self.dirty_rects.stale \
+            or self.drawn_viewport != self.viewport.topleft
+        if repaint:
+            surface.blit(self.background, (0,0), self.viewport)
+        else:
+            changed = self.drawn_rects
+            info_rect = info.changed_rect()
+            if info_rect:
+                changed.append(info_rect)
+            for rect in changed:
+                surface.blit(self.background, rect,
+                             rect.move(self.viewport.topleft))
+
+        drawn = self.drawn_rects = []
         if self.flag_score:
-            self.flag_score.draw(self.level)
-        self.powerup_group.draw(self.level)
-        self.coin_group.draw(self.level)
-        self.brick_group.draw(self.level)
-        self.coin_box_group.draw(self.level)
-        self.sprites_about_to_die_group.draw(self.level)
-        self.shell_group.draw(self.level)
-        #self.check_point_group.draw(self.level)
-        self.brick_pieces_group.draw(self.level)
-        self.flag_pole_group.draw(self.level)
-        self.mario_and_enemy_group.draw(self.level)
-
-        surface.blit(self.level, (0,0), self.viewport)
-        self.overhead_info_display.draw(surface)
+            drawn.append(self.flag_score.draw(surface, self.viewport.x))
+        self.draw_visible(surface, self.powerup_group, drawn)
+        self.draw_visible(surface, self.coin_group, drawn)
+        self.draw_visible(surface, self.brick_group, drawn)
+        self.draw_visible(surface, self.coin_box_group, drawn)
+        self.draw_visible(surface, self.sprites_about_to_die_group, drawn)
+        self.draw_visible(surface, self.shell_group, drawn)
+        self.draw_visible(surface, self.brick_pieces_group, drawn)
+        self.draw_visible(surface, self.flag_pole_group, drawn)
+        self.draw_visible(surface, self.mario_and_enemy_group, drawn)
+
+        info.draw(surface)
         for score in self.moving_score_list:
-            score.draw(surface)
-
-
+            drawn.append(score.draw(surface))
+
+        self.drawn_viewport = self.viewport.topleft
+        if not repaint:
+            self.dirty_rects.add_all(changed)
+            self.dirty_rects.add_all(drawn)
+
+
+    def draw_visible(self, surface, group, drawn=None):
+        """Blits the sprites in group that overlap the viewport onto
+        surface at their on-screen position, adding the rects blitted
+        to drawn.  Mario is left out while he flickers after being hurt"""
+        viewport = self.viewport
+        colliderect = viewport.colliderect
+        hidden = None if self.mario.visible else self.mario
+        if isinstance(group, collider.ColliderGrid):
+            group = group.within(viewport)
+        for sprite in group:
+            rect = sprite.rect
+            if colliderect(rect) and sprite is not hidden:
+                blitted = surface.blit(sprite.image, (rect.x - viewport.x,
+                                                      rect.y - viewport.y))
+                if drawn is not None:
+                    drawn.append(blitted)
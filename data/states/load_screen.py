@@ -20,6 +20,7 @@ class LoadScreen(tools._State):
 
         self.overhead_info = info.OverheadInfo(self.game_info, info_state)
         self.sound_manager = game_sound.Sound(self.overhead_info)
+        self.info_drawn = False
 
 
     def set_next_state(self):
@@ -34,19 +35,31 @@ class LoadScreen(tools._State):
     def update(self, surface, keys, current_time):
         """Updates the loading screen"""
         if (current_time - self.start_time) < 2400:
-            surface.fill(c.BLACK)
             self.overhead_info.update(self.game_info)
-            self.overhead_info.draw(surface)
+            if surface is not None:
+                self.draw_info(surface)
 
         elif (current_time - self.start_time) < 2600:
-            surface.fill(c.BLACK)
+            if surface is not None:
+                surface.fill(c.BLACK)
 
         elif (current_time - self.start_time) < 2635:
-            surface.fill((106, 150, 252))
+            if surface is not None:
+                surface.fill((106, 150, 252))
 
         else:
             self.done = True
 
+    def draw_info(self, surface):
+        """Draws the overhead info on black.  After the first frame only
+        a changed overhead info is reported to the dirty rect tracker"""
+        info_rect = self.overhead_info.changed_rect()
+        surface.fill(c.BLACK)
+        self.overhead_info.draw(surface)
+        if self.dirty_rects is not None and self.info_drawn:
+            self.dirty_rects.add_all([info_rect] if info_rect else [])
+        self.info_drawn = True
+
 
 
 
@@ -69,13 +82,15 @@ class GameOver(LoadScreen):
         self.sound_manager.update(self.persist, None)
 
         if (self.current_time - self.start_time) < 7000:
-            surface.fill(c.BLACK)
             self.overhead_info.update(self.game_info)
-            self.overhead_info.draw(surface)
+            if surface is not None:
+                self.draw_info(surface)
         elif (self.current_time - self.start_time) < 7200:
-            surface.fill(c.BLACK)
+            if surface is not None:
+                surface.fill(c.BLACK)
         elif (self.current_time - self.start_time) < 7235:
-            surface.fill((106, 150, 252))
+            if surface is not None:
+                surface.fill((106, 150, 252))
         else:
             self.done = True
 
@@ -100,9 +115,9 @@ class TimeOut(LoadScreen):
         self.current_time = current_time
 
         if (self.current_time - self.start_time) < 2400:
-            surface.fill(c.BLACK)
             self.overhead_info.update(self.game_info)
-            self.overhead_info.draw(surface)
+            if surface is not None:
+                self.draw_info(surface)
         else:
             self.done = True
 
@@ -27,6 +27,7 @@ class Menu(tools._State):
         self.persist = persist
         self.game_info = persist
         self.overhead_info = info.OverheadInfo(self.game_info, c.MAIN_MENU)
+        self.drawn_cursor_rect = None
 
         self.sprite_sheet = setup.GFX['title_screen']
         self.setup_background()
@@ -54,7 +55,7 @@ class Menu(tools._State):
         """Setup the background image to blit"""
         self.background = setup.GFX['level_1']
         self.background_rect = self.background.get_rect()
-        self.background = pg.transform.scale(self.background,
+        self.background = setup.FRAMES.get_scaled(self.background,
                                    (int(self.background_rect.width*c.BACKGROUND_MULTIPLER),
                                     int(self.background_rect.height*c.BACKGROUND_MULTIPLER)))
         self.viewport = setup.SCREEN.get_rect(bottom=setup.SCREEN_RECT.bottom)
@@ -67,20 +68,12 @@ class Menu(tools._State):
 
     def get_image(self, x, y, width, height, dest, sprite_sheet):
         """Returns images and rects to blit onto the screen"""
-        image = pg.Surface([width, height])
-        rect = image.get_rect()
-
-        image.blit(sprite_sheet, (0, 0), (x, y, width, height))
         if sprite_sheet == setup.GFX['title_screen']:
-            image.set_colorkey((255, 0, 220))
-            image = pg.transform.scale(image,
-                                   (int(rect.width*c.SIZE_MULTIPLIER),
-                                    int(rect.height*c.SIZE_MULTIPLIER)))
+            image = setup.FRAMES.get_image(sprite_sheet, x, y, width, height,
+                                           c.SIZE_MULTIPLIER, (255, 0, 220))
         else:
-            image.set_colorkey(c.BLACK)
-            image = pg.transform.scale(image,
-                                   (int(rect.width*3),
-                                    int(rect.height*3)))
+            image = setup.FRAMES.get_image(sprite_sheet, x, y, width, height,
+                                           3, c.BLACK)
 
         rect = image.get_rect()
         rect.x = dest[0]
@@ -95,12 +88,25 @@ class Menu(tools._State):
         self.update_cursor(keys)
         self.overhead_info.update(self.game_info)
 
-        surface.blit(self.background, self.viewport, self.viewport)
-        surface.blit(self.image_dict['GAME_NAME_BOX'][0],
-                     self.image_dict['GAME_NAME_BOX'][1])
-        surface.blit(self.mario.image, self.mario.rect)
-        surface.blit(self.cursor.image, self.cursor.rect)
-        self.overhead_info.draw(surface)
+        if surface is not None:
+            info_rect = self.overhead_info.changed_rect()
+            surface.blit(self.background, self.viewport, self.viewport)
+            surface.blit(self.image_dict['GAME_NAME_BOX'][0],
+                         self.image_dict['GAME_NAME_BOX'][1])
+            surface.blit(self.mario.image, self.mario.rect)
+            surface.blit(self.cursor.image, self.cursor.rect)
+            self.overhead_info.draw(surface)
+            self.report_dirty_rects(info_rect)
+
+
+    def report_dirty_rects(self, info_rect):
+        """After the first frame, only the cursor and a changed overhead
+        info need to reach the display"""
+        if self.dirty_rects is not None and self.drawn_cursor_rect:
+            self.dirty_rects.add_all([self.drawn_cursor_rect, self.cursor.rect])
+            if info_rect:
+                self.dirty_rects.add_all([info_rect])
+        self.drawn_cursor_rect = self.cursor.rect.copy()
 
 
     def update_cursor(self, keys):
@@ -0,0 +1,195 @@
+"""
+Encodes the part of the level around Mario as a small grid of tile codes
+(empty, solid, brick, coin box, enemy, shell, powerup, Mario), read
+straight from Level1's sprite groups and colliders with nothing drawn.
+A 16x15 grid is 240 bytes against 1.4 MB for a frame of pixels.
+
+    python -m SuperMarioLevel1.data.tile_grid
+
+times it against rendering the frame and downsampling its pixels.
+"""
+
+import os
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+os.environ.setdefault('MARIO_HEADLESS', '1')
+
+import math
+import timeit
+import weakref
+import numpy as np
+import pygame as pg
+from . import constants as c
+
+EMPTY = 0
+SOLID = 1
+BRICK = 2
+COIN_BOX = 3
+ENEMY = 4
+SHELL = 5
+POWERUP = 6
+MARIO = 7
+NAMES = ('empty', 'solid', 'brick', 'coin box', 'enemy', 'shell',
+         'powerup', 'Mario')
+
+# one tile of the level background, and where the rows start so that the
+# top of the ground is a row boundary
+CELL = 16 * c.BACKGROUND_MULTIPLER
+ORIGIN_Y = c.GROUND_HEIGHT % CELL
+
+
+def solid_cells(collider_group, width):
+    """A (rows, columns) array over the whole level width with SOLID in
+    every cell whose center is inside one of the colliders"""
+    rows = int(math.ceil((c.SCREEN_HEIGHT - ORIGIN_Y) / CELL))
+    cells = np.zeros((rows, int(math.ceil(width / CELL))), np.uint8)
+    for sprite in collider_group:
+        rect = sprite.rect
+        top = max(int(math.ceil((rect.top - ORIGIN_Y) / CELL - 0.5)), 0)
+        bottom = int(math.ceil((rect.bottom - ORIGIN_Y) / CELL - 0.5))
+        left = int(math.ceil(rect.left / CELL - 0.5))
+        right = int(math.ceil(rect.right / CELL - 0.5))
+        cells[top:bottom, left:right] = SOLID
+    return cells
+
+
+class TileGridEncoder(object):
+    """Writes a rows x columns grid of tile codes, columns wide around
+    Mario and starting at the top of the screen.  The ground, pipes and
+    steps are rasterized once per LevelTemplate and sliced out; the
+    moving sprites are then marked in one np.maximum.at, so where two
+    overlap the higher code wins.  A sprite marks the cells under its
+    middle and under points half a tile in from each edge, which covers
+    anything up to three tiles across."""
+    static = weakref.WeakKeyDictionary()
+
+    def __init__(self, columns=16, rows=15):
+        self.columns = columns
+        self.rows = rows
+        self.shape = (rows, columns)
+
+    def solid_cells(self, level):
+        group = level.ground_step_pipe_group
+        cells = self.static.get(group)
+        if cells is None:
+            cells = self.static[group] = solid_cells(group, level.level_rect.width)
+        return cells
+
+    def sprites(self, level, window):
+        """The (x, y, width, height) of each moving sprite that overlaps
+        window, and its code"""
+        rects = []
+        codes = []
+        for brick in level.brick_group.within(window):
+            rects.append(brick.rect)
+            codes.append(BRICK)
+        for box in level.coin_box_group.within(window):
+            rects.append(box.rect)
+            codes.append(SOLID if box.state == c.OPENED else COIN_BOX)
+        for group, code in ((level.enemy_group, ENEMY),
+                            (level.shell_group, SHELL),
+                            (level.powerup_group, POWERUP)):
+            for sprite in group:
+                if sprite.rect.colliderect(window):
+                    rects.append(sprite.rect)
+                    codes.append(code)
+        rects.append(level.mario.rect)
+        codes.append(MARIO)
+        return rects, codes
+
+    def encode(self, level, out):
+        """Writes the grid around level's Mario into out, a (rows,
+        columns) integer array, and returns the first column's level x"""
+        static = self.solid_cells(level)
+        start = int(level.mario.rect.centerx / CELL) - self.columns // 2
+        start = min(max(start, 0), static.shape[1] - self.columns)
+        rows = min(self.rows, static.shape[0])
+        out[...] = EMPTY
+        out[:rows] = static[:rows, start:start + self.columns]
+
+        left = start * CELL
+        window = pg.Rect(int(left), 0, int(self.columns * CELL) + 1,
+                         c.SCREEN_HEIGHT)
+        rects, codes = self.sprites(level, window)
+        rects = np.array(rects, np.float32)
+        x, y, width, height = rects.T
+        inset_x = np.minimum(width, CELL) / 2
+        inset_y = np.minimum(height, CELL) / 2
+        xs = np.stack([x + inset_x, x + width / 2, x + width - inset_x], 1)
+        ys = np.stack([y + inset_y, y + height / 2, y + height - inset_y], 1)
+        columns = np.floor((xs - left) / CELL).astype(np.intp)[:, None, :]
+        rows = np.floor((ys - ORIGIN_Y) / CELL).astype(np.intp)[:, :, None]
+        columns, rows = np.broadcast_arrays(columns, rows)
+        codes = np.broadcast_to(np.array(codes, out.dtype)[:, None, None], rows.shape)
+        inside = ((columns >= 0) & (columns < self.columns)
+                  & (rows >= 0) & (rows < self.rows))
+        np.maximum.at(out, (rows[inside], columns[inside]), codes[inside])
+        return left
+
+
+class TileGridObservation(object):
+    """BatchEnv observation of the TileGridEncoder grid around each
+    copy's Mario.  Nothing needs rendering."""
+    render = False
+    dtype = np.uint8
+
+    def __init__(self, columns=16, rows=15):
+        self.encoder = TileGridEncoder(columns, rows)
+        self.shape = self.encoder.shape
+
+    def reset(self, index):
+        """Called when copy index starts over"""
+
+    def fill(self, simulators, out):
+        encode = self.encoder.encode
+        for index, simulator in enumerate(simulators):
+            encode(simulator.level, out[index])
+
+
+def main():
+    import argparse
+    from . import headless
+    from . import pixels
+    from . import tools
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--number', type=int, default=500)
+    parser.add_argument('--frames', type=int, default=180,
+                        help='frames to run right before timing')
+    args = parser.parse_args()
+
+    # the comparison renders frames, so open a (dummy) display for the
+    # images to be converted to as they load, as in the game
+    pg.display.set_mode(c.SCREEN_SIZE)
+    simulator = headless.Simulator(render=True)
+    keys = tools.KEY_BITS
+    run = keys[tools.keybinding['right']] | keys[tools.keybinding['action']]
+    for frame in range(args.frames):
+        simulator.step(run | keys[tools.keybinding['jump']] if frame // 30 % 2 else run)
+    level = simulator.level
+    encoder = TileGridEncoder()
+    grid = np.zeros(encoder.shape, np.uint8)
+    encoder.encode(level, grid)
+    for row in grid:
+        print(''.join(' #BQeSPM'[code] for code in row))
+
+    def render(processor, out):
+        level.drawn_viewport = None
+        level.blit_everything(simulator.surface)
+        processor.process(simulator.surface, out)
+
+    grid_seconds = min(timeit.repeat(lambda: encoder.encode(level, grid),
+                                     number=args.number, repeat=3)) / args.number
+    print('tile grid {}x{}: {:7.1f} us, {} bytes'.format(
+        encoder.columns, encoder.rows, grid_seconds * 1e6, grid.nbytes))
+    for scale, grayscale in ((1, False), (4, True)):
+        processor = pixels.FrameProcessor(scale, grayscale)
+        out = np.empty(processor.shape, np.uint8)
+        seconds = min(timeit.repeat(lambda: render(processor, out),
+                                    number=args.number // 5, repeat=3)) / (args.number // 5)
+        print('rendered frame, scale {} {:<4}: {:7.1f} us, {} bytes ({:.0f}x the grid '
+              'time)'.format(scale, 'gray' if grayscale else 'rgb', seconds * 1e6,
+                             out.nbytes, seconds / grid_seconds))
+
+
+if __name__ == '__main__':
+    main()
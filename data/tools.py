@@ -1,6 +1,9 @@
 __author__ = 'justinarmstrong'
 
 import os
+import time
+from collections import deque
+from collections.abc import MutableMapping
 import pygame as pg
 
 keybinding = {
@@ -11,14 +14,184 @@ keybinding = {
     'down':pg.K_DOWN
 }
 
+KEY_ORDER = ('action', 'jump', 'left', 'right', 'down')
+MENU_KEYS = (pg.K_RETURN, pg.K_UP)
+KEY_BITS = dict((keybinding[name], 1 << i) for i, name in enumerate(KEY_ORDER))
+KEY_BITS.update((key, 1 << (len(KEY_ORDER) + i)) for i, key in enumerate(MENU_KEYS))
+
+
+class KeyMask(object):
+    """Stands in for pg.key.get_pressed() when input comes from a bitmask
+    instead of the keyboard.  Bit i is set while keybinding[KEY_ORDER[i]]
+    is held down, and the bits after those are the MENU_KEYS the main
+    menu also reads."""
+    def __init__(self, mask=0):
+        self.mask = mask
+
+    def __getitem__(self, key):
+        return bool(self.mask & KEY_BITS.get(key, 0))
+
+
+def mask_from_keys(keys):
+    """Packs the keys in KEY_BITS into a bitmask"""
+    mask = 0
+    for key, bit in KEY_BITS.items():
+        if keys[key]:
+            mask |= bit
+    return mask
+
+class RealTimeClock(object):
+    """Game time read straight from the wall clock"""
+    def get_ticks(self):
+        return pg.time.get_ticks()
+
+
+class FixedStepClock(object):
+    """Game time that only moves in exact steps of 1000/fps milliseconds,
+    so a run gives the same result however loaded the machine is.
+    Real elapsed time is fed into an accumulator which says how many
+    steps the simulation owes."""
+    def __init__(self, fps=60, max_steps=5):
+        self.step_ms = 1000.0 / fps
+        self.max_steps = max_steps
+        self.frame = 0
+        self.accumulator = 0.0
+
+    def get_ticks(self):
+        return self.frame * self.step_ms
+
+    def tick(self):
+        """Advances game time by exactly one step"""
+        self.frame += 1
+        return self.get_ticks()
+
+    def add_time(self, elapsed_ms):
+        """Adds real elapsed time and returns how many steps to simulate.
+        Capped at max_steps so a long stall doesn't snowball"""
+        self.accumulator += elapsed_ms
+        steps = int(self.accumulator / self.step_ms + 1e-9)
+        if steps > self.max_steps:
+            steps = self.max_steps
+            self.accumulator = 0.0
+        else:
+            self.accumulator -= steps * self.step_ms
+        return steps
+
+
+class DirtyRects(object):
+    """Screen areas that changed during a frame, for pg.display.update.
+    A frame is a full repaint unless a state reported its changes with
+    add_all, and the number of pixels pushed is kept for reporting."""
+    def __init__(self, size):
+        self.screen_rect = pg.Rect((0, 0), size)
+        self.rects = []
+        self.full = True
+        self.stale = False
+        self.pixels = 0
+        self.frames = 0
+        self.total_pixels = 0
+
+    def invalidate(self):
+        """Asks for a full repaint next frame, for when something drawn
+        over the state (like the profiler overlay) goes away"""
+        self.stale = True
+
+    def start_frame(self):
+        self.rects = []
+        self.full = True
+
+    def add_all(self, rects):
+        """Reports the areas changed this frame, marking it as partial"""
+        self.full = False
+        self.rects.extend(rects)
+
+    def finish_frame(self):
+        """Returns the rects to update, or None for the whole screen"""
+        if self.full or self.stale:
+            rects = None
+            self.stale = False
+            self.pixels = self.screen_rect.w * self.screen_rect.h
+        else:
+            rects = [rect.clip(self.screen_rect) for rect in self.rects]
+            self.pixels = sum(rect.w * rect.h for rect in rects)
+        self.frames += 1
+        self.total_pixels += self.pixels
+        return rects
+
+    def average_pixels(self):
+        if not self.frames:
+            return 0.0
+        return self.total_pixels / float(self.frames)
+
+
+class FrameProfiler(object):
+    """Times the phases of every frame and keeps the last window frames
+    of each phase for rolling percentiles.  A phase timed more than once
+    in a frame is summed, and phases may nest (collisions is timed
+    inside sprites, which is inside update)."""
+    PERCENTILES = (50, 95, 99)
+
+    def __init__(self, window=300, enabled=True):
+        self.window = window
+        self.enabled = enabled
+        self.phases = []
+        self.samples = {}
+        self.frame_times = {}
+        self.started = {}
+        self.frames = 0
+
+    def start(self, phase):
+        if self.enabled:
+            self.started[phase] = time.perf_counter()
+
+    def stop(self, phase):
+        if self.enabled:
+            elapsed = (time.perf_counter() - self.started.pop(phase)) * 1000.0
+            self.frame_times[phase] = self.frame_times.get(phase, 0.0) + elapsed
+
+    def end_frame(self):
+        """Adds this frame's phase times to the rolling windows"""
+        if not self.enabled:
+            return
+        for phase, ms in self.frame_times.items():
+            if phase not in self.samples:
+                self.samples[phase] = deque(maxlen=self.window)
+                self.phases.append(phase)
+            self.samples[phase].append(ms)
+        self.frame_times = {}
+        self.frames += 1
+
+    def percentiles(self, phase):
+        """Nearest-rank p50/p95/p99 of phase, in milliseconds"""
+        samples = sorted(self.samples[phase])
+        last = len(samples) - 1
+        return [samples[int(round(last * p / 100.0))] for p in self.PERCENTILES]
+
+    def report(self):
+        """One line of percentiles per phase, in the order first timed"""
+        lines = ['{:<10}{:>7}{:>7}{:>7}'.format('ms', 'p50', 'p95', 'p99')]
+        for phase in self.phases:
+            lines.append('{:<10}{:7.2f}{:7.2f}{:7.2f}'.format(
+                phase, *self.percentiles(phase)))
+        return lines
+
+    def dump(self, path):
+        with open(path, 'w') as profile_file:
+            profile_file.write('{} frames, percentiles over the last {}\n'.format(
+                self.frames, self.window))
+            profile_file.write('\n'.join(self.report()) + '\n')
+
+
 class Control(object):
     """Control class for entire project. Contains the game loop, and contains
     the event_loop which passes events to States as needed. Logic for flipping
     states is also found here."""
-    def __init__(self, caption):
+    def __init__(self, caption, game_clock=None, dirty_rects=False,
+                 profile_path=None, profile_font=None, replay=None):
         self.screen = pg.display.get_surface()
         self.done = False
         self.clock = pg.time.Clock()
+        self.game_clock = game_clock or RealTimeClock()
         self.caption = caption
         self.fps = 60
         self.show_fps = False
@@ -27,19 +200,42 @@ class Control(object):
         self.state_dict = {}
         self.state_name = None
         self.state = None
+        self.dirty_rects = None
+        if dirty_rects:
+            self.dirty_rects = DirtyRects(self.screen.get_size())
+        self.profiler = FrameProfiler()
+        self.profile_path = profile_path
+        self.profile_font = profile_font
+        self.show_profile = False
+        self.profile_image = None
+        self.replay = replay
 
     def setup_states(self, state_dict, start_state):
         self.state_dict = state_dict
+        for state in state_dict.values():
+            if isinstance(state, _State):
+                state.dirty_rects = self.dirty_rects
+                state.profiler = self.profiler
         self.state_name = start_state
         self.state = self.state_dict[self.state_name]
 
-    def update(self):
-        self.current_time = pg.time.get_ticks()
+    def update(self, draw=True):
+        if self.replay is not None:
+            self.keys = self.replay.step(self.keys)
+            if self.replay.done:
+                self.done = True
+                return
+        self.current_time = self.game_clock.get_ticks()
         if self.state.quit:
             self.done = True
         elif self.state.done:
             self.flip_state()
-        self.state.update(self.screen, self.keys, self.current_time)
+        surface = self.screen if draw else None
+        if draw and self.dirty_rects is not None:
+            self.dirty_rects.start_frame()
+        self.profiler.start('update')
+        self.state.update(surface, self.keys, self.current_time)
+        self.profiler.stop('update')
 
     def flip_state(self):
         previous, self.state_name = self.state_name, self.state.next
@@ -66,19 +262,123 @@ class Control(object):
             self.show_fps = not self.show_fps
             if not self.show_fps:
                 pg.display.set_caption(self.caption)
+        elif key == pg.K_F6:
+            self.show_profile = not self.show_profile
+            self.profile_image = None
+            if not self.show_profile and self.dirty_rects is not None:
+                self.dirty_rects.invalidate()
 
 
     def main(self):
         """Main loop for entire program"""
+        if isinstance(self.game_clock, FixedStepClock):
+            self.fixed_step_main()
+            return
         while not self.done:
-            self.event_loop()
+            self.timed_event_loop()
             self.update()
+            self.draw_profile()
+            self.timed_update_display()
+            self.timed_tick()
+            self.show_fps_caption()
+            self.profiler.end_frame()
+        self.dump_profile()
+
+    def fixed_step_main(self):
+        """Main loop with a fixed simulation step.  Game time advances in
+        exact steps of self.game_clock while the screen is drawn at
+        self.fps, only on the last step of each frame"""
+        last_ticks = pg.time.get_ticks()
+        while not self.done:
+            self.timed_event_loop()
+            ticks = pg.time.get_ticks()
+            steps = self.game_clock.add_time(ticks - last_ticks)
+            last_ticks = ticks
+            for step in range(steps):
+                self.game_clock.tick()
+                self.update(draw=(step == steps - 1))
+                if self.done:
+                    break
+            if steps:
+                self.draw_profile()
+                self.timed_update_display()
+            self.timed_tick()
+            self.show_fps_caption()
+            self.profiler.end_frame()
+        self.dump_profile()
+
+    def fast_main(self, draw=False):
+        """Runs one fixed step per pass as fast as the CPU allows, without
+        reading the keyboard or pacing to the display.  Used to play
+        replays back headless"""
+        while not self.done:
+            self.game_clock.tick()
+            self.update(draw)
+            self.profiler.end_frame()
+
+    def timed_event_loop(self):
+        self.profiler.start('event_loop')
+        self.event_loop()
+        self.profiler.stop('event_loop')
+
+    def timed_update_display(self):
+        self.profiler.start('display')
+        self.update_display()
+        self.profiler.stop('display')
+
+    def timed_tick(self):
+        self.profiler.start('tick')
+        self.clock.tick(self.fps)
+        self.profiler.stop('tick')
+
+    def update_display(self):
+        """Pushes the frame to the display, only the dirty rects when
+        dirty rect rendering is on"""
+        if self.dirty_rects is None:
+            pg.display.update()
+            return
+        rects = self.dirty_rects.finish_frame()
+        if rects is None:
             pg.display.update()
-            self.clock.tick(self.fps)
-            if self.show_fps:
-                fps = self.clock.get_fps()
-                with_fps = "{} - {:.2f} FPS".format(self.caption, fps)
-                pg.display.set_caption(with_fps)
+        else:
+            pg.display.update(rects)
+
+    def draw_profile(self):
+        """Draws the profiler percentiles over the bottom left of the
+        screen while F6 is on.  The text is re-rendered twice a second"""
+        if not self.show_profile:
+            return
+        if self.profile_image is None or self.profiler.frames % 30 == 0:
+            self.profile_image = self.render_profile()
+        rect = self.profile_image.get_rect(bottomleft=self.screen.get_rect().bottomleft)
+        self.screen.blit(self.profile_image, rect)
+        if self.dirty_rects is not None and not self.dirty_rects.full:
+            self.dirty_rects.add_all([rect])
+
+    def render_profile(self):
+        font = pg.font.Font(self.profile_font, 16)
+        lines = [font.render(line, False, (255, 255, 255))
+                 for line in self.profiler.report()]
+        height = sum(line.get_height() for line in lines)
+        width = max(line.get_width() for line in lines)
+        image = pg.Surface((width + 8, height + 8))
+        y = 4
+        for line in lines:
+            image.blit(line, (4, y))
+            y += line.get_height()
+        return image
+
+    def dump_profile(self):
+        if self.profile_path:
+            self.profiler.dump(self.profile_path)
+
+    def show_fps_caption(self):
+        if self.show_fps:
+            fps = self.clock.get_fps()
+            with_fps = "{} - {:.2f} FPS".format(self.caption, fps)
+            if self.dirty_rects is not None:
+                with_fps += " - {} dirty px".format(self.dirty_rects.pixels)
+            pg.display.set_caption(with_fps)
 
 
 class _State(object):
@@ -90,6 +390,8 @@ class _State(object):
         self.next = None
         self.previous = None
         self.persist = {}
+        self.dirty_rects = None
+        self.profiler = FrameProfiler(enabled=False)
 
     def get_event(self, event):
         pass
@@ -107,21 +409,74 @@ class _State(object):
 
 
 
+def load_image(path, colorkey=(255,0,255)):
+    """Loads an image, converted to the display format when there is
+    a display to convert to"""
+    img = pg.image.load(path)
+    if img.get_alpha():
+        if pg.display.get_surface() is not None:
+            img = img.convert_alpha()
+    else:
+        if pg.display.get_surface() is not None:
+            img = img.convert()
+        img.set_colorkey(colorkey)
+    return img
+
+
 def load_all_gfx(directory, colorkey=(255,0,255), accept=('.png', 'jpg', 'bmp')):
     graphics = {}
     for pic in os.listdir(directory):
         name, ext = os.path.splitext(pic)
         if ext.lower() in accept:
-            img = pg.image.load(os.path.join(directory, pic))
-            if img.get_alpha():
-                img = img.convert_alpha()
-            else:
-                img = img.convert()
-                img.set_colorkey(colorkey)
-            graphics[name]=img
+            graphics[name] = load_image(os.path.join(directory, pic), colorkey)
     return graphics
 
 
+class LazyResources(MutableMapping):
+    """Dict of the files in a directory, keyed by file name without the
+    extension.  A file is only loaded by loader the first time its key
+    is looked up, and the result is kept.  Assigned values are stored
+    as already loaded."""
+    def __init__(self, directory, accept, loader):
+        self.loader = loader
+        self.paths = {}
+        self.loaded = {}
+        for filename in os.listdir(directory):
+            name, ext = os.path.splitext(filename)
+            if ext.lower() in accept:
+                self.paths[name] = os.path.join(directory, filename)
+
+    def __getitem__(self, name):
+        try:
+            return self.loaded[name]
+        except KeyError:
+            resource = self.loaded[name] = self.loader(self.paths[name])
+            return resource
+
+    def __setitem__(self, name, resource):
+        self.paths.setdefault(name, None)
+        self.loaded[name] = resource
+
+    def __delitem__(self, name):
+        del self.paths[name]
+        self.loaded.pop(name, None)
+
+    def __contains__(self, name):
+        return name in self.paths
+
+    def __iter__(self):
+        return iter(self.paths)
+
+    def __len__(self):
+        return len(self.paths)
+
+
+def lazy_gfx(directory, colorkey=(255,0,255), accept=('.png', 'jpg', 'bmp')):
+    """load_all_gfx, but each image is loaded on first use"""
+    return LazyResources(directory, accept,
+                         lambda path: load_image(path, colorkey))
+
+
 def load_all_music(directory, accept=('.wav', '.mp3', '.ogg', '.mdi')):
     songs = {}
     for song in os.listdir(directory):
@@ -144,12 +499,128 @@ def load_all_sfx(directory, accept=('.wav','.mpe','.ogg','.mdi')):
     return effects
 
 
-
-
-
-
-
-
-
-
-
+def lazy_sfx(directory, accept=('.wav','.mpe','.ogg','.mdi')):
+    """load_all_sfx, but each sound is loaded on first use"""
+    return LazyResources(directory, accept, pg.mixer.Sound)
+
+
+class FrameBank(object):
+    """Process-wide cache of the frames cut out of the sprite sheets. Every
+    component asks the bank for its images, so identical frames (all the
+    goombas, all the bricks, every floating score) share one Surface instead
+    of each instance extracting and scaling its own copy.  Given the dict
+    the sheets were loaded into and an asset_cache.AssetCache, frames are
+    also read from and put into the on-disk cache."""
+    def __init__(self, sources=None, cache=None):
+        self.sources = sources
+        self.cache = cache
+        self.sheet_names = {}
+        self.frames = {}
+        self.keys = {}
+        self.sheets = {}
+        self.hits = 0
+        self.misses = 0
+        self.bytes = 0
+
+    def get_image(self, sheet, x, y, width, height, scale, colorkey,
+                  flip_x=False, flip_y=False):
+        """Returns the shared frame for this part of the sheet, extracting,
+        colorkeying, scaling and flipping it the first time it is asked for"""
+        key = (id(sheet), x, y, width, height, scale, colorkey, flip_x, flip_y)
+        image = self.frames.get(key)
+        if image is not None:
+            self.hits += 1
+            return image
+
+        self.misses += 1
+        if flip_x or flip_y:
+            image = self.get_image(sheet, x, y, width, height, scale, colorkey)
+            image = pg.transform.flip(image, flip_x, flip_y)
+        else:
+            cache_key = self.cache_key('frame', sheet, x, y, width, height,
+                                       scale, colorkey)
+            image = cache_key and self.cache.get(cache_key)
+            if image is None:
+                image = self.cut_image(sheet, x, y, width, height, scale,
+                                       colorkey)
+                if cache_key:
+                    self.cache.put(cache_key, image)
+
+        self.sheets[id(sheet)] = sheet
+        self.frames[key] = image
+        self.keys[id(image)] = key
+        self.bytes += image.get_pitch() * image.get_height()
+        return image
+
+    def cut_image(self, sheet, x, y, width, height, scale, colorkey):
+        image = pg.Surface([width, height])
+        if pg.display.get_surface() is not None:
+            image = image.convert()
+        image.blit(sheet, (0, 0), (x, y, width, height))
+        image.set_colorkey(colorkey)
+        return pg.transform.scale(image, (int(width*scale), int(height*scale)))
+
+    def get_scaled(self, sheet, size):
+        """Returns the whole of sheet scaled to size, scaling it (or reading
+        it from the on-disk cache) only the first time.  Every state gets
+        the same Surface, so it must only ever be blitted from"""
+        key = (id(sheet), 'scaled', size)
+        image = self.frames.get(key)
+        if image is not None:
+            self.hits += 1
+            return image
+
+        self.misses += 1
+        cache_key = self.cache_key('scaled', sheet, *size)
+        image = cache_key and self.cache.get(cache_key, read_only=True)
+        if image is None:
+            image = pg.transform.scale(sheet, size)
+            if cache_key:
+                self.cache.put(cache_key, image)
+
+        self.sheets[id(sheet)] = sheet
+        self.frames[key] = image
+        self.bytes += image.get_pitch() * image.get_height()
+        return image
+
+    def cache_key(self, kind, sheet, *args):
+        """Key for the on-disk cache, or None when there is no cache or
+        sheet didn't come from sources"""
+        if self.cache is None:
+            return None
+        name = self.sheet_name(sheet)
+        if name is None:
+            return None
+        return ' '.join([kind, name] + [str(arg) for arg in args])
+
+    def sheet_name(self, sheet):
+        """Looks sheet up among the images already loaded into sources"""
+        name = self.sheet_names.get(id(sheet))
+        if name is None and self.sources is not None:
+            loaded = getattr(self.sources, 'loaded', self.sources)
+            for source_name, source in loaded.items():
+                if source is sheet:
+                    name = self.sheet_names[id(sheet)] = source_name
+        return name
+
+    def flip(self, image, flip_x, flip_y):
+        """Returns a flipped version of a frame. Frames that came from the
+        bank are flipped once and shared, anything else is flipped as is"""
+        key = self.keys.get(id(image))
+        if key is None:
+            return pg.transform.flip(image, flip_x, flip_y)
+        sheet_id, x, y, width, height, scale, colorkey, old_x, old_y = key
+        return self.get_image(self.sheets[sheet_id], x, y, width, height,
+                              scale, colorkey,
+                              old_x != flip_x, old_y != flip_y)
+
+    def stats(self):
+        """Hit/miss and memory counters for the bank"""
+        return {'frames': len(self.frames),
+                'hits': self.hits,
+                'misses': self.misses,
+                'bytes': self.bytes}
+
+    def clear(self):
+        """Drops every cached frame and resets the counters"""
+        self.__init__(self.sources, self.cache)
@@ -9,10 +9,19 @@ Super Mario Bros for the NES.
 import sys
 import pygame as pg
 from data.main import main
-import cProfile
+
+
+def option(name):
+    """The command line value following name, or None"""
+    if name in sys.argv[1:-1]:
+        return sys.argv[sys.argv.index(name) + 1]
 
 
 if __name__=='__main__':
-    main()
+    main(fixed_step='--fixed-step' in sys.argv,
+         dirty_rects='--dirty-rects' in sys.argv,
+         profile_path='frame_profile.txt' if '--profile' in sys.argv else None,
+         record_path=option('--record'),
+         replay_path=option('--replay'))
     pg.quit()
     sys.exit()
\ No newline at end of file
@@ -0,0 +1,121 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+import pygame as pg
+
+import SuperMarioLevel1.data.constants as c
+from SuperMarioLevel1.data.asset_cache import AssetCache, source_digest
+from SuperMarioLevel1.data.tools import FrameBank
+
+
+# This is a test class for the AssetCache class in /data/asset_cache.py.
+# This class represents the on-disk cache of pre-scaled frames and backgrounds, kept as raw pixels in one mapped file.
+# There is at least one test for each AssetCache method, asserting that surfaces survive a save and load unchanged,
+# and that a cache built from different source images is ignored.
+class TestAssetCache(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        pg.init()
+        pg.display.set_mode((c.SCREEN_WIDTH, c.SCREEN_HEIGHT))
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.source_dir = os.path.join(self.directory, 'graphics')
+        os.mkdir(self.source_dir)
+        self.sheet = pg.Surface((16, 16))
+        self.sheet.fill(c.RED)
+        self.sheet.fill(c.BLACK, (0, 0, 4, 4))
+        pg.image.save(self.sheet, os.path.join(self.source_dir, 'sheet.png'))
+        self.path = os.path.join(self.directory, 'cache', 'assets.bin')
+        self.cache = AssetCache(self.path, self.source_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_source_digest(self):
+        digest = source_digest(self.source_dir)
+        self.assertEqual(digest, source_digest(self.source_dir))
+        with open(os.path.join(self.source_dir, 'notes.txt'), 'w') as notes:
+            notes.write('not an image')
+        self.assertEqual(digest, source_digest(self.source_dir))
+        pg.image.save(pg.Surface((2, 2)), os.path.join(self.source_dir, 'sheet.png'))
+        self.assertNotEqual(digest, source_digest(self.source_dir))
+
+    def test_get_missing(self):
+        self.assertIsNone(self.cache.get('frame sheet'))
+        self.assertEqual(self.cache.misses, 1)
+        self.assertFalse(self.cache.save())
+
+    def test_save_and_load(self):
+        image = self.sheet.convert()
+        image.set_colorkey(c.BLACK)
+        self.cache.put('frame sheet', image)
+        self.assertTrue(self.cache.save())
+
+        cache = AssetCache(self.path, self.source_dir)
+        loaded = cache.get('frame sheet')
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(loaded.get_size(), (16, 16))
+        self.assertEqual(loaded.get_colorkey()[:3], c.BLACK)
+        self.assertEqual(pg.image.tostring(loaded, 'RGB'), pg.image.tostring(image, 'RGB'))
+
+    def test_save_keeps_old_entries(self):
+        self.cache.put('one', self.sheet)
+        self.cache.save()
+        self.cache.put('two', self.sheet)
+        self.cache.save()
+        self.assertEqual(sorted(AssetCache(self.path, self.source_dir).index), ['one', 'two'])
+
+    def test_get_read_only_alpha(self):
+        image = pg.Surface((8, 4), pg.SRCALPHA)
+        image.fill((10, 20, 30, 128))
+        self.cache.put('scaled sheet', image)
+        self.cache.save()
+        loaded = self.cache.get('scaled sheet', read_only=True)
+        self.assertEqual(loaded.get_at((1, 1)), (10, 20, 30, 128))
+        self.assertTrue(loaded.get_flags() & pg.SRCALPHA)
+
+    def test_put_skips_empty_image(self):
+        self.cache.put('empty', pg.Surface((0, 4)))
+        self.assertEqual(self.cache.new, {})
+
+    def test_stale_cache_is_ignored(self):
+        self.cache.put('frame sheet', self.sheet)
+        self.cache.save()
+        pg.image.save(pg.Surface((2, 2)), os.path.join(self.source_dir, 'sheet.png'))
+        cache = AssetCache(self.path, self.source_dir)
+        self.assertEqual(cache.index, {})
+        self.assertIsNone(cache.get('frame sheet'))
+
+    def test_clear(self):
+        self.cache.put('frame sheet', self.sheet)
+        self.cache.save()
+        self.cache.clear()
+        self.assertFalse(os.path.exists(self.path))
+        self.assertEqual(self.cache.index, {})
+
+    def test_frame_bank_uses_cache(self):
+        bank = FrameBank({'sheet': self.sheet}, self.cache)
+        image = bank.get_image(self.sheet, 0, 0, 8, 8, 2, c.BLACK)
+        bank.get_image(self.sheet, 0, 0, 8, 8, 2, c.BLACK, flip_x=True)
+        self.assertEqual(list(self.cache.new), ['frame sheet 0 0 8 8 2 (0, 0, 0)'])
+        self.cache.save()
+
+        bank = FrameBank({'sheet': self.sheet}, AssetCache(self.path, self.source_dir))
+        cached = bank.get_image(self.sheet, 0, 0, 8, 8, 2, c.BLACK)
+        self.assertEqual(bank.cache.hits, 1)
+        self.assertEqual(pg.image.tostring(cached, 'RGB'), pg.image.tostring(image, 'RGB'))
+
+    def test_frame_bank_unknown_sheet(self):
+        bank = FrameBank({}, self.cache)
+        bank.get_image(self.sheet, 0, 0, 8, 8, 2, c.BLACK)
+        self.assertEqual(self.cache.new, {})
+
+    def test_frame_bank_get_scaled(self):
+        bank = FrameBank({'sheet': self.sheet}, self.cache)
+        image = bank.get_scaled(self.sheet, (32, 8))
+        self.assertEqual(image.get_size(), (32, 8))
+        self.assertIn('scaled sheet 32 8', self.cache.new)
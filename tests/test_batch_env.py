@@ -0,0 +1,131 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+import numpy as np
+import pygame as pg
+
+import SuperMarioLevel1.data.constants as c
+import SuperMarioLevel1.data.setup as setup
+import SuperMarioLevel1.data.tools as tools
+from SuperMarioLevel1.data.batch_env import BatchEnv, StateObservation
+from SuperMarioLevel1.data.headless import Simulator
+from SuperMarioLevel1.data.states.level1 import Level1
+
+
+RIGHT = tools.KEY_BITS[tools.keybinding['right']]
+JUMP = tools.KEY_BITS[tools.keybinding['jump']]
+
+
+def finish_on_third_frame(update):
+    """A Level1.update that also ends the level on the third frame after
+    each start"""
+    def finishing(level, surface, keys, current_time):
+        update(level, surface, keys, current_time)
+        level.done = level.done or current_time > 2.5 * 1000 / 60
+    return finishing
+
+
+# This is a test class for the BatchEnv class in /data/batch_env.py.
+# A BatchEnv steps several independent Level1 simulations in lockstep and stacks what they return.
+# The tests check that every copy plays exactly as a lone Simulator would, that rewards follow Mario's
+# progress and score, and that a finished copy starts over without touching the others.
+class TestBatchEnv(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        pg.init()
+        setup.SCREEN = pg.display.set_mode((c.SCREEN_WIDTH, c.SCREEN_HEIGHT))
+
+    def setUp(self):
+        self.env = BatchEnv(3)
+
+    def test_init(self):
+        self.assertEqual(len(self.env), 3)
+        self.assertEqual(self.env.observations.shape, (3,) + StateObservation.shape)
+        self.assertEqual(len(set(map(id, self.env.levels))), 3)
+        self.assertIs(self.env.levels[0].ground_group, self.env.levels[2].ground_group)
+
+    def test_reset(self):
+        observations = self.env.reset()
+        self.assertEqual(observations.shape, (3, 9))
+        self.assertTrue((observations == observations[0]).all())
+        self.assertEqual(observations[0][0], self.env.levels[0].mario.rect.x)
+
+    def test_step_matches_simulator(self):
+        simulator = Simulator()
+        self.env.reset()
+        for frame in range(90):
+            jump = JUMP if frame // 20 % 2 else 0
+            simulator.step(RIGHT | jump)
+            self.env.step(np.array([RIGHT | jump, 0, JUMP]))
+        self.assertEqual(self.env.levels[0].mario.rect, simulator.level.mario.rect)
+        self.assertNotEqual(self.env.levels[1].mario.rect, self.env.levels[0].mario.rect)
+        self.assertEqual(self.env.observations[0][0], simulator.level.mario.rect.x)
+
+    def test_step_rewards(self):
+        self.env.reset()
+        start = self.env.levels[0].mario.rect.x
+        total = np.zeros(3)
+        for frame in range(30):
+            observations, rewards, dones = self.env.step([RIGHT, 0, 0])
+            total += rewards
+        self.assertEqual(total[0], self.env.levels[0].mario.rect.x - start)
+        self.assertGreater(total[0], 0)
+        self.assertEqual(total[1], 0)
+
+    def test_step_score_reward(self):
+        self.env.reset()
+        self.env.levels[1].game_info[c.SCORE] += 200
+        observations, rewards, dones = self.env.step([0, 0, 0])
+        self.assertAlmostEqual(rewards[1], 2.0)
+        self.assertEqual(rewards[0], 0)
+
+    def test_done_copy_starts_over(self):
+        self.env.reset()
+        for frame in range(40):
+            self.env.step([RIGHT, RIGHT, RIGHT])
+        self.env.levels[2].mario.dead = True
+        observations, rewards, dones = self.env.step([RIGHT, RIGHT, RIGHT])
+        self.assertEqual(list(dones), [False, False, True])
+        x = self.env.levels[0].mario.rect.x
+        self.env.step([RIGHT, RIGHT, RIGHT])
+        self.assertFalse(self.env.levels[2].mario.dead)
+        self.assertLess(self.env.levels[2].mario.rect.x, x)
+        self.assertEqual(self.env.simulators[2].frame, 1)
+        self.assertEqual(list(self.env.episodes), [0, 0, 1])
+
+    def test_step_repeat(self):
+        single = BatchEnv(3)
+        single.reset()
+        for frame in range(20):
+            single.step([RIGHT, RIGHT | JUMP, 0])
+        self.env.reset()
+        for step in range(5):
+            observations, rewards, dones = self.env.step([RIGHT, RIGHT | JUMP, 0], repeat=4)
+        np.testing.assert_array_equal(observations, single.observations)
+        self.assertEqual(self.env.steps, 60)
+        self.assertEqual(self.env.simulators[0].frame, 20)
+
+    def test_step_repeat_rewards(self):
+        self.env.reset()
+        start = self.env.levels[0].mario.rect.x
+        observations, rewards, dones = self.env.step([RIGHT, 0, 0], repeat=40)
+        self.assertEqual(rewards[0], self.env.levels[0].mario.rect.x - start)
+        self.assertGreater(rewards[0], 0)
+
+    def test_step_repeat_counts_frames_run(self):
+        self.env.reset()
+        with patch.object(Level1, 'update', finish_on_third_frame(Level1.update)):
+            observations, rewards, dones = self.env.step([0, 0, 0], repeat=8)
+            self.assertTrue(dones.all())
+            self.assertEqual(self.env.steps, 9)
+            self.env.step([0, 0, 0], repeat=2)
+        self.assertEqual(self.env.steps, 15)
+        self.assertEqual(self.env.simulators[0].frame, 2)
+
+    def test_steps_per_second(self):
+        self.assertEqual(self.env.steps_per_second(), 0.0)
+        self.env.reset()
+        self.env.step([0, 0, 0])
+        self.assertEqual(self.env.steps, 3)
+        self.assertGreater(self.env.steps_per_second(), 0)
@@ -0,0 +1,87 @@
+from unittest import TestCase
+
+import pygame as pg
+
+import SuperMarioLevel1.data.constants as c
+import SuperMarioLevel1.data.setup as setup
+import SuperMarioLevel1.data.tools as tools
+from SuperMarioLevel1.data import benchmark
+from SuperMarioLevel1.data.headless import Simulator
+
+
+def result(fps, frame_ms, alloc):
+    return {'fps': fps, 'phases_ms': {'frame': {'p50': frame_ms}},
+            'alloc_bytes_per_frame': alloc}
+
+
+# This is a test class for the scenario runner and the compare function in /data/benchmark.py.
+# Each scenario readies a menu or a Level1 and hands back the scripted masks to time it with, and
+# compare checks a run's frames/sec, phase times and allocations against the stored baseline.
+# The tests check that the stored run trace still finishes 1-1 and that only real slowdowns are flagged.
+class TestBenchmark(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        pg.init()
+        setup.SCREEN = pg.display.set_mode((c.SCREEN_WIDTH, c.SCREEN_HEIGHT))
+
+    def test_level_run_finishes_the_level(self):
+        simulator = Simulator()
+        masks = benchmark.play_until(simulator, benchmark.level_run(),
+                                     lambda level: level.mario.state == c.FLAGPOLE)
+        self.assertTrue(masks)
+        self.assertFalse(simulator.level.mario.dead)
+        for mask in masks:
+            simulator.step(mask)
+        self.assertTrue(simulator.done)
+
+    def test_play_until(self):
+        simulator = Simulator()
+        masks = benchmark.play_until(simulator, [benchmark.RUN] * 100,
+                                     lambda level: level.mario.rect.x > 150)
+        self.assertGreater(simulator.level.mario.rect.x, 150)
+        self.assertGreater(len(masks), 0)
+        self.assertEqual(simulator.clock.frame + len(masks), 100)
+
+    def test_run_scenario(self):
+        state = tools._State()
+        steps = []
+        setup_scenario = lambda: (state, steps.append, [0] * 10)
+        scenario = benchmark.run_scenario(setup_scenario, repeat=2)
+        self.assertEqual(scenario['frames'], 10)
+        self.assertEqual(len(steps), 30)
+        self.assertEqual(list(scenario['phases_ms']), ['frame'])
+        self.assertEqual(sorted(scenario['phases_ms']['frame']), ['p50', 'p95', 'p99'])
+        self.assertGreater(scenario['fps'], 0)
+
+    def test_scenarios_are_named(self):
+        names = [name for name, setup_scenario in benchmark.SCENARIOS]
+        self.assertEqual(len(names), len(set(names)))
+        self.assertIn('full_run', names)
+
+    def test_compare(self):
+        baseline = {'scenarios': {'run': result(500, 1.0, 1000), 'gone': result(1, 1, 1)}}
+        current = {'scenarios': {'run': result(480, 1.05, 1050), 'new': result(1, 1, 1)}}
+        rows = benchmark.compare(baseline, current)
+        self.assertEqual([row[:2] for row in rows],
+                         [('run', 'fps'), ('run', 'frame p50 ms'), ('run', 'alloc bytes/frame')])
+        self.assertFalse(any(row[4] for row in rows))
+
+    def test_compare_flags_regressions(self):
+        baseline = {'scenarios': {'run': result(500, 1.0, 1000)}}
+        current = {'scenarios': {'run': result(400, 1.5, 2000)}}
+        self.assertEqual([row[4] for row in benchmark.compare(baseline, current)],
+                         [True, True, True])
+
+    def test_compare_ignores_tiny_phases(self):
+        baseline = {'scenarios': {'run': result(500, 0.01, 1000)}}
+        current = {'scenarios': {'run': result(500, 0.02, 1000)}}
+        self.assertFalse(any(row[4] for row in benchmark.compare(baseline, current)))
+
+    def test_memory_report(self):
+        report = benchmark.memory_report()
+        level = Simulator().level
+        self.assertEqual(report['count'], len(level.ground_step_pipe_group))
+        # the first ground rect's Surface alone was 2953x60 pixels
+        self.assertGreater(report['sprite_bytes'] - report['bytes'], 2953 * 60)
+        self.assertLess(report['bytes'], report['count'] * 400)
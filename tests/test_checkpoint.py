@@ -1,46 +1,49 @@
 import unittest
 
 import pygame as pg
-from parameterized import parameterized
-
-import SuperMarioLevel1.data.constants as c
-from SuperMarioLevel1.data.components.checkpoint import Checkpoint
-
-
-# This is a test class for the Checkpoint class in /data/components/checkpoint.py.
-# This class represents an Invisible sprite used to add enemies, special boxes
-#     and trigger sliding down the flag pole.
-# There is at least one test for each Checkpoint method, asserting that the correct values were modified and the correct
-# methods were called. In order to achieve full coverage, some methods require multiple tests to achieve that their
-# behavior is correct across all possible cases.
-class TestCheckpoint(unittest.TestCase):
-
-    @classmethod
-    def setUpClass(cls):
-        pg.init()
-        pg.display.set_mode((c.SCREEN_WIDTH, c.SCREEN_HEIGHT))
-
-    @classmethod
-    def tearDownClass(cls):
-        pg.quit()
-
-    def test_default_setup(self):
-        checkpoint = Checkpoint(0, "default")
-        self.assertEqual(checkpoint.rect.x, 0)
-        self.assertEqual(checkpoint.name, "default")
-        self.assertEqual(checkpoint.rect.y, 0)
-        self.assertEqual(checkpoint.image.get_size(), (10, 600))
-
-    def test_image_is_black_surface(self):
-        checkpoint = Checkpoint(50, "surface")
-        self.assertIsInstance(checkpoint.image, pg.Surface)
-        self.assertEqual(checkpoint.image.get_size(), (10, 600))
-        self.assertEqual(checkpoint.image.get_at((0, 0)), c.BLACK)
-
-    @parameterized.expand([[0, 0], [300, 500]])
-    def test_rect_position(self, x, y):
-        checkpoint = Checkpoint(x, "position", y=y)
-        self.assertEqual(checkpoint.rect.x, x)
-        self.assertEqual(checkpoint.rect.y, y)
-
-    # Should i assume invalid rect positions are handled because extends sprite?
+
+from SuperMarioLevel1.data.components import checkpoint
+
+
+# This is a test class for the Trigger class and functions in /data/components/checkpoint.py.
+# Triggers are invisible rects that add enemies, special boxes and trigger sliding down the flag pole.
+# Level1 keeps them in a table sorted by x, firing and removing them one at a time as Mario runs into them.
+class TestTrigger(unittest.TestCase):
+
+    def setUp(self):
+        self.castle = checkpoint.Trigger(8775, checkpoint.CASTLE)
+        self.enemies = checkpoint.Trigger(510, checkpoint.ENEMIES, 0)
+        self.mushroom = checkpoint.Trigger(2740, checkpoint.SECRET_MUSHROOM, y=360, width=40, height=12)
+        self.armed = list(checkpoint.trigger_table(self.castle, self.enemies, self.mushroom))
+
+    def test_trigger_has_no_surface(self):
+        self.assertEqual(self.castle.rect, pg.Rect(8775, 0, 10, 600))
+        self.assertEqual(self.enemies.group, 0)
+        self.assertFalse(hasattr(self.castle, '__dict__'))
+
+    def test_trigger_table_is_sorted(self):
+        self.assertEqual(self.armed, [self.enemies, self.mushroom, self.castle])
+
+    def test_next_trigger_before_first(self):
+        self.assertIsNone(checkpoint.next_trigger(self.armed, pg.Rect(400, 500, 40, 40), 0))
+        self.assertEqual(len(self.armed), 3)
+        self.assertIsNone(checkpoint.next_trigger([], pg.Rect(400, 500, 40, 40), 0))
+
+    def test_next_trigger_fires_once(self):
+        mario = pg.Rect(490, 500, 40, 40)
+        self.assertIs(checkpoint.next_trigger(self.armed, mario, 0), self.enemies)
+        self.assertEqual(self.armed, [self.mushroom, self.castle])
+        self.assertIsNone(checkpoint.next_trigger(self.armed, mario, 0))
+
+    def test_next_trigger_checks_height(self):
+        self.armed.remove(self.enemies)
+        self.assertIsNone(checkpoint.next_trigger(self.armed, pg.Rect(2750, 500, 40, 40), 2000))
+        self.assertIs(checkpoint.next_trigger(self.armed, pg.Rect(2750, 350, 40, 40), 2000), self.mushroom)
+
+    def test_next_trigger_drops_passed_triggers(self):
+        # a trigger jumped over is still armed until the viewport scrolls past it
+        self.assertIsNone(checkpoint.next_trigger(self.armed, pg.Rect(2750, 500, 40, 40), 2000))
+        self.assertEqual(self.armed, [self.mushroom, self.castle])
+        self.assertIsNone(checkpoint.next_trigger(self.armed, pg.Rect(560, 500, 40, 40), 500))
+        self.assertIs(checkpoint.next_trigger(self.armed, pg.Rect(8770, 500, 40, 40), 8000), self.castle)
+        self.assertEqual(self.armed, [])
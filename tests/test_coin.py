@@ -56,7 +56,7 @@ class TestCoin(TestCase):
         initial_height = self.coin.rect.bottom
         initial_frame_index = self.coin.frame_index
         initial_image = self.coin.image.copy()
-        with patch('SuperMarioLevel1.data.components.score.Score') as mock_score:
+        with patch('SuperMarioLevel1.data.components.score.spawn') as mock_score:
             viewport = MagicMock()
             self.coin.viewport = viewport
             self.coin.current_time = 100
@@ -94,7 +94,7 @@ class TestCoin(TestCase):
         self.coin.initial_height = 100
         self.coin.rect.bottom = self.coin.initial_height + 50
         with patch('SuperMarioLevel1.data.components.coin.Coin.kill') as mock_kill:
-            with patch('SuperMarioLevel1.data.components.score.Score') as mock_score:
+            with patch('SuperMarioLevel1.data.components.score.spawn') as mock_score:
                 # Set required attributes
                 self.coin.current_time = 100
                 self.coin.animation_timer = 0
@@ -1,9 +1,10 @@
 import unittest
+from unittest.mock import Mock
 
 import pygame as pg
 
 import SuperMarioLevel1.data.constants as c
-from SuperMarioLevel1.data.components.collider import Collider
+from SuperMarioLevel1.data.components.collider import ActivationWindow, Collider, ColliderGrid, Contact, RectCollider, contacts
 
 
 # This is a test class for the Collider class in /data/components/collider.py.
@@ -39,3 +40,167 @@ class TestCollider(unittest.TestCase):
         collider1 = Collider(0, 0, 50, 50)
         collider2 = Collider(25, 25, 50, 50)
         self.assertTrue(pg.sprite.collide_rect(collider1, collider2))
+
+
+# This is a test class for the RectCollider class in /data/components/collider.py.
+# A RectCollider is a Collider without an image: just a rect in __slots__ and enough of the Sprite protocol
+# for groups. The tests check that it is filed, collided with and removed like any sprite.
+class TestRectCollider(unittest.TestCase):
+
+    def setUp(self):
+        self.collider = RectCollider(900, 400, 80, 100)
+
+    def test_attributes(self):
+        self.assertEqual(self.collider.rect, pg.Rect(900, 400, 80, 100))
+        self.assertEqual(self.collider.state, None)
+        self.assertEqual(self.collider.name, 'collider')
+        self.assertFalse(hasattr(self.collider, 'image'))
+        self.assertFalse(hasattr(self.collider, '__dict__'))
+
+    def test_group_membership(self):
+        group = pg.sprite.Group(self.collider)
+        grid = ColliderGrid(group)
+        self.assertIn(self.collider, group)
+        self.assertTrue(self.collider.alive())
+        group.remove(self.collider)
+        self.assertNotIn(self.collider, group)
+        self.assertEqual(self.collider.sprite_groups, [grid])
+        self.collider.kill()
+        self.assertEqual(len(grid), 0)
+        self.assertEqual(grid.cells, {})
+        self.assertFalse(self.collider.alive())
+
+    def test_collides(self):
+        sprite = Collider(910, 450, 40, 60)
+        ground = RectCollider(0, 500, 3000, 60)
+        grid = ColliderGrid(self.collider, ground)
+        self.assertEqual(grid.nearby(sprite), [self.collider, ground])
+        self.assertIs(pg.sprite.spritecollideany(sprite, grid.nearby(sprite)), self.collider)
+        self.assertTrue(pg.sprite.collide_rect(sprite, self.collider))
+
+
+# This is a test class for the ColliderGrid class in /data/components/collider.py.
+# This class is a sprite group that files its sprites into a uniform grid so that collision
+# checks only look at colliders near a sprite. The tests check that nearby() returns the close
+# colliders in insertion order and that the grid stays in sync as sprites are removed.
+class TestColliderGrid(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        pg.init()
+        pg.display.set_mode((c.SCREEN_WIDTH, c.SCREEN_HEIGHT))
+
+    @classmethod
+    def tearDownClass(cls):
+        pg.quit()
+
+    def setUp(self):
+        self.ground = Collider(0, 500, 3000, 60)
+        self.pipe = Collider(900, 400, 80, 100)
+        self.step = Collider(2000, 400, 40, 40)
+        self.grid = ColliderGrid(self.ground, self.pipe, self.step)
+        self.sprite = Collider(910, 450, 40, 60)
+
+    def test_nearby_skips_far_colliders(self):
+        nearby = self.grid.nearby(self.sprite)
+        self.assertEqual(nearby, [self.ground, self.pipe])
+
+    def test_nearby_empty_area(self):
+        self.sprite.rect.topleft = (5000, 0)
+        self.assertEqual(self.grid.nearby(self.sprite), [])
+
+    def test_kill_removes_from_grid(self):
+        self.pipe.kill()
+        self.assertEqual(self.grid.nearby(self.sprite), [self.ground])
+        self.assertNotIn(self.pipe, self.grid)
+        self.assertFalse(any(self.pipe in bucket for bucket in self.grid.cells.values()))
+
+    def test_add_internal_with_cells(self):
+        self.pipe.kill()
+        self.pipe.rect.topleft = (2000, 400)
+        self.grid.add_internal(self.pipe, cells=[(900 // c.COLLIDER_CELL_SIZE, 450 // c.COLLIDER_CELL_SIZE)])
+        self.pipe.add_internal(self.grid)
+        self.assertEqual(self.grid.nearby(self.sprite), [self.ground, self.pipe])
+
+    def test_padding_covers_bumped_sprites(self):
+        grid = ColliderGrid(self.step, padding=c.COLLIDER_BUMP_PADDING)
+        self.step.rect.y -= 20
+        self.sprite.rect.topleft = (2000, 350)
+        self.assertEqual(grid.nearby(self.sprite), [self.step])
+
+    def test_copy_keeps_cell_size_and_padding(self):
+        grid = ColliderGrid(self.pipe, self.step, cell_size=64, padding=24)
+        copy = grid.copy()
+        self.assertIsInstance(copy, ColliderGrid)
+        self.assertEqual((copy.cell_size, copy.padding), (64, 24))
+        self.assertEqual(copy.sprites(), grid.sprites())
+        self.assertEqual(copy.sprite_cells, grid.sprite_cells)
+
+    def test_contacts_in_priority_order(self):
+        enemies = pg.sprite.Group(Collider(920, 460, 20, 20))
+        found = list(contacts(self.sprite, [('enemy', enemies), ('ground', self.grid)]))
+        self.assertEqual(found, [Contact('enemy', enemies.sprites()[0]), Contact('ground', self.ground)])
+
+    def test_contacts_is_lazy(self):
+        later = pg.sprite.Group()
+        found = contacts(self.sprite, [('ground', self.grid), ('later', later)])
+        self.assertEqual(next(found), Contact('ground', self.ground))
+        later.add(Collider(910, 450, 10, 10))
+        self.assertEqual(next(found).kind, 'later')
+
+
+# This is a test class for the ActivationWindow class in /data/components/collider.py.
+# The window is the viewport widened by a margin; only the ColliderGrid sprites inside it are updated.
+# The tests check which sprites wake and sleep as the window moves and that the counts follow.
+class TestActivationWindow(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        pg.init()
+        pg.display.set_mode((c.SCREEN_WIDTH, c.SCREEN_HEIGHT))
+
+    def setUp(self):
+        self.bricks = [Collider(x, 365, 43, 43) for x in (5000, 100, 1300, 2500)]
+        for brick in self.bricks:
+            brick.update = Mock()
+        self.grid = ColliderGrid(*self.bricks)
+        self.window = ActivationWindow(margin=400)
+        self.viewport = pg.Rect(0, 0, c.SCREEN_WIDTH, c.SCREEN_HEIGHT)
+
+    def test_move(self):
+        self.viewport.x = 1000
+        self.window.move(self.viewport)
+        self.assertEqual(self.window.rect, pg.Rect(600, 0, 1600, c.SCREEN_HEIGHT))
+
+    def test_awake(self):
+        self.window.move(self.viewport)
+        self.assertEqual(self.window.awake(self.grid), [self.bricks[1]])
+        self.viewport.x = 1000
+        self.window.move(self.viewport)
+        self.assertEqual(self.window.awake(self.grid), [self.bricks[2]])
+        self.assertEqual((self.window.active, self.window.sleeping), (1, 3))
+
+    def test_awake_at_the_edges(self):
+        # bricks[2] spans x 1300-1343 and bricks[3] starts at 2500
+        for x, awake in ((1742, [2, 3]), (1743, [3]), (1301, [2, 3]), (1300, [2])):
+            self.viewport.x = x
+            self.window.move(self.viewport)
+            self.assertEqual(self.window.awake(self.grid), [self.bricks[i] for i in awake])
+
+    def test_awake_after_grid_changes(self):
+        self.window.move(self.viewport)
+        self.window.awake(self.grid)
+        self.bricks[1].kill()
+        late = Collider(700, 365, 43, 43)
+        self.grid.add(late)
+        self.assertEqual(self.window.awake(self.grid), [late])
+        self.assertEqual(self.window.sleeping, 3 + 3)
+
+    def test_update(self):
+        self.viewport.x = 4500
+        self.window.move(self.viewport)
+        self.window.update(self.grid, 'game info')
+        self.bricks[0].update.assert_called_once_with('game info')
+        for brick in self.bricks[1:]:
+            brick.update.assert_not_called()
+        self.assertEqual((self.window.active, self.window.sleeping), (1, 3))
@@ -13,7 +13,7 @@ import pygame as pg
 
 import SuperMarioLevel1.data.constants as c
 from SuperMarioLevel1.data.tools import Control, _State, load_all_gfx, load_all_music, load_all_fonts, \
-    load_all_sfx
+    load_all_sfx, lazy_gfx, lazy_sfx
 
 
 # This is a test class for the Control class in /data/tools.py.
@@ -156,3 +156,39 @@ class TestLoadFunctions(unittest.TestCase):
         result = load_all_sfx('path/to/sfx')
         self.assertIn('effect', result)
         self.assertIsInstance(result['effect'], MagicMock)
+
+    @patch('os.listdir')
+    @patch('pygame.image.load')
+    def test_lazy_gfx(self, mock_pg_image_load, mock_os_listdir):
+        mock_os_listdir.return_value = ['image.png', 'notes.txt']
+        mock_pg_image_load.return_value = pg.Surface((2, 2))
+
+        result = lazy_gfx('path/to/gfx')
+        self.assertEqual(list(result), ['image'])
+        mock_pg_image_load.assert_not_called()
+        self.assertIs(result['image'], result['image'])
+        mock_pg_image_load.assert_called_once_with('path/to/gfx/image.png')
+        self.assertEqual(result['image'].get_colorkey()[:3], (255, 0, 255))
+
+    @patch('os.listdir')
+    @patch('pygame.mixer.Sound')
+    def test_lazy_sfx(self, mock_pg_mixer_sound, mock_os_listdir):
+        mock_os_listdir.return_value = ['effect.wav']
+
+        result = lazy_sfx('path/to/sfx')
+        self.assertIn('effect', result)
+        mock_pg_mixer_sound.assert_not_called()
+        result['effect'].play()
+        mock_pg_mixer_sound.assert_called_once_with('path/to/sfx/effect.wav')
+        self.assertRaises(KeyError, result.__getitem__, 'missing')
+
+    @patch('os.listdir')
+    def test_lazy_resources_assignment(self, mock_os_listdir):
+        mock_os_listdir.return_value = []
+        result = lazy_sfx('path/to/sfx')
+        sound = MagicMock()
+        result['effect'] = sound
+        self.assertIs(result['effect'], sound)
+        self.assertEqual(len(result), 1)
+        del result['effect']
+        self.assertNotIn('effect', result)
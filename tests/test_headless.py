@@ -0,0 +1,127 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+import pygame as pg
+
+import SuperMarioLevel1.data.constants as c
+import SuperMarioLevel1.data.setup as setup
+import SuperMarioLevel1.data.tools as tools
+from SuperMarioLevel1.data.headless import Simulator, new_game_info
+
+
+# This is a test class for the Simulator class in /data/headless.py.
+# This class represents a Level1 stepped without a window or a real-time clock.
+# There is at least one test for each Simulator method, asserting that the frame counter drives the level and
+# that nothing is drawn unless rendering is asked for.
+class TestSimulator(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        pg.init()
+        setup.SCREEN = pg.display.set_mode((c.SCREEN_WIDTH, c.SCREEN_HEIGHT))
+
+    def setUp(self):
+        self.simulator = Simulator()
+
+    def test_new_game_info(self):
+        game_info = new_game_info()
+        self.assertEqual(game_info[c.LIVES], 3)
+        self.assertEqual(game_info[c.SCORE], 0)
+
+    def test_init(self):
+        self.assertIsNone(self.simulator.surface)
+        self.assertEqual(self.simulator.frame, 0)
+        self.assertFalse(self.simulator.done)
+
+    def test_step_uses_synthetic_time(self):
+        with patch.object(self.simulator.level, 'blit_everything') as mock_blit:
+            self.simulator.step()
+            self.simulator.step()
+            mock_blit.assert_not_called()
+        self.assertEqual(self.simulator.frame, 2)
+        self.assertAlmostEqual(self.simulator.level.game_info[c.CURRENT_TIME], 2000 / 60.0)
+
+    def test_step_moves_mario(self):
+        right = tools.KEY_BITS[tools.keybinding['right']]
+        x = self.simulator.level.mario.rect.x
+        for _ in range(30):
+            self.simulator.step(right)
+        self.assertGreater(self.simulator.level.mario.rect.x, x)
+
+    def test_step_when_done(self):
+        self.simulator.done = True
+        self.assertTrue(self.simulator.step())
+        self.assertEqual(self.simulator.frame, 0)
+
+    def test_snapshot_and_restore(self):
+        right = tools.KEY_BITS[tools.keybinding['right']]
+        for _ in range(30):
+            self.simulator.step(right)
+        snap = self.simulator.snapshot()
+        x = self.simulator.level.mario.rect.x
+        for _ in range(30):
+            self.simulator.step(right)
+        self.simulator.restore(snap)
+        self.assertEqual(self.simulator.frame, 30)
+        self.assertEqual(self.simulator.level.mario.rect.x, x)
+
+    def test_render(self):
+        simulator = Simulator(render=True)
+        with patch.object(simulator.level, 'blit_everything') as mock_blit:
+            simulator.step()
+            mock_blit.assert_called_once_with(simulator.surface)
+
+    def test_step_repeat(self):
+        right = tools.KEY_BITS[tools.keybinding['right']]
+        single = Simulator()
+        for _ in range(12):
+            single.step(right)
+        for _ in range(3):
+            self.simulator.step(right, repeat=4)
+        self.assertEqual(self.simulator.frame, 12)
+        self.assertEqual(self.simulator.level.mario.rect, single.level.mario.rect)
+
+    def test_step_repeat_renders_last_frame(self):
+        simulator = Simulator(render=True)
+        with patch.object(simulator.level, 'blit_everything') as mock_blit:
+            simulator.step(repeat=5)
+            mock_blit.assert_called_once_with(simulator.surface)
+        self.assertEqual(simulator.frame, 5)
+
+    def test_step_repeat_stops_when_done(self):
+        simulator = Simulator(render=True)
+        level = simulator.level
+        update = level.update
+        def finish_on_third_frame(surface, keys, current_time):
+            update(surface, keys, current_time)
+            level.done = simulator.frame == 3
+        with patch.object(level, 'update', side_effect=finish_on_third_frame), \
+                patch.object(level, 'blit_everything') as mock_blit:
+            self.assertTrue(simulator.step(repeat=8))
+            mock_blit.assert_called_once_with(simulator.surface)
+        self.assertEqual(simulator.frame, 3)
+
+    def test_step_rejects_zero_repeat(self):
+        with self.assertRaises(ValueError):
+            self.simulator.step(repeat=0)
+        self.assertEqual(self.simulator.frame, 0)
+
+    def test_run(self):
+        result = self.simulator.run([0] * 10)
+        self.assertEqual(result['steps'], 10)
+        self.assertEqual(self.simulator.steps, 10)
+        self.assertGreater(self.simulator.steps_per_second(), 0)
+
+    def test_run_repeat(self):
+        result = self.simulator.run([0] * 10, repeat=3)
+        self.assertEqual(result['steps'], 30)
+        self.assertEqual(self.simulator.frame, 30)
+
+    def test_reset(self):
+        self.simulator.run([0] * 5)
+        self.simulator.level.done = True
+        self.simulator.reset()
+        self.assertFalse(self.simulator.level.done)
+        self.assertEqual(len(self.simulator.reset_times), 2)
+        self.assertEqual(self.simulator.frame, 0)
+        self.assertEqual(self.simulator.level.game_info[c.LIVES], 3)
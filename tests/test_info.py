@@ -1,9 +1,11 @@
+import time
 from unittest import TestCase
-from unittest.mock import patch, Mock, ANY
+from unittest.mock import patch, Mock
 
 import pygame as pg
 
 import SuperMarioLevel1.data.constants as c
+from SuperMarioLevel1.data.components import info
 from SuperMarioLevel1.data.components.info import OverheadInfo
 
 
@@ -81,37 +83,50 @@ class TestOverheadInfo(TestCase):
 
     def test_update_score_images(self):
         score = 1234
+        characters = list(self.overhead_info.score_images)
         with patch('SuperMarioLevel1.data.components.info.Character') as mock_character:
             self.overhead_info.update_score_images(
                 self.overhead_info.score_images, score)
-            mock_character.assert_any_call(self.overhead_info.image_dict['1'])
-            mock_character.assert_any_call(self.overhead_info.image_dict['2'])
-            mock_character.assert_any_call(self.overhead_info.image_dict['3'])
-            mock_character.assert_any_call(self.overhead_info.image_dict['4'])
+            mock_character.assert_not_called()
+        self.assertEqual(self.overhead_info.score_images, characters)
+        self.assertEqual([letter.image for letter in characters],
+                         [self.overhead_info.image_dict[digit] for digit in '001234'])
+        self.assertIn(id(self.overhead_info.score_images), self.overhead_info.hud_dirty)
+
+    def test_update_score_images_unchanged(self):
+        self.overhead_info.update_score_images(self.overhead_info.score_images, 50)
+        self.overhead_info.hud_dirty = set()
+        with patch.object(self.overhead_info, 'set_character_image') as mock_set_character_image:
+            self.overhead_info.update_score_images(self.overhead_info.score_images, 50)
+            mock_set_character_image.assert_not_called()
+        self.assertEqual(self.overhead_info.hud_dirty, set())
 
     def test_update_coin_total(self):
         level_info = {c.COIN_TOTAL: 42}
-        with patch.object(self.overhead_info, 'create_label') as mock_create_label:
-            self.overhead_info.update_coin_total(level_info)
-            self.assertEqual(self.overhead_info.coin_total, 42)
-            mock_create_label.assert_called_once_with(
-                self.overhead_info.coin_count_images, '*42', ANY, ANY)
+        characters = list(self.overhead_info.coin_count_images)
+        self.overhead_info.update_coin_total(level_info)
+        self.assertEqual(self.overhead_info.coin_total, 42)
+        self.assertEqual(self.overhead_info.coin_count_images, characters)
+        self.assertEqual([letter.image for letter in characters],
+                         [self.overhead_info.image_dict[char] for char in '*42'])
 
     def test_update_coin_total_small_string(self):
         level_info = {c.COIN_TOTAL: 2}
-        with patch.object(self.overhead_info, 'create_label') as mock_create_label:
-            self.overhead_info.update_coin_total(level_info)
-            self.assertEqual(self.overhead_info.coin_total, 2)
-            mock_create_label.assert_called_once_with(
-                self.overhead_info.coin_count_images, '*02', ANY, ANY)
+        characters = list(self.overhead_info.coin_count_images)
+        self.overhead_info.update_coin_total(level_info)
+        self.assertEqual(self.overhead_info.coin_total, 2)
+        self.assertEqual(self.overhead_info.coin_count_images, characters)
+        self.assertEqual([letter.image for letter in characters],
+                         [self.overhead_info.image_dict[char] for char in '*02'])
 
     def test_update_coin_total_large_string(self):
         level_info = {c.COIN_TOTAL: 100}
-        with patch.object(self.overhead_info, 'create_label') as mock_create_label:
-            self.overhead_info.update_coin_total(level_info)
-            self.assertEqual(self.overhead_info.coin_total, 100)
-            mock_create_label.assert_called_once_with(
-                self.overhead_info.coin_count_images, '*00', ANY, ANY)
+        characters = list(self.overhead_info.coin_count_images)
+        self.overhead_info.update_coin_total(level_info)
+        self.assertEqual(self.overhead_info.coin_total, 100)
+        self.assertEqual(self.overhead_info.coin_count_images, characters)
+        self.assertEqual([letter.image for letter in characters],
+                         [self.overhead_info.image_dict[char] for char in '*00'])
 
     def test_handle_level_state_load_screen(self):
         self.overhead_info.state = c.LOAD_SCREEN
@@ -270,90 +285,174 @@ class TestOverheadInfo(TestCase):
 
     def test_draw_main_menu_info(self):
         surface = Mock()
-        score_images_len = len(self.overhead_info.score_images)
         letter_len_main_menu = 0
         for label in self.overhead_info.main_menu_labels:
             for letter in label:
                 letter_len_main_menu += 1
-        coin_count_images_len = len(self.overhead_info.coin_count_images)
-        letter_len_label_list = 0
-        for label in self.overhead_info.label_list:
-            for letter in label:
-                letter_len_label_list += 1
-        total_expected_blit = score_images_len + letter_len_main_menu + \
-                              coin_count_images_len + letter_len_label_list + 1
-        # ^the +1 is because of line 350 in info.py
+        hud_labels_len = len(self.overhead_info.hud_labels)
+        total_expected_blit = hud_labels_len + letter_len_main_menu + 1
         with patch.object(surface, "blit") as mock_blit:
             self.overhead_info.draw_main_menu_info(surface)
             self.assertEqual(mock_blit.call_count, total_expected_blit)
 
     def test_draw_loading_screen_info(self):
         surface = Mock()
-        score_images_len = len(self.overhead_info.score_images)
         center_labels_total_len = 0
         for word in self.overhead_info.center_labels:
             for letter in word:
                 center_labels_total_len += 1
         life_total_label_len = len(self.overhead_info.life_total_label)
-        coin_count_images_len = len(self.overhead_info.coin_count_images)
-        label_list_total_len = 0
-        for label in self.overhead_info.label_list:
-            for letter in label:
-                label_list_total_len += 1
-        total_expected_blit = score_images_len + center_labels_total_len + \
-                              life_total_label_len + 2 + coin_count_images_len + label_list_total_len + 1
+        hud_labels_len = len(self.overhead_info.hud_labels)
+        total_expected_blit = hud_labels_len + center_labels_total_len + life_total_label_len + 2 + 1
         with patch.object(surface, "blit") as mock_blit:
             self.overhead_info.draw_loading_screen_info(surface)
             self.assertEqual(mock_blit.call_count, total_expected_blit)
 
     def test_draw_level_screen_info(self):
         surface = Mock()
-        score_images_len = len(self.overhead_info.score_images)
-        count_down_images_len = len(self.overhead_info.count_down_images)
-        coin_count_images_len = len(self.overhead_info.coin_count_images)
-        label_list_total_len = 0
-        for label in self.overhead_info.label_list:
-            for letter in label:
-                label_list_total_len += 1
-        total_expected_blit = score_images_len + count_down_images_len + \
-                              coin_count_images_len + label_list_total_len + 1
+        # one blit from the HUD band for each of its labels, plus one for the flashing coin
+        total_expected_blit = len(self.overhead_info.hud_labels) + 1
         with patch.object(surface, "blit") as mock_blit:
             self.overhead_info.draw_level_screen_info(surface)
+            mock_blit.assert_any_call(self.overhead_info.hud_image, *self.overhead_info.hud_areas[0])
+            mock_blit.assert_any_call(self.overhead_info.flashing_coin.image,
+                                      self.overhead_info.flashing_coin.rect)
             self.assertEqual(mock_blit.call_count, total_expected_blit)
 
     def test_draw_game_over_screen_info(self):
         surface = Mock()
-        score_images_len = len(self.overhead_info.score_images)
         game_over_labels_total_count = 0
         for word in self.overhead_info.game_over_label:
             for letter in word:
                 game_over_labels_total_count += 1
-        coin_count_images_len = len(self.overhead_info.coin_count_images)
-        label_list_total_len = 0
-        for label in self.overhead_info.label_list:
-            for letter in label:
-                label_list_total_len += 1
-        total_expected_blit = score_images_len + game_over_labels_total_count + \
-                              coin_count_images_len + label_list_total_len + 1
+        hud_labels_len = len(self.overhead_info.hud_labels)
+        total_expected_blit = hud_labels_len + game_over_labels_total_count + 1
         with patch.object(surface, "blit") as mock_blit:
             self.overhead_info.draw_game_over_screen_info(surface)
             self.assertEqual(mock_blit.call_count, total_expected_blit)
 
     def test_draw_time_out_screen_info(self):
         surface = Mock()
-        score_images_len = len(self.overhead_info.score_images)
         time_out_labels_total_count = 0
         for word in self.overhead_info.time_out_label:
             for letter in word:
                 time_out_labels_total_count += 1
-        coin_count_images_len = len(self.overhead_info.coin_count_images)
-        label_list_total_len = 0
-        for label in self.overhead_info.label_list:
-            for letter in label:
-                label_list_total_len += 1
-
-        total_expected_blit = score_images_len + time_out_labels_total_count + \
-                              coin_count_images_len + label_list_total_len + 1
+        hud_labels_len = len(self.overhead_info.hud_labels)
+        total_expected_blit = hud_labels_len + time_out_labels_total_count + 1
         with patch.object(surface, "blit") as mock_blit:
             self.overhead_info.draw_time_out_screen_info(surface)
             self.assertEqual(mock_blit.call_count, total_expected_blit)
+
+    def test_hud_image_covers_the_band(self):
+        self.assertEqual(self.overhead_info.hud_rect, pg.Rect(75, 30, 639, 45))
+        self.assertEqual(self.overhead_info.hud_image.get_size(), self.overhead_info.hud_rect.size)
+        self.assertFalse(self.overhead_info.hud_image.get_flags() & pg.SRCALPHA)
+        self.assertTrue(self.overhead_info.hud_rect.contains(self.overhead_info.flashing_coin.rect))
+
+    def test_draw_hud_repaints_changed_labels(self):
+        surface = pg.Surface(c.SCREEN_SIZE)
+        self.overhead_info.draw(surface)
+        self.assertIsNone(self.overhead_info.changed_rect())
+        with patch.object(self.overhead_info, 'paint_label') as mock_paint_label:
+            self.overhead_info.draw(surface)
+            mock_paint_label.assert_not_called()
+            self.overhead_info.update_score_images(self.overhead_info.score_images, 100)
+            self.assertEqual(self.overhead_info.changed_rect(), self.overhead_info.hud_rect)
+            self.overhead_info.draw(surface)
+            mock_paint_label.assert_called_once_with(self.overhead_info.score_images,
+                                                     self.overhead_info.hud_areas[0][1], True)
+        self.assertIsNone(self.overhead_info.changed_rect())
+
+    def test_flashing_coin_leaves_hud_image_alone(self):
+        surface = pg.Surface(c.SCREEN_SIZE)
+        self.overhead_info.draw(surface)
+        self.overhead_info.flashing_coin.update(400)
+        self.assertEqual(self.overhead_info.changed_rect(), self.overhead_info.flashing_coin.rect)
+        with patch.object(self.overhead_info, 'paint_label') as mock_paint_label:
+            self.overhead_info.draw(surface)
+            mock_paint_label.assert_not_called()
+        self.assertIsNone(self.overhead_info.changed_rect())
+
+    def test_draw_hud_hides_clock_outside_level(self):
+        surface = pg.Surface(c.SCREEN_SIZE)
+        clock = self.overhead_info.count_down_images[0].rect
+        key = self.overhead_info.hud_image.map_rgb(info.TEXT_COLORKEY)
+        self.overhead_info.state = c.LEVEL
+        self.overhead_info.draw(surface)
+        self.assertEqual(self.overhead_info.changed_rect(), None)
+        self.overhead_info.state = c.MAIN_MENU
+        self.assertEqual(self.overhead_info.changed_rect(), self.overhead_info.hud_rect)
+        self.overhead_info.draw(surface)
+        pixels = pg.PixelArray(self.overhead_info.hud_image.subsurface(
+            clock.move(-self.overhead_info.hud_rect.x, -self.overhead_info.hud_rect.y)))
+        try:
+            self.assertTrue(all(pixel == key for column in pixels for pixel in column))
+        finally:
+            pixels.close()
+
+    def test_draw_matches_character_blits(self):
+        self.overhead_info.state = c.LEVEL
+        self.overhead_info.update_score_images(self.overhead_info.score_images, 4250)
+        self.overhead_info.update_coin_total({c.COIN_TOTAL: 7})
+        background = pg.Surface(c.SCREEN_SIZE).convert()
+        background.fill((92, 148, 252))
+        background.fill(c.BLACK, (0, 0, 400, 60))
+        cached = background.copy()
+        self.overhead_info.draw(cached)
+        direct = background.copy()
+        for label in self.overhead_info.hud_labels:
+            for letter in label:
+                direct.blit(letter.image, letter.rect)
+        direct.blit(self.overhead_info.flashing_coin.image, self.overhead_info.flashing_coin.rect)
+        self.assertEqual(pg.image.tostring(cached, 'RGB'), pg.image.tostring(direct, 'RGB'))
+
+    def test_hud_cost_per_frame(self):
+        # A level's HUD over 30 seconds of play, timed against what update and draw did before the
+        # HUD was cached: new Characters for the score, coin total and time every frame, each blitted
+        # on its own.  The best of three runs of each is compared.
+        surface = pg.Surface(c.SCREEN_SIZE).convert()
+        mario = Mock(state=c.WALK, dead=False)
+        frames = [{c.SCORE: frame // 90 * 100, c.COIN_TOTAL: frame // 300, c.LEVEL_STATE: None,
+                   c.CURRENT_TIME: frame * 1000.0 / 60} for frame in range(1800)]
+
+        def cached():
+            overhead_info = OverheadInfo(dict(self.game_info), c.LEVEL)
+            start = time.perf_counter()
+            for level_info in frames:
+                overhead_info.update(level_info, mario)
+                overhead_info.draw(surface)
+            return time.perf_counter() - start
+
+        def uncached():
+            overhead_info = OverheadInfo(dict(self.game_info), c.LEVEL)
+            start = time.perf_counter()
+            for level_info in frames:
+                overhead_info.score_images = []
+                overhead_info.create_label(overhead_info.score_images,
+                                           str(level_info[c.SCORE]).rjust(6, '0'), 75, 55)
+                overhead_info.count_down_images = []
+                overhead_info.create_label(overhead_info.count_down_images,
+                                           str(400 - int(level_info[c.CURRENT_TIME] // 400)), 645, 55)
+                overhead_info.coin_count_images = []
+                overhead_info.create_label(overhead_info.coin_count_images,
+                                           '*' + str(level_info[c.COIN_TOTAL]).rjust(2, '0'), 300, 55)
+                overhead_info.flashing_coin.update(level_info[c.CURRENT_TIME])
+                for label in [overhead_info.score_images, overhead_info.count_down_images,
+                              overhead_info.coin_count_images] + overhead_info.label_list:
+                    for letter in label:
+                        surface.blit(letter.image, letter.rect)
+                surface.blit(overhead_info.flashing_coin.image, overhead_info.flashing_coin.rect)
+            return time.perf_counter() - start
+
+        self.assertLessEqual(min(cached() for attempt in range(3)),
+                             min(uncached() for attempt in range(3)))
+
+    def test_update_count_down_clock_pads_time(self):
+        level_info = {c.CURRENT_TIME: 0}
+        self.overhead_info.state = c.FAST_COUNT_DOWN
+        self.overhead_info.time = 10
+        characters = list(self.overhead_info.count_down_images)
+        self.overhead_info.update_count_down_clock(level_info)
+        self.assertEqual(self.overhead_info.count_down_images, characters)
+        self.assertEqual([digit.image for digit in characters],
+                         [self.overhead_info.image_dict[digit] for digit in '009'])
@@ -7,6 +7,8 @@ import SuperMarioLevel1.data.constants as c
 import SuperMarioLevel1.data.setup as setup
 import SuperMarioLevel1.data.tools as tools
 from SuperMarioLevel1.data.states.level1 import Level1
+from SuperMarioLevel1.data.components.collider import Collider
+from SuperMarioLevel1.data.components import checkpoint
 from data.components import score
 from data.components.powerups import LifeMushroom, Mushroom, Star, FireBall
 
@@ -22,9 +24,11 @@ class TestLevel1(TestCase):
         pg.init()
         pg.display.set_mode((c.SCREEN_WIDTH, c.SCREEN_HEIGHT))
         setup.SCREEN = MagicMock()  # this is so line 69 in level1.py doesn't cause an error
+        cls.spritecollideany = pg.sprite.spritecollideany
 
     @classmethod
     def tearDownClass(cls):
+        pg.sprite.spritecollideany = cls.spritecollideany
         pg.quit()
 
     def setUp(self) -> None:
@@ -64,6 +68,13 @@ class TestLevel1(TestCase):
                     mock_check_if_time_out.assert_called_once_with()
                     mock_blit_everything.assert_called_once_with(1)
 
+    def test_update_headless(self):
+        with patch.object(self.level1, 'handle_states'), \
+                patch.object(self.level1, 'blit_everything') as mock_blit_everything:
+            self.level1.update(None, self.keys, 3)
+            mock_blit_everything.assert_not_called()
+            self.assertEqual(self.level1.game_info[c.CURRENT_TIME], 3)
+
     def test_handle_states_case1(self):
         self.level1.state = c.FROZEN
         with patch.object(self.level1, 'update_during_transition_state') as mock_update_during_transition_state:
@@ -127,46 +138,90 @@ class TestLevel1(TestCase):
                         mock_update_2.assert_called_once_with(self.level1.game_info, self.level1.mario)
                         mock_check_to_add_flag_score.assert_called_once_with()
 
+    def test_update_all_sprites_sleeps_far_bricks(self):
+        self.level1.viewport = pg.Rect(0, 0, c.SCREEN_WIDTH, c.SCREEN_HEIGHT)
+        near, far = self.level1.brick_group.sprites()[0], self.level1.brick_group.sprites()[-1]
+        with patch.object(near, 'update') as mock_near, patch.object(far, 'update') as mock_far, \
+                patch.object(self.level1, 'check_points_check'), \
+                patch.object(self.level1, 'adjust_sprite_positions'):
+            self.level1.update_all_sprites(self.keys)
+            mock_near.assert_called_once_with()
+            mock_far.assert_not_called()
+        activation = self.level1.activation
+        self.assertEqual(activation.active + activation.sleeping,
+                         len(self.level1.brick_group) + len(self.level1.coin_box_group))
+        self.assertGreater(activation.sleeping, activation.active)
+
+    def fire(self, trigger):
+        self.level1.trigger_list = [trigger]
+        self.level1.viewport = pg.Rect(0, 0, c.SCREEN_WIDTH, c.SCREEN_HEIGHT)
+        self.level1.mario.rect = pg.Rect(trigger.rect.x, trigger.rect.y + 5, 10, 10)
+        self.level1.check_points_check()
+
     def test_check_points_check_case1(self):
-        checkpoint = pg.sprite.Sprite()
-        checkpoint.name = '1'
-        pg.sprite.spritecollideany = MagicMock(return_value=checkpoint)
         with patch.object(self.level1.enemy_group, 'add') as mock_add:
-            self.level1.check_points_check()
+            self.fire(checkpoint.Trigger(100, checkpoint.ENEMIES, 0))
             mock_add.assert_called_once_with(self.level1.enemy_group_list[0])
+        self.assertEqual(self.level1.trigger_list, [])
 
     def test_check_points_check_case2(self):
-        checkpoint = pg.sprite.Sprite()
-        checkpoint.name = '11'
-        checkpoint.rect = pg.Rect(100, 100, 50, 50)
-        pg.sprite.spritecollideany = MagicMock(return_value=checkpoint)
-        self.level1.mario.rect = pg.Rect(0, 0, 0, 0)
-        self.level1.check_points_check()
+        self.fire(checkpoint.Trigger(100, checkpoint.FLAG_POLE, y=5, width=6))
         self.assertEqual(self.level1.mario.state, c.FLAGPOLE)
         self.assertFalse(self.level1.mario.invincible)
+        self.assertEqual(self.level1.mario.flag_pole_right, 106)
         self.assertEqual(self.level1.mario.rect.bottom, self.level1.flag.rect.y)
         self.assertEqual(self.level1.flag.state, c.SLIDE_DOWN)
 
     def test_check_points_check_case3(self):
-        checkpoint = pg.sprite.Sprite()
-        checkpoint.name = '12'
-        pg.sprite.spritecollideany = MagicMock(return_value=checkpoint)
-        self.level1.check_points_check()
+        self.fire(checkpoint.Trigger(100, checkpoint.CASTLE))
         self.assertEqual(self.level1.state, c.IN_CASTLE)
         ##!BUG FOUND!: line 455 of level1.py does nothing
         self.assertTrue(self.level1.mario.in_castle)
         self.assertEqual(self.level1.overhead_info_display.state, c.FAST_COUNT_DOWN)
 
     def test_check_points_check_case4(self):
-        checkpoint = pg.sprite.Sprite()
-        checkpoint.name = 'secret_mushroom'
-        checkpoint.rect = pg.Rect(100, 100, 50, 50)
-        pg.sprite.spritecollideany = MagicMock(return_value=checkpoint)
         self.level1.mario.y_vel = -1
-        self.level1.check_points_check()
+        self.fire(checkpoint.Trigger(100, checkpoint.SECRET_MUSHROOM, y=100, width=40, height=12))
         self.assertEqual(self.level1.mario.y_vel, 7)
         self.assertEqual(self.level1.mario.state, c.FALL)
 
+    def test_check_points_check_mushroom_falling(self):
+        self.level1.mario.y_vel = 1
+        boxes = len(self.level1.coin_box_group)
+        self.fire(checkpoint.Trigger(100, checkpoint.SECRET_MUSHROOM, y=100, width=40, height=12))
+        self.assertEqual(self.level1.trigger_list, [])
+        self.assertEqual(len(self.level1.coin_box_group), boxes)
+        self.assertEqual(self.level1.mario.y_vel, 1)
+
+    def test_check_points_check_first_enemies(self):
+        self.level1.viewport = pg.Rect(0, 0, c.SCREEN_WIDTH, c.SCREEN_HEIGHT)
+        self.level1.mario.rect.x = 110
+        self.level1.check_points_check()
+        self.assertEqual(len(self.level1.trigger_list), 13)
+        self.level1.mario.rect.x = 505
+        self.level1.check_points_check()
+        self.assertEqual(len(self.level1.trigger_list), 12)
+        self.assertEqual(set(self.level1.enemy_group), set(self.level1.enemy_group_list[0]))
+        self.assertEqual(min(enemy.rect.x for enemy in self.level1.enemy_group), c.SCREEN_WIDTH)
+
+    def test_check_points_check_keeps_template(self):
+        trigger = self.level1.trigger_list[0]
+        self.fire(trigger)
+        self.assertNotIn(trigger, self.level1.trigger_list)
+        self.assertIn(trigger, Level1.template.triggers)
+        self.level1.startup(0, self.persist)
+        self.assertIn(trigger, self.level1.trigger_list)
+
+    def test_setup_template_is_shared(self):
+        colliders = self.level1.ground_step_pipe_group
+        bricks = self.level1.brick_group
+        self.level1.startup(0, self.persist)
+        self.assertIs(self.level1.ground_step_pipe_group, colliders)
+        self.assertIs(self.level1.ground_step_pipe_group, Level1.template.ground_step_pipe_group)
+        self.assertIsNot(self.level1.brick_group, bricks)
+        self.assertEqual(self.level1.trigger_list, list(Level1.template.triggers))
+        self.assertEqual(len(self.level1.trigger_list), 13)
+
     def test_create_flag_points_case1(self):
         self.level1.mario.rect.bottom = c.GROUND_HEIGHT
         self.level1.create_flag_points()
@@ -212,7 +267,7 @@ class TestLevel1(TestCase):
     def test_check_mario_x_collisions_case_brick(self):
         pg.sprite.spritecollideany = Mock()
         brick = pg.sprite.spritecollideany(self.level1.mario, self.level1.brick_group)
-        pg.sprite.spritecollideany.side_effect = [0, 0, brick, 0, 0, 0]
+        pg.sprite.spritecollideany.side_effect = [0, brick, 0, 0, 0, 0]
         with patch.object(self.level1, 'adjust_mario_for_x_collisions') as mock_adjust_mario_for_x_collisions:
             self.level1.check_mario_x_collisions()
             mock_adjust_mario_for_x_collisions.assert_called_once_with(brick)
@@ -220,7 +275,7 @@ class TestLevel1(TestCase):
     def test_check_mario_x_collisions_case_coin_box(self):
         pg.sprite.spritecollideany = Mock()
         coin_box = self.level1.coin_box_group.sprites()[0]
-        pg.sprite.spritecollideany.side_effect = [0, coin_box, 0, 0, 0, 0]
+        pg.sprite.spritecollideany.side_effect = [coin_box, 0, 0, 0, 0, 0]
         with patch.object(self.level1, 'adjust_mario_for_x_collisions') as mock_adjust_mario_for_x_collisions:
             self.level1.check_mario_x_collisions()
             mock_adjust_mario_for_x_collisions.assert_called_once_with(coin_box)
@@ -228,7 +283,7 @@ class TestLevel1(TestCase):
     def test_check_mario_x_collisions_case_collider(self):
         pg.sprite.spritecollideany = Mock()
         collider = pg.sprite.spritecollideany(self.level1.mario, self.level1.ground_step_pipe_group)
-        pg.sprite.spritecollideany.side_effect = [collider, 0, 0, 0, 0, 0]
+        pg.sprite.spritecollideany.side_effect = [0, 0, collider, 0, 0, 0]
         with patch.object(self.level1, 'adjust_mario_for_x_collisions') as mock_adjust_mario_for_x_collisions:
             self.level1.check_mario_x_collisions()
             mock_adjust_mario_for_x_collisions.assert_called_once_with(collider)
@@ -433,7 +488,7 @@ class TestLevel1(TestCase):
     def test_check_mario_y_collisions_case_brick(self):
         pg.sprite.spritecollideany = Mock()
         brick = self.level1.brick_group.sprites()[0]
-        pg.sprite.spritecollideany.side_effect = [0, 0, 0, brick, 0, 0]
+        pg.sprite.spritecollideany.side_effect = [0, brick, 0, 0, 0, 0]
         with patch.object(self.level1,
                           'adjust_mario_for_y_brick_collisions') as mock_adjust_mario_for_y_brick_collisions:
             with patch.object(self.level1, 'test_if_mario_is_falling') as mock_test_if_mario_is_falling:
@@ -444,7 +499,7 @@ class TestLevel1(TestCase):
     def test_check_mario_y_collisions_case_coin_box(self):
         pg.sprite.spritecollideany = Mock()
         coin_box = self.level1.coin_box_group.sprites()[0]
-        pg.sprite.spritecollideany.side_effect = [0, 0, 0, 0, coin_box, 0]
+        pg.sprite.spritecollideany.side_effect = [coin_box, 0, 0, 0, 0, 0]
         with patch.object(self.level1,
                           'adjust_mario_for_y_coin_box_collisions') as mock_adjust_mario_for_y_coin_box_collisions:
             with patch.object(self.level1, 'test_if_mario_is_falling') as mock_test_if_mario_is_falling:
@@ -455,7 +510,7 @@ class TestLevel1(TestCase):
     def test_check_mario_y_collisions_case_ground_step_or_pipe(self):
         pg.sprite.spritecollideany = Mock()
         ground_step_or_pipe = self.level1.ground_step_pipe_group.sprites()[0]
-        pg.sprite.spritecollideany.side_effect = [ground_step_or_pipe, 0, 0, 0, 0, 0]
+        pg.sprite.spritecollideany.side_effect = [0, 0, ground_step_or_pipe, 0, 0, 0]
         with patch.object(self.level1,
                           'adjust_mario_for_y_ground_pipe_collisions') as mock_adjust_mario_for_y_ground_pipe_collisions:
             with patch.object(self.level1, 'test_if_mario_is_falling') as mock_test_if_mario_is_falling:
@@ -467,7 +522,7 @@ class TestLevel1(TestCase):
         self.level1.mario.invincible = True
         pg.sprite.spritecollideany = Mock()
         enemy = self.level1.enemy_group_list[0].sprites()[0]
-        pg.sprite.spritecollideany.side_effect = [0, enemy, 0, 0, 0, 0]
+        pg.sprite.spritecollideany.side_effect = [0, 0, 0, enemy, 0, 0]
         with patch.object(self.level1, 'test_if_mario_is_falling') as mock_test_if_mario_is_falling:
             self.level1.check_mario_y_collisions()
             # mock_adjust_mario_for_y_ground_pipe_collisions.assert_called_once_with(ground_step_or_pipe)
@@ -478,7 +533,7 @@ class TestLevel1(TestCase):
         self.level1.mario.invincible = False
         pg.sprite.spritecollideany = Mock()
         enemy = self.level1.enemy_group_list[0].sprites()[0]
-        pg.sprite.spritecollideany.side_effect = [0, enemy, 0, 0, 0, 0]
+        pg.sprite.spritecollideany.side_effect = [0, 0, 0, enemy, 0, 0]
         with patch.object(self.level1, 'test_if_mario_is_falling') as mock_test_if_mario_is_falling:
             with patch.object(self.level1,
                               'adjust_mario_for_y_enemy_collisions') as mock_adjust_mario_for_y_enemy_collisions:
@@ -489,7 +544,7 @@ class TestLevel1(TestCase):
     def test_check_mario_y_collisions_case_shell(self):
         pg.sprite.spritecollideany = Mock()
         shell = self.level1.enemy_group_list[0].sprites()[0]
-        pg.sprite.spritecollideany.side_effect = [0, 0, shell, 0, 0, 0]
+        pg.sprite.spritecollideany.side_effect = [0, 0, 0, 0, shell, 0]
         with patch.object(self.level1, 'test_if_mario_is_falling') as mock_test_if_mario_is_falling:
             with patch.object(self.level1,
                               'adjust_mario_for_y_shell_collisions') as mock_adjust_mario_for_y_shell_collisions:
@@ -525,6 +580,20 @@ class TestLevel1(TestCase):
         o1, o2 = self.level1.prevent_collision_conflict(coin_box, brick)
         self.assertFalse(o1)
 
+    def test_check_for_closer_brick(self):
+        brick = self.level1.brick_group.sprites()[0]
+        coin_box = self.level1.coin_box_group.sprites()[0]
+        self.level1.mario.rect.centerx = brick.rect.centerx
+        pg.sprite.spritecollideany = Mock()
+        pg.sprite.spritecollideany.side_effect = [brick, 0, 0, 0, 0, 0]
+        self.assertEqual(self.level1.check_for_closer_brick(coin_box), ('brick', brick))
+
+    def test_check_for_closer_brick_no_brick(self):
+        coin_box = self.level1.coin_box_group.sprites()[0]
+        pg.sprite.spritecollideany = Mock()
+        pg.sprite.spritecollideany.side_effect = [0, 0, 0, 0, 0, 0]
+        self.assertEqual(self.level1.check_for_closer_brick(coin_box), ('coin_box', coin_box))
+
     # testing adjust_mario_for_y_coin_box_collisions when all if statements evaluate to true
     def test_adjust_mario_for_y_coin_box_collisions_all_ifs(self):
         coin_box = self.level1.coin_box_group.sprites()[0]
@@ -665,13 +734,13 @@ class TestLevel1(TestCase):
 
     def test_test_if_mario_is_falling_inner_if(self):
         pg.sprite.spritecollideany = Mock()
-        pg.sprite.spritecollideany.side_effect = [None, None]
+        pg.sprite.spritecollideany.side_effect = [None, None, None, None, None, None]
         self.level1.test_if_mario_is_falling()
         self.assertEqual(self.level1.mario.state, c.FALL)
 
     def test_test_if_mario_is_falling_inner_elif(self):
         pg.sprite.spritecollideany = Mock()
-        pg.sprite.spritecollideany.side_effect = [None, None]
+        pg.sprite.spritecollideany.side_effect = [None, None, None, None, None, None]
         self.level1.mario.state = c.WALKING_TO_CASTLE
         self.level1.test_if_mario_is_falling()
         self.assertEqual(self.level1.mario.state, c.END_OF_LEVEL_FALL)
@@ -944,6 +1013,23 @@ class TestLevel1(TestCase):
         self.assertEqual(shell.direction, c.RIGHT)
         self.assertEqual(shell.rect.left, collider.rect.right)
 
+    def test_check_shell_x_collisions_enemy_before_bump(self):
+        pg.sprite.spritecollideany = type(self).spritecollideany
+        pipe = self.level1.pipe_group.sprites()[0]
+        shell = self.level1.enemy_group_list[0].sprites()[0]
+        enemy = self.level1.enemy_group_list[1].sprites()[0]
+        shell.x_vel = 5
+        shell.rect.right = pipe.rect.left + 6
+        shell.rect.bottom = pipe.rect.bottom
+        # the enemy only overlaps the part of the shell that is pushed back out of the pipe
+        enemy.rect.left = pipe.rect.left + 2
+        enemy.rect.bottom = pipe.rect.bottom
+        self.level1.enemy_group.add(enemy)
+        self.level1.viewport = pg.Rect(0, 0, c.SCREEN_WIDTH, c.SCREEN_HEIGHT)
+        self.level1.check_shell_x_collisions(shell)
+        self.assertEqual(shell.rect.right, pipe.rect.left)
+        self.assertIn(enemy, self.level1.sprites_about_to_die_group)
+
     def test_check_shell_y_collisions_if(self):
         pg.sprite.spritecollideany = Mock()
         collider = self.level1.ground_step_pipe_group.sprites()[0]
@@ -1176,7 +1262,7 @@ class TestLevel1(TestCase):
         fireball = FireBall(0, 0, True)
         enemy = self.level1.enemy_group_list[0].sprites()[0]
         pg.sprite.spritecollideany = Mock()
-        pg.sprite.spritecollideany.side_effect = [None, enemy, None, None, None, None]
+        pg.sprite.spritecollideany.side_effect = [None, None, None, enemy, None, None]
         with patch.object(self.level1, 'fireball_kill') as mock_fireball_kill:
             self.level1.check_fireball_y_collisions(fireball)
             mock_fireball_kill.assert_called_once_with(fireball, enemy)
@@ -1185,7 +1271,7 @@ class TestLevel1(TestCase):
         fireball = FireBall(0, 0, True)
         shell = self.level1.enemy_group_list[0].sprites()[0]
         pg.sprite.spritecollideany = Mock()
-        pg.sprite.spritecollideany.side_effect = [None, None, shell, None, None, None]
+        pg.sprite.spritecollideany.side_effect = [None, None, None, None, shell, None]
         with patch.object(self.level1, 'fireball_kill') as mock_fireball_kill:
             self.level1.check_fireball_y_collisions(fireball)
             mock_fireball_kill.assert_called_once_with(fireball, shell)
@@ -1349,13 +1435,61 @@ class TestLevel1(TestCase):
         self.assertEqual(self.level1.next, c.GAME_OVER)
         self.assertTrue(self.level1.done)
 
+    def test_setup_background_is_shared(self):
+        background = self.level1.background
+        self.level1.startup(0, self.persist)
+        self.assertIs(self.level1.background, background)
+        self.assertEqual(self.level1.level_rect.size, background.get_size())
+
     def test_blit_everything(self):
         self.level1.moving_score_list.append(
             score.Score(self.level1.mario.rect.right - self.level1.viewport.x,
                         self.level1.mario.rect.y, 100))
         surface = MagicMock()
         self.level1.flag_score = MagicMock()
-        self.level1.level = MagicMock()
-        with patch.object(self.level1.level, 'blit') as mock_level_blit:
-            self.level1.blit_everything(surface)
-            mock_level_blit.assert_called_once_with(self.level1.background, self.level1.viewport, self.level1.viewport)
+        self.level1.blit_everything(surface)
+        surface.blit.assert_any_call(self.level1.background, (0, 0), self.level1.viewport)
+        self.level1.flag_score.draw.assert_called_once_with(surface, self.level1.viewport.x)
+
+    def test_blit_everything_dirty_rects(self):
+        self.level1.viewport = pg.Rect(0, 0, c.SCREEN_WIDTH, c.SCREEN_HEIGHT)
+        self.level1.dirty_rects = tools.DirtyRects(c.SCREEN_SIZE)
+        surface = pg.Surface(c.SCREEN_SIZE)
+        self.level1.blit_everything(surface)
+        self.assertTrue(self.level1.dirty_rects.full)
+        self.level1.blit_everything(surface)
+        self.assertFalse(self.level1.dirty_rects.full)
+        self.assertIn(self.level1.mario.rect, self.level1.dirty_rects.rects)
+        self.level1.dirty_rects.start_frame()
+        self.level1.viewport.x += 5
+        self.level1.blit_everything(surface)
+        self.assertTrue(self.level1.dirty_rects.full)
+        self.level1.dirty_rects = None
+
+    def test_draw_visible(self):
+        self.level1.viewport = pg.Rect(1000, 0, c.SCREEN_WIDTH, c.SCREEN_HEIGHT)
+        visible = Collider(1100, 200, 40, 40)
+        hidden = Collider(3000, 200, 40, 40)
+        surface = MagicMock()
+        self.level1.draw_visible(surface, pg.sprite.Group(visible, hidden))
+        surface.blit.assert_called_once_with(visible.image, (100, 200))
+
+    def test_draw_visible_skips_flickering_mario(self):
+        self.level1.viewport = pg.Rect(0, 0, c.SCREEN_WIDTH, c.SCREEN_HEIGHT)
+        self.level1.mario.rect.topleft = (100, 200)
+        surface = MagicMock()
+        self.level1.mario.visible = False
+        self.level1.draw_visible(surface, pg.sprite.Group(self.level1.mario))
+        surface.blit.assert_not_called()
+        self.level1.mario.visible = True
+        self.level1.draw_visible(surface, pg.sprite.Group(self.level1.mario))
+        surface.blit.assert_called_once_with(self.level1.mario.image, (100, 200))
+
+    def test_draw_visible_collider_grid(self):
+        self.level1.viewport = pg.Rect(0, 0, c.SCREEN_WIDTH, c.SCREEN_HEIGHT)
+        surface = MagicMock()
+        self.level1.draw_visible(surface, self.level1.brick_group)
+        on_screen = [brick for brick in self.level1.brick_group
+                     if brick.rect.colliderect(self.level1.viewport)]
+        self.assertEqual(surface.blit.call_count, len(on_screen))
+        self.assertLess(len(on_screen), len(self.level1.brick_group))
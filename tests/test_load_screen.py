@@ -61,6 +61,30 @@ class TestLoadScreen(TestCase):
             self.load_screen.update(surface, keys, 0)
             mock_update.assert_called_once_with(self.load_screen.game_info)
 
+    def test_draw_info_dirty_rects(self):
+        self.load_screen.startup(0, {c.COIN_TOTAL: 0, c.LIVES: 3, c.TOP_SCORE: 0})
+        self.load_screen.dirty_rects = tools.DirtyRects(c.SCREEN_SIZE)
+        surface = pg.Surface(c.SCREEN_SIZE)
+        self.load_screen.draw_info(surface)
+        self.assertTrue(self.load_screen.dirty_rects.full)
+        self.load_screen.draw_info(surface)
+        self.assertFalse(self.load_screen.dirty_rects.full)
+        self.assertEqual(self.load_screen.dirty_rects.rects, [])
+
+    def test_update_without_surface(self):
+        persist = {
+            c.COIN_TOTAL: 0,
+            c.SCORE: 0,
+            c.LIVES: 3,
+            c.TOP_SCORE: 0}
+        self.load_screen.startup(0, persist)
+        with patch.object(self.load_screen.overhead_info, 'draw') as mock_draw:
+            self.load_screen.update(None, {}, 0)
+            self.load_screen.update(None, {}, 2600)
+            mock_draw.assert_not_called()
+        self.load_screen.update(None, {}, 2700)
+        self.assertTrue(self.load_screen.done)
+
     def test_update_case_2(self):
         surface = MagicMock()
         keys = {
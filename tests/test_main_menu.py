@@ -45,6 +45,24 @@ class TestMainMenu(TestCase):
             self.assertEqual(self.menu.current_time, 0)
             self.assertEqual(self.menu.game_info[c.CURRENT_TIME], 0)
 
+    def test_update_without_surface(self):
+        with patch.object(self.menu.overhead_info, 'draw') as mock_draw:
+            self.menu.update(None, {pg.K_DOWN: False, pg.K_RETURN: False,
+                                    pg.K_a: False, pg.K_s: False}, 5)
+            mock_draw.assert_not_called()
+            self.assertEqual(self.menu.game_info[c.CURRENT_TIME], 5)
+
+    def test_update_dirty_rects(self):
+        self.menu.dirty_rects = tools.DirtyRects(c.SCREEN_SIZE)
+        self.menu.viewport = pg.Rect((0, 0), c.SCREEN_SIZE)
+        surface = pg.Surface(c.SCREEN_SIZE)
+        keys = {pg.K_DOWN: False, pg.K_RETURN: False, pg.K_a: False, pg.K_s: False}
+        self.menu.update(surface, keys, 0)
+        self.assertTrue(self.menu.dirty_rects.full)
+        self.menu.update(surface, keys, 16)
+        self.assertFalse(self.menu.dirty_rects.full)
+        self.assertIn(self.menu.cursor.rect, self.menu.dirty_rects.rects)
+
     def test_update_cursor_case_1(self):
         keys = {
             tools.keybinding['left']: False,
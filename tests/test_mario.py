@@ -1474,6 +1474,7 @@ class TestMario(TestCase):
         self.assertFalse(self.mario.hurt_invincible)
         self.assertEqual(self.mario.hurt_invisible_timer, 0)
         self.assertEqual(self.mario.hurt_invisible_timer2, 0)
+        self.assertTrue(self.mario.visible)
 
     def test_hurt_invincible_check_case_1(self):
         self.mario.hurt_invisible_timer = 0
@@ -1485,20 +1486,37 @@ class TestMario(TestCase):
     def test_hurt_invincible_check_case_2(self):
         self.mario.hurt_invisible_timer = 1
         self.mario.current_time = 10
-        self.mario.image = MagicMock()
-        with patch.object(self.mario.image, "set_alpha") as mock_set_alpha:
-            self.mario.hurt_invincible_check()
-            mock_set_alpha.assert_called_once_with(0)
+        self.mario.hurt_invincible_check()
+        self.assertFalse(self.mario.visible)
 
     def test_hurt_invincible_check_case_3(self):
         self.mario.hurt_invisible_timer = 1
         self.mario.current_time = 60
-        self.mario.image = MagicMock()
-        with patch.object(self.mario.image, "set_alpha") as mock_set_alpha:
-            self.mario.hurt_invincible_check()
-            mock_set_alpha.assert_called_once_with(255)
-            self.assertEqual(self.mario.hurt_invisible_timer,
-                             self.mario.current_time)
+        self.mario.visible = False
+        self.mario.hurt_invincible_check()
+        self.assertTrue(self.mario.visible)
+        self.assertEqual(self.mario.hurt_invisible_timer,
+                         self.mario.current_time)
+
+    def test_hurt_flicker_leaves_shared_frames_opaque(self):
+        other = Mario()
+        self.assertIs(self.mario.right_small_normal_frames[0], other.right_small_normal_frames[0])
+        self.mario.image = self.mario.right_small_normal_frames[0]
+        self.mario.hurt_invincible = True
+        self.mario.state = c.WALK
+        for time in (1, 2, 20):
+            self.mario.current_time = time
+            self.mario.check_if_hurt_invincible()
+        self.assertFalse(self.mario.visible)
+        self.assertTrue(other.visible)
+        for frames in other.all_images:
+            for image in frames:
+                self.assertIn(image.get_alpha(), (None, 255))
+
+    def test_start_death_jump_is_visible(self):
+        self.mario.visible = False
+        self.mario.start_death_jump({})
+        self.assertTrue(self.mario.visible)
 
     def test_check_if_crouching_else_branch(self):
         self.mario.crouching = True
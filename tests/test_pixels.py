@@ -0,0 +1,87 @@
+from unittest import TestCase
+
+import numpy as np
+import pygame as pg
+
+import SuperMarioLevel1.data.constants as c
+import SuperMarioLevel1.data.setup as setup
+import SuperMarioLevel1.data.tools as tools
+from SuperMarioLevel1.data import pixels
+from SuperMarioLevel1.data.batch_env import BatchEnv
+from SuperMarioLevel1.data.headless import Simulator
+from SuperMarioLevel1.data.pixels import FrameProcessor, PixelObservation
+
+
+RIGHT = tools.KEY_BITS[tools.keybinding['right']]
+
+
+# This is a test class for the view function and the FrameProcessor and PixelObservation classes in /data/pixels.py.
+# view exposes a surface's pixels as a NumPy view, FrameProcessor downsamples and grays them into an array
+# and PixelObservation stacks a BatchEnv's frames.
+# The tests check the results against copying the frame out with pg.image.tostring and processing that.
+class TestPixels(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        pg.init()
+        setup.SCREEN = pg.display.set_mode((c.SCREEN_WIDTH, c.SCREEN_HEIGHT))
+        cls.simulator = Simulator(render=True)
+        for frame in range(60):
+            cls.simulator.step(RIGHT)
+
+    def test_view_shares_memory(self):
+        surface = pg.Surface((4, 3))
+        frame = pixels.view(surface)
+        self.assertEqual(frame.shape, (3, 4, 3))
+        frame[1, 2] = (10, 20, 30)
+        del frame
+        self.assertEqual(tuple(surface.get_at((2, 1)))[:3], (10, 20, 30))
+
+    def test_simulator_pixels(self):
+        frame = self.simulator.pixels()
+        np.testing.assert_array_equal(frame, pixels.naive(self.simulator.surface, 1, False))
+        del frame
+        self.simulator.step(RIGHT)
+
+    def test_process_rgb(self):
+        for scale in (1, 3):
+            processor = FrameProcessor(scale)
+            out = np.empty(processor.shape, np.uint8)
+            processor.process(self.simulator.surface, out)
+            np.testing.assert_array_equal(out, pixels.naive(self.simulator.surface, scale, False))
+        self.assertEqual(FrameProcessor(3).shape, (200, 267, 3))
+
+    def test_process_grayscale(self):
+        processor = FrameProcessor(2, grayscale=True)
+        self.assertEqual(processor.shape, (300, 400))
+        out = np.empty(processor.shape, np.uint8)
+        processor.process(self.simulator.surface, out)
+        expected = pixels.naive(self.simulator.surface, 2, True)
+        self.assertLessEqual(np.abs(out.astype(int) - expected).max(), 1)
+
+    def test_observation_stack(self):
+        env = BatchEnv(2, PixelObservation(scale=8, grayscale=True, stack=3))
+        self.assertEqual(env.observations.shape, (2, 3, 75, 100))
+        first = env.reset().copy()
+        self.assertTrue((first[:, 0] == first[:, 2]).all())
+        frames = [first[0, 2]]
+        for step in range(5):
+            env.step([RIGHT, 0])
+            frames.append(env.observations[0, 2].copy())
+        np.testing.assert_array_equal(env.observations[0], frames[-3:])
+        self.assertFalse((frames[0] == frames[-1]).all())
+        self.assertTrue((env.observations[1][0] == env.observations[1][2]).all())
+
+    def test_observation_stack_after_episode(self):
+        fresh = BatchEnv(1, PixelObservation(scale=8, grayscale=True, stack=2))
+        fresh.reset()
+        first, rewards, dones = fresh.step([0])
+        env = BatchEnv(1, PixelObservation(scale=8, grayscale=True, stack=2))
+        env.reset()
+        for step in range(30):
+            env.step([RIGHT])
+        env.levels[0].mario.dead = True
+        env.step([0])
+        observations, rewards, dones = env.step([0])
+        self.assertTrue((observations[0, 0] == observations[0, 1]).all())
+        np.testing.assert_array_equal(observations[0, 1], first[0, 1])
@@ -0,0 +1,113 @@
+import os
+import tempfile
+from unittest import TestCase
+from unittest.mock import Mock
+
+import pygame as pg
+
+import SuperMarioLevel1.data.constants as c
+import SuperMarioLevel1.data.setup as setup
+import SuperMarioLevel1.data.tools as tools
+from SuperMarioLevel1.data import replay
+from SuperMarioLevel1.data.replay import Outcome, Player, Recorder, Recording
+
+
+RIGHT = tools.KEY_BITS[tools.keybinding['right']]
+JUMP = tools.KEY_BITS[tools.keybinding['jump']]
+START = tools.KEY_BITS[pg.K_RETURN]
+
+
+# This is a test class for the Recording, Recorder and Player classes in /data/replay.py.
+# A Recording is one key bitmask per fixed step stored as runs; the Recorder and Player are the
+# Control.replay hooks that write one while the game is played and feed one back in place of the keyboard.
+# The tests check that recordings survive the file format unchanged and that a playback ends where the run did.
+class TestReplay(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        pg.init()
+        setup.SCREEN = pg.display.set_mode((c.SCREEN_WIDTH, c.SCREEN_HEIGHT))
+
+    def setUp(self):
+        self.recording = Recording()
+        self.recording.add(0, 5)
+        self.recording.add(START, 3)
+        self.recording.add(0, 200)
+        for jump in range(10):
+            self.recording.add(RIGHT | (JUMP if jump % 2 else 0), 20)
+
+    def test_varint(self):
+        data = bytearray()
+        for value in (0, 127, 128, 300, 1 << 20):
+            replay.write_varint(data, value)
+        pos = 0
+        values = []
+        while pos < len(data):
+            value, pos = replay.read_varint(data, pos)
+            values.append(value)
+        self.assertEqual(values, [0, 127, 128, 300, 1 << 20])
+        self.assertEqual(len(data), 1 + 1 + 2 + 2 + 3)
+
+    def test_add(self):
+        recording = Recording()
+        recording.add(RIGHT)
+        recording.add(RIGHT)
+        recording.add(JUMP, 3)
+        self.assertEqual(recording.runs, [[RIGHT, 2], [JUMP, 3]])
+        self.assertEqual(recording.frames, 5)
+        self.assertEqual(list(recording.masks()), [RIGHT, RIGHT, JUMP, JUMP, JUMP])
+
+    def test_to_bytes_and_back(self):
+        self.recording.outcome = Outcome(408, 100, 1, 3, 398, 500, 498)
+        data = self.recording.to_bytes()
+        # a mask byte and a count byte per run, and a second byte for the count of 200
+        self.assertEqual(len(data), replay.HEADER.size + replay.OUTCOME.size + 2 * 13 + 1)
+        loaded = Recording.from_bytes(data)
+        self.assertEqual(loaded.runs, self.recording.runs)
+        self.assertEqual(loaded.outcome, self.recording.outcome)
+        self.assertEqual(loaded.fps, 60)
+
+    def test_from_bytes_rejects_other_files(self):
+        with self.assertRaises(ValueError):
+            Recording.from_bytes(b'not a replay at all')
+
+    def test_save_and_load(self):
+        directory = tempfile.mkdtemp()
+        path = os.path.join(directory, 'run.replay')
+        try:
+            self.recording.save(path)
+            self.assertEqual(Recording.load(path).runs, self.recording.runs)
+        finally:
+            os.remove(path)
+            os.rmdir(directory)
+
+    def test_recorder_step(self):
+        recorder = Recorder()
+        keys = tools.KeyMask(RIGHT | START)
+        self.assertIs(recorder.step(keys), keys)
+        recorder.step(keys)
+        self.assertEqual(recorder.recording.runs, [[RIGHT | START, 2]])
+        self.assertFalse(recorder.done)
+
+    def test_player_step(self):
+        player = Player(Recording(runs=[[RIGHT, 2]]))
+        keyboard = Mock()
+        self.assertTrue(player.step(keyboard)[tools.keybinding['right']])
+        self.assertTrue(player.step(keyboard)[tools.keybinding['right']])
+        self.assertFalse(player.done)
+        self.assertIs(player.step(keyboard), keyboard)
+        self.assertTrue(player.done)
+        self.assertEqual(player.frame, 2)
+
+    def test_outcome_before_level(self):
+        control = tools.Control('', tools.FixedStepClock())
+        control.setup_states({c.MAIN_MENU: tools._State()}, c.MAIN_MENU)
+        self.assertEqual(replay.outcome(control, 7), Outcome(7, 0, 0, 0, 0, 0, 0))
+
+    def test_play_is_repeatable(self):
+        result = replay.play(self.recording)
+        self.assertEqual(result.frames, self.recording.frames)
+        self.assertEqual(result.lives, 3)
+        self.assertGreater(result.x, 110)
+        self.assertEqual(replay.play(self.recording), result)
+        self.assertEqual(replay.play(self.recording, render=True), result)
@@ -0,0 +1,85 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+import numpy as np
+import pygame as pg
+
+import SuperMarioLevel1.data.constants as c
+import SuperMarioLevel1.data.setup as setup
+import SuperMarioLevel1.data.tools as tools
+from SuperMarioLevel1.data.batch_env import BatchEnv, StateObservation
+from SuperMarioLevel1.data.rollout import Ring, RolloutRunner
+from SuperMarioLevel1.data.states.level1 import Level1
+
+
+RIGHT = tools.KEY_BITS[tools.keybinding['right']]
+JUMP = tools.KEY_BITS[tools.keybinding['jump']]
+
+
+def finish_on_third_frame(update):
+    """A Level1.update that also ends the level on the third frame after
+    each start"""
+    def finishing(level, surface, keys, current_time):
+        update(level, surface, keys, current_time)
+        level.done = level.done or current_time > 2.5 * 1000 / 60
+    return finishing
+
+
+# This is a test class for the Ring and RolloutRunner classes in /data/rollout.py.
+# A RolloutRunner forks worker processes that each step a BatchEnv and write the results into a Ring,
+# a block of shared memory holding the last few steps of every env.
+# The tests check that the workers' envs play exactly as a BatchEnv in this process does.
+class TestRollout(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        pg.init()
+        setup.SCREEN = pg.display.set_mode((c.SCREEN_WIDTH, c.SCREEN_HEIGHT))
+
+    def test_ring(self):
+        ring = Ring(4, 3, StateObservation())
+        try:
+            self.assertEqual(ring.observations.shape, (4, 3, 9))
+            self.assertEqual(ring.rewards.shape, (4, 3))
+            self.assertEqual(ring.actions.shape, (3,))
+            ring.dones[2, 1] = True
+            self.assertTrue(Ring(4, 3, StateObservation(), ring.shm).dones[2, 1])
+            self.assertLessEqual(ring.nbytes, ring.shm.size)
+        finally:
+            ring.close(unlink=True)
+
+    def test_runner_matches_batch_env(self):
+        env = BatchEnv(4)
+        runner = RolloutRunner(2, 2, ring=8)
+        try:
+            np.testing.assert_array_equal(runner.reset(), env.reset())
+            for frame in range(60):
+                actions = np.array([RIGHT, RIGHT | JUMP, 0, JUMP if frame % 30 < 10 else RIGHT])
+                expected = env.step(actions)
+                for got, want in zip(runner.step(actions), expected):
+                    np.testing.assert_array_equal(got, want)
+            self.assertEqual(runner.recent(3).shape, (3, 4, 9))
+            np.testing.assert_array_equal(runner.recent(1)[0], env.observations)
+            self.assertEqual(runner.worker_stats()[1][0], 120)
+            self.assertEqual(runner.steps, 240)
+            self.assertGreater(runner.steps_per_second(), 0)
+        finally:
+            runner.close()
+
+    def test_runner_counts_frames_run(self):
+        with patch.object(Level1, 'update', finish_on_third_frame(Level1.update)):
+            runner = RolloutRunner(2, 1, ring=4)
+        try:
+            runner.reset()
+            runner.step(np.zeros(2, dtype=np.uint8), repeat=8)
+            self.assertEqual(runner.steps, 6)
+        finally:
+            runner.close()
+
+    def test_recent_longer_than_ring(self):
+        runner = RolloutRunner(1, 1, ring=4)
+        try:
+            with self.assertRaises(ValueError):
+                runner.recent(5)
+        finally:
+            runner.close()
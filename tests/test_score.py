@@ -4,6 +4,7 @@ from unittest.mock import MagicMock
 import pygame as pg
 
 import SuperMarioLevel1.data.constants as c
+from SuperMarioLevel1.data.components import score
 from SuperMarioLevel1.data.components.score import Score
 
 
@@ -91,6 +92,39 @@ class TestScore(TestCase):
         score2.y = score2.digit_list[0].rect.y + 76
         self.assertEqual(len(score_list), 2)
         score1.update(score_list, level_info)
-        self.assertEqual(len(score_list), 1)
-        self.assertNotIn(score1, score_list)
-        self.assertIn(score2, score_list)
+        self.assertEqual(len(score_list), 0)
+        self.assertIn(score1, score.POOL)
+        self.assertIn(score2, score.POOL)
+
+    def test_create_image_dict_shared(self):
+        self.assertIs(Score(0, 0, 200).image_dict, self.score.image_dict)
+        self.assertIs(self.score.image_dict, score.IMAGE_DICT)
+
+    def test_spawn_reuses_retired_score(self):
+        score.retire(self.score)
+        spawned = score.spawn(50, 60, 1000, flag_pole=True)
+        self.assertIs(spawned, self.score)
+        self.assertEqual(spawned.score_string, '1000')
+        self.assertEqual(len(spawned.digit_list), 4)
+        self.assertEqual((spawned.digit_list[3].rect.x, spawned.digit_list[3].rect.y), (80, 60))
+        self.assertEqual(spawned.y_vel, -4)
+        self.assertTrue(spawned.flag_pole_score)
+
+    def test_save_and_rebuild(self):
+        self.score.update(None, {})
+        saved = self.score.save()
+        rebuilt = score.rebuild(saved)
+        self.assertIsNot(rebuilt, self.score)
+        self.assertEqual(rebuilt.save(), saved)
+        self.assertEqual([digit.rect for digit in rebuilt.digit_list],
+                         [digit.rect for digit in self.score.digit_list])
+
+    def test_update_scores(self):
+        score1 = Score(100, 100, 200)
+        score2 = Score(200, 200, 500)
+        score2.y += 75
+        score_list = [score1, score2]
+        score.update_scores(score_list, {})
+        self.assertEqual(score_list, [score1])
+        self.assertEqual(score1.digit_list[0].rect.y, 97)
+        self.assertIn(score2, score.POOL)
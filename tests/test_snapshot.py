@@ -0,0 +1,136 @@
+from unittest import TestCase
+
+import pygame as pg
+
+import SuperMarioLevel1.data.constants as c
+import SuperMarioLevel1.data.setup as setup
+import SuperMarioLevel1.data.tools as tools
+from SuperMarioLevel1.data import snapshot
+from SuperMarioLevel1.data.components import score
+from SuperMarioLevel1.data.headless import Simulator
+
+
+RUN = tools.KEY_BITS[tools.keybinding['right']] | tools.KEY_BITS[tools.keybinding['action']]
+JUMP = tools.KEY_BITS[tools.keybinding['jump']]
+
+
+# This is a test class for the Snapshot class and the take and restore functions in /data/snapshot.py.
+# A snapshot holds the whole simulation state of a Level1 (attributes, shared containers, rects and
+# group membership), taken through Level1.snapshot and put back with Level1.restore.
+# The tests check that a restored level plays out exactly as it did the first time, however often it is restored.
+class TestSnapshot(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        pg.init()
+        setup.SCREEN = pg.display.set_mode((c.SCREEN_WIDTH, c.SCREEN_HEIGHT))
+
+    def setUp(self):
+        self.simulator = Simulator()
+        self.level = self.simulator.level
+        for frame in range(60):
+            self.simulator.step(RUN)
+
+    def play(self, frames):
+        """Steps the simulator and returns Mario's rect and the score each frame"""
+        trace = []
+        for frame in range(frames):
+            self.simulator.step(RUN | JUMP if frame // 20 % 2 else RUN)
+            trace.append((tuple(self.level.mario.rect), self.level.mario.state,
+                          self.level.game_info[c.SCORE], self.level.viewport.x))
+        return trace
+
+    def test_take_leaves_out_template(self):
+        snap = self.level.snapshot()
+        objects = [obj for obj, attrs in snap.objects]
+        self.assertIn(self.level, objects)
+        self.assertIn(self.level.mario, objects)
+        self.assertIn(self.level.overhead_info_display, objects)
+        self.assertNotIn(self.level.ground_group.sprites()[0], objects)
+        self.assertNotIn(self.level.ground_step_pipe_group, [group for group, members, cells in snap.groups])
+        self.assertTrue(any(container is self.level.trigger_list for container, copy in snap.containers))
+
+    def test_take_holds_no_surface_copies(self):
+        snap = self.level.snapshot()
+        level_attrs = snap.objects[0][1]
+        self.assertIs(level_attrs['background'], self.level.background)
+        self.assertNotIn('profiler', level_attrs)
+        self.assertNotIn('_Sprite__g', dict(snap.objects)[self.level.mario])
+        self.assertLess(snap.nbytes(), 1 << 20)
+
+    def test_restore(self):
+        snap = self.level.snapshot()
+        viewport = self.level.viewport
+        mario_rect = tuple(self.level.mario.rect)
+        self.play(120)
+        self.level.restore(snap)
+        self.assertIs(self.level.viewport, viewport)
+        self.assertEqual(tuple(self.level.mario.rect), mario_rect)
+        self.assertIs(self.level.sound_manager.game_info, self.level.game_info)
+        self.assertIsNone(self.level.drawn_viewport)
+        info = self.level.overhead_info_display
+        self.assertEqual(info.changed_rect(), info.hud_rect)
+
+    def test_restore_replays_the_same_frames(self):
+        snap = self.simulator.snapshot()
+        first = self.play(300)
+        for attempt in range(2):
+            self.simulator.restore(snap)
+            self.assertEqual(self.play(300), first)
+
+    def test_restore_group_membership(self):
+        snap = self.level.snapshot()
+        enemy = self.level.enemy_group_list[0].sprites()[0]
+        brick = self.level.brick_group.sprites()[0]
+        cells = self.level.brick_group.sprite_cells[brick]
+        enemy.kill()
+        brick.kill()
+        self.level.restore(snap)
+        self.assertIn(enemy, self.level.enemy_group_list[0])
+        self.assertIn(brick, self.level.brick_group)
+        self.assertEqual(self.level.brick_group.sprite_cells[brick], cells)
+        self.assertIn(brick, self.level.brick_group.within(brick.rect))
+
+    def test_restore_rebuilds_scores(self):
+        floating_score = score.spawn(100, 100, 200)
+        self.level.moving_score_list.append(floating_score)
+        snap = self.level.snapshot()
+        floating_score.y_vel = 0
+        floating_score.digit_list[0].rect.y -= 100
+        score.delete_finished_scores(self.level.moving_score_list)
+        self.assertIn(floating_score, score.POOL)
+        snapshot.restore(snap)
+        restored, = self.level.moving_score_list
+        self.assertEqual(restored.y_vel, -3)
+        self.assertEqual(restored.digit_list[0].rect.y, 100)
+        self.assertNotIn(restored, score.POOL)
+
+    def test_restore_leaves_other_levels_scores_alone(self):
+        floating_score = score.spawn(100, 100, 200)
+        self.level.moving_score_list.append(floating_score)
+        snap = self.level.snapshot()
+        score.retire(self.level.moving_score_list.pop())
+        other = Simulator().level
+        other.moving_score_list.append(score.spawn(300, 400, 1000))
+        self.assertIs(other.moving_score_list[0], floating_score)
+        snapshot.restore(snap)
+        self.assertIsNot(self.level.moving_score_list[0], floating_score)
+        self.assertEqual(self.level.moving_score_list[0].save()[:4], (100, 100, -3, '200'))
+        self.assertEqual(floating_score.save()[:4], (300, 400, -3, '1000'))
+        self.assertNotIn(floating_score, score.POOL)
+
+    def test_restore_flag_score(self):
+        self.level.flag_score = score.spawn(8518, 400, 5000, True)
+        snap = self.level.snapshot()
+        saved = self.level.flag_score.save()
+        self.level.flag_score.update(None, {})
+        snapshot.restore(snap)
+        self.assertEqual(self.level.flag_score.save(), saved)
+        self.level.restore(snap)
+        self.assertEqual(self.level.flag_score.save(), saved)
+
+    def test_nbytes_counts_values_once(self):
+        snap = self.level.snapshot()
+        nbytes = snap.nbytes()
+        self.assertGreater(nbytes, sum(len(attrs) for obj, attrs in snap.objects) * 8)
+        self.assertEqual(snap.nbytes(), nbytes)
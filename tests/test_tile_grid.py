@@ -0,0 +1,116 @@
+import os
+import subprocess
+import sys
+from unittest import TestCase
+
+import numpy as np
+import pygame as pg
+
+import SuperMarioLevel1.data.constants as c
+import SuperMarioLevel1.data.setup as setup
+import SuperMarioLevel1.data.tools as tools
+from SuperMarioLevel1.data import tile_grid
+from SuperMarioLevel1.data.batch_env import BatchEnv
+from SuperMarioLevel1.data.headless import Simulator
+from SuperMarioLevel1.data.tile_grid import TileGridEncoder, TileGridObservation
+
+
+RIGHT = tools.KEY_BITS[tools.keybinding['right']]
+
+
+# This is a test class for the TileGridEncoder and TileGridObservation classes in /data/tile_grid.py.
+# The encoder writes the tiles around Mario as a small grid of codes, read from the Level1 sprite groups
+# and colliders without drawing anything.
+# The tests check that the ground, pipes, bricks, coin boxes, enemies and Mario land in the right cells.
+class TestTileGrid(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        pg.init()
+        setup.SCREEN = pg.display.set_mode((c.SCREEN_WIDTH, c.SCREEN_HEIGHT))
+
+    def setUp(self):
+        self.simulator = Simulator()
+        self.level = self.simulator.level
+        self.encoder = TileGridEncoder()
+        self.grid = np.zeros(self.encoder.shape, np.uint8)
+
+    def encode(self):
+        return self.encoder.encode(self.level, self.grid)
+
+    def cell(self, x, y, left):
+        return int((y - tile_grid.ORIGIN_Y) // tile_grid.CELL), int((x - left) // tile_grid.CELL)
+
+    def test_solid_cells(self):
+        cells = self.encoder.solid_cells(self.level)
+        self.assertIs(self.encoder.solid_cells(self.level), cells)
+        self.assertIs(TileGridEncoder().solid_cells(self.level), cells)
+        ground = int((c.GROUND_HEIGHT - tile_grid.ORIGIN_Y) / tile_grid.CELL)
+        self.assertTrue((cells[ground, :68] == tile_grid.SOLID).all())
+        # the first gap in the ground
+        self.assertEqual(cells[ground, 70], tile_grid.EMPTY)
+        self.assertEqual(cells[ground - 1, 28], tile_grid.SOLID)
+        self.assertEqual(cells[ground - 3, 28], tile_grid.EMPTY)
+
+    def test_encode_start(self):
+        left = self.encode()
+        self.assertEqual(left, 0)
+        mario = self.level.mario.rect
+        self.assertEqual(self.grid[self.cell(mario.centerx, mario.centery, left)], tile_grid.MARIO)
+        self.assertEqual((self.grid == tile_grid.MARIO).sum(), 1)
+        self.assertTrue((self.grid[self.cell(0, c.GROUND_HEIGHT + 10, left)[0]] == tile_grid.SOLID).all())
+
+    def test_encode_bricks_and_boxes(self):
+        self.level.mario.rect.x = 900
+        left = self.encode()
+        self.assertEqual(left, (900 + self.level.mario.rect.width // 2) // tile_grid.CELL * tile_grid.CELL
+                         - 8 * tile_grid.CELL)
+        brick = self.level.brick_group.sprites()[0]
+        box = self.level.coin_box_group.within(brick.rect.inflate(200, 0))[0]
+        self.assertEqual(self.grid[self.cell(brick.rect.centerx, brick.rect.centery, left)], tile_grid.BRICK)
+        self.assertEqual(self.grid[self.cell(box.rect.centerx, box.rect.centery, left)], tile_grid.COIN_BOX)
+        box.state = c.OPENED
+        self.encode()
+        self.assertEqual(self.grid[self.cell(box.rect.centerx, box.rect.centery, left)], tile_grid.SOLID)
+
+    def test_encode_enemies(self):
+        for frame in range(150):
+            self.simulator.step(RIGHT)
+        self.assertTrue(self.level.enemy_group)
+        enemy = self.level.enemy_group.sprites()[0]
+        self.level.mario.rect.centerx = enemy.rect.centerx - 100
+        left = self.encode()
+        self.assertEqual(self.grid[self.cell(enemy.rect.centerx, enemy.rect.centery, left)], tile_grid.ENEMY)
+
+    def test_encode_big_mario(self):
+        self.level.mario.become_big()
+        self.level.mario.rect.bottom = c.GROUND_HEIGHT
+        self.encode()
+        self.assertEqual((self.grid == tile_grid.MARIO).sum(), 2)
+
+    def test_encode_end_of_level(self):
+        self.level.mario.rect.x = self.level.level_rect.right - 20
+        left = self.encode()
+        self.assertEqual(left, (self.encoder.solid_cells(self.level).shape[1] - 16) * tile_grid.CELL)
+        self.assertEqual(self.grid[:, -1].max(), tile_grid.MARIO)
+
+    def test_observation(self):
+        env = BatchEnv(2, TileGridObservation(columns=12, rows=14))
+        self.assertEqual(env.observations.shape, (2, 14, 12))
+        self.assertIsNone(env.simulators[0].surface)
+        observations = env.reset()
+        self.assertEqual((observations == tile_grid.MARIO).sum(), 2)
+        for frame in range(30):
+            observations, rewards, dones = env.step([RIGHT, 0])
+        self.assertTrue((observations[0] != observations[1]).any())
+
+    def test_import_stays_headless(self):
+        package_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(tile_grid.__file__))))
+        env = dict(os.environ, PYTHONPATH=package_root)
+        env.pop('MARIO_HEADLESS', None)
+        code = ('from SuperMarioLevel1.data.tile_grid import TileGridObservation\n'
+                'from SuperMarioLevel1.data import setup\n'
+                'import pygame\n'
+                'print(setup.HEADLESS, pygame.display.get_surface() is None)')
+        output = subprocess.run([sys.executable, '-c', code], env=env, capture_output=True, text=True).stdout
+        self.assertEqual(output.split()[-2:], ['True', 'True'])
@@ -1,11 +1,13 @@
 from unittest import TestCase
-from unittest.mock import MagicMock, patch, Mock
+from unittest.mock import MagicMock, patch, Mock, mock_open
 
 import pygame as pg
 
 import SuperMarioLevel1.data.constants as c
 from SuperMarioLevel1.data.tools import Control
 from SuperMarioLevel1.data.tools import _State
+from SuperMarioLevel1.data.tools import FrameBank, KeyMask, mask_from_keys, KEY_BITS, keybinding
+from SuperMarioLevel1.data.tools import FixedStepClock, RealTimeClock, DirtyRects, FrameProfiler
 
 
 # This is a test class for the Control an _State classes in /data/tools.py.
@@ -114,6 +116,36 @@ class TestTools(TestCase):
             self.assertFalse(self.control.show_fps)
             mock_set_caption.assert_called()
 
+    def test_toggle_show_profile(self):
+        control = Control(self.caption, dirty_rects=True)
+        control.toggle_show_fps(pg.K_F6)
+        self.assertTrue(control.show_profile)
+        control.toggle_show_fps(pg.K_F6)
+        self.assertFalse(control.show_profile)
+        self.assertTrue(control.dirty_rects.stale)
+
+    def test_draw_profile(self):
+        self.control.profiler.start('update')
+        self.control.profiler.stop('update')
+        self.control.profiler.end_frame()
+        self.control.draw_profile()
+        self.assertIsNone(self.control.profile_image)
+        self.control.show_profile = True
+        self.control.draw_profile()
+        self.assertIsNotNone(self.control.profile_image)
+
+    def test_main_dumps_profile(self):
+        self.control.state = _State()
+        self.control.profile_path = 'profile.txt'
+        stop = lambda: setattr(self.control, 'done', True)
+        with patch.object(self.control, "event_loop", new=stop), \
+                patch.object(pg.display, "update"), \
+                patch.object(self.control.profiler, "dump") as mock_dump:
+            self.control.main()
+            mock_dump.assert_called_once_with('profile.txt')
+        self.assertEqual(self.control.profiler.phases,
+                         ['event_loop', 'update', 'display', 'tick'])
+
     # dumb idea: maybe have mock_set_caption set done to true?
     def test_main(self):
         self.control.state = _State()
@@ -127,6 +159,37 @@ class TestTools(TestCase):
             mock_event_loop.assert_called()
             mock_update.assert_called()
 
+    def test_update_without_drawing(self):
+        self.control.state = Mock(quit=False, done=False)
+        self.control.game_clock = Mock(get_ticks=Mock(return_value=50))
+        self.control.update(draw=False)
+        self.control.state.update.assert_called_once_with(None, self.control.keys, 50)
+
+    def test_default_clock_is_real_time(self):
+        self.assertIsInstance(self.control.game_clock, RealTimeClock)
+        self.assertIsInstance(self.control.game_clock.get_ticks(), int)
+
+    def test_fixed_step_main(self):
+        clock = FixedStepClock()
+        control = Control(self.caption, clock)
+        control.state = _State()
+        calls = []
+
+        def update(draw=True):
+            calls.append(draw)
+            if clock.frame >= 3:
+                control.done = True
+
+        ticks = iter([0, 50, 100])
+        with patch.object(control, "event_loop"), \
+                patch.object(control, "update", new=update), \
+                patch.object(pg.time, "get_ticks", new=lambda: next(ticks)), \
+                patch.object(pg.display, "update") as mock_update:
+            control.main()
+            mock_update.assert_called_once_with()
+        self.assertEqual(clock.frame, 3)
+        self.assertEqual(calls, [False, False, True])
+
     # get_event is not implemented
     def test_get_event(self):
         self.state.get_event(Mock())
@@ -145,3 +208,238 @@ class TestTools(TestCase):
     # update is not implemented
     def test_update(self):
         self.state.update("a", "b", "c")
+
+    def test_setup_states_shares_dirty_rects(self):
+        control = Control(self.caption, dirty_rects=True)
+        control.setup_states({c.MAIN_MENU: self.state}, c.MAIN_MENU)
+        self.assertIs(self.state.dirty_rects, control.dirty_rects)
+
+    def test_update_display_dirty_rects(self):
+        control = Control(self.caption, dirty_rects=True)
+        control.dirty_rects.add_all([pg.Rect(0, 0, 10, 10)])
+        with patch("pygame.display.update") as mock_update:
+            control.update_display()
+            mock_update.assert_called_once_with([pg.Rect(0, 0, 10, 10)])
+
+    def test_update_display_full(self):
+        with patch("pygame.display.update") as mock_update:
+            self.control.update_display()
+            mock_update.assert_called_once_with()
+
+    def test_update_with_replay(self):
+        self.control.state = Mock(quit=False, done=False)
+        self.control.replay = Mock(done=False, step=Mock(return_value=KeyMask(1)))
+        self.control.update(draw=False)
+        self.assertEqual(self.control.keys.mask, 1)
+        self.control.state.update.assert_called_once_with(None, self.control.keys, self.control.current_time)
+        self.control.replay.done = True
+        self.control.update(draw=False)
+        self.assertTrue(self.control.done)
+        self.assertEqual(self.control.state.update.call_count, 1)
+
+    def test_fast_main(self):
+        clock = FixedStepClock()
+        control = Control(self.caption, clock)
+        control.state = Mock(quit=False, done=False)
+        control.state.update.side_effect = lambda surface, keys, current_time: \
+            setattr(control, 'done', clock.frame >= 3)
+        control.fast_main()
+        self.assertEqual(clock.frame, 3)
+        self.assertEqual(control.state.update.call_args[0][0], None)
+
+    def test_key_mask_menu_keys(self):
+        keys = KeyMask(KEY_BITS[pg.K_RETURN])
+        self.assertTrue(keys[pg.K_RETURN])
+        self.assertFalse(keys[pg.K_UP])
+        self.assertEqual(mask_from_keys(keys), keys.mask)
+
+    def test_key_mask(self):
+        keys = KeyMask(KEY_BITS[keybinding['jump']] | KEY_BITS[keybinding['right']])
+        self.assertTrue(keys[keybinding['jump']])
+        self.assertTrue(keys[keybinding['right']])
+        self.assertFalse(keys[keybinding['left']])
+        self.assertFalse(keys[pg.K_RETURN])
+        self.assertEqual(mask_from_keys(keys), keys.mask)
+
+
+# This is a test class for the FixedStepClock class in /data/tools.py.
+# This class represents game time that only advances in exact fixed steps.
+# There is at least one test for each FixedStepClock method, asserting that game time and the accumulator are
+# advanced by whole steps.
+class TestFixedStepClock(TestCase):
+
+    def setUp(self):
+        self.clock = FixedStepClock(60)
+
+    def test_tick(self):
+        self.assertEqual(self.clock.get_ticks(), 0)
+        self.clock.tick()
+        self.clock.tick()
+        self.clock.tick()
+        self.assertAlmostEqual(self.clock.get_ticks(), 50.0)
+        self.assertEqual(self.clock.frame, 3)
+
+    def test_add_time(self):
+        self.assertEqual(self.clock.add_time(10), 0)
+        self.assertEqual(self.clock.add_time(10), 1)
+        self.assertAlmostEqual(self.clock.accumulator, 20 - 1000 / 60.0)
+        self.assertEqual(self.clock.add_time(1000 / 30.0), 2)
+
+    def test_add_time_is_capped(self):
+        self.assertEqual(self.clock.add_time(10000), self.clock.max_steps)
+        self.assertEqual(self.clock.accumulator, 0.0)
+
+
+# This is a test class for the DirtyRects class in /data/tools.py.
+# This class represents the screen areas changed during one frame.
+# There is at least one test for each DirtyRects method, asserting that full and partial frames are told apart and
+# the pixel counts are kept up to date.
+class TestDirtyRects(TestCase):
+
+    def setUp(self):
+        self.dirty_rects = DirtyRects((100, 50))
+
+    def test_full_frame(self):
+        self.dirty_rects.start_frame()
+        self.assertIsNone(self.dirty_rects.finish_frame())
+        self.assertEqual(self.dirty_rects.pixels, 5000)
+
+    def test_partial_frame(self):
+        self.dirty_rects.start_frame()
+        self.dirty_rects.add_all([pg.Rect(0, 0, 10, 10), pg.Rect(90, 40, 20, 20)])
+        rects = self.dirty_rects.finish_frame()
+        self.assertEqual(rects, [pg.Rect(0, 0, 10, 10), pg.Rect(90, 40, 10, 10)])
+        self.assertEqual(self.dirty_rects.pixels, 200)
+
+    def test_empty_partial_frame(self):
+        self.dirty_rects.start_frame()
+        self.dirty_rects.add_all([])
+        self.assertEqual(self.dirty_rects.finish_frame(), [])
+        self.assertEqual(self.dirty_rects.pixels, 0)
+
+    def test_average_pixels(self):
+        self.assertEqual(self.dirty_rects.average_pixels(), 0.0)
+        self.dirty_rects.finish_frame()
+        self.dirty_rects.start_frame()
+        self.dirty_rects.add_all([])
+        self.dirty_rects.finish_frame()
+        self.assertEqual(self.dirty_rects.average_pixels(), 2500.0)
+
+
+# This is a test class for the FrameProfiler class in /data/tools.py.
+# This class represents the per-frame phase timer behind the F6 overlay.
+# There is at least one test for each FrameProfiler method, asserting that phase times are summed per frame and the
+# rolling percentiles are reported and written out.
+class TestFrameProfiler(TestCase):
+
+    def setUp(self):
+        self.profiler = FrameProfiler(window=100)
+
+    def add_frame(self, **phases):
+        self.profiler.frame_times = dict(phases)
+        self.profiler.end_frame()
+
+    def test_start_stop_sums_phase(self):
+        with patch("time.perf_counter", side_effect=[1.0, 1.002, 2.0, 2.003]):
+            self.profiler.start('update')
+            self.profiler.stop('update')
+            self.profiler.start('update')
+            self.profiler.stop('update')
+        self.assertAlmostEqual(self.profiler.frame_times['update'], 5.0)
+
+    def test_disabled(self):
+        profiler = FrameProfiler(enabled=False)
+        profiler.start('update')
+        profiler.stop('update')
+        profiler.end_frame()
+        self.assertEqual(profiler.frames, 0)
+        self.assertEqual(profiler.samples, {})
+
+    def test_percentiles(self):
+        for ms in range(1, 101):
+            self.add_frame(update=float(ms))
+        self.assertEqual(self.profiler.percentiles('update'), [51.0, 95.0, 99.0])
+
+    def test_window(self):
+        for ms in range(150):
+            self.add_frame(update=float(ms))
+        self.assertEqual(len(self.profiler.samples['update']), 100)
+        self.assertEqual(self.profiler.frames, 150)
+
+    def test_report(self):
+        self.add_frame(event_loop=1.0, update=2.0)
+        lines = self.profiler.report()
+        self.assertEqual(len(lines), 3)
+        self.assertTrue(lines[2].startswith('update'))
+
+    def test_dump(self):
+        self.add_frame(update=2.0)
+        with patch("builtins.open", mock_open()) as mock_file:
+            self.profiler.dump('profile.txt')
+            mock_file.assert_called_once_with('profile.txt', 'w')
+
+
+# This is a test class for the FrameBank class in /data/tools.py.
+# This class represents the process-wide cache of frames cut out of the sprite sheets.
+# There is at least one test for each FrameBank method, asserting that frames are shared between callers and the
+# hit/miss and memory counters are kept up to date.
+class TestFrameBank(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        pg.init()
+        pg.display.set_mode((c.SCREEN_WIDTH, c.SCREEN_HEIGHT))
+
+    @classmethod
+    def tearDownClass(cls):
+        pg.quit()
+
+    def setUp(self):
+        self.bank = FrameBank()
+        self.sheet = pg.Surface((32, 32))
+        self.sheet.fill(c.RED)
+
+    def test_get_image_scales_and_colorkeys(self):
+        image = self.bank.get_image(self.sheet, 0, 0, 16, 8, 2.5, c.BLACK)
+        self.assertEqual(image.get_size(), (40, 20))
+        self.assertEqual(image.get_colorkey()[:3], c.BLACK)
+        self.assertEqual(image.get_at((0, 0))[:3], c.RED)
+
+    def test_get_image_is_shared(self):
+        image1 = self.bank.get_image(self.sheet, 0, 0, 16, 16, 2, c.BLACK)
+        image2 = self.bank.get_image(self.sheet, 0, 0, 16, 16, 2, c.BLACK)
+        image3 = self.bank.get_image(self.sheet, 0, 0, 16, 16, 3, c.BLACK)
+        self.assertIs(image1, image2)
+        self.assertIsNot(image1, image3)
+        self.assertEqual(self.bank.hits, 1)
+        self.assertEqual(self.bank.misses, 2)
+
+    def test_flip(self):
+        image = self.bank.get_image(self.sheet, 0, 0, 8, 4, 1, c.BLACK)
+        flipped = self.bank.flip(image, True, False)
+        self.assertIs(flipped, self.bank.flip(image, True, False))
+        self.assertIs(self.bank.flip(flipped, True, False), image)
+
+    def test_flip_uncached_image(self):
+        image = pg.Surface((4, 4))
+        flipped = self.bank.flip(image, False, True)
+        self.assertEqual(flipped.get_size(), (4, 4))
+        self.assertEqual(self.bank.stats()['frames'], 0)
+
+    def test_get_scaled_is_shared(self):
+        image = self.bank.get_scaled(self.sheet, (64, 16))
+        self.assertEqual(image.get_size(), (64, 16))
+        self.assertIs(self.bank.get_scaled(self.sheet, (64, 16)), image)
+        self.assertIsNot(self.bank.get_scaled(self.sheet, (32, 16)), image)
+        self.assertEqual(self.bank.hits, 1)
+        self.assertEqual(self.bank.misses, 2)
+
+    def test_stats_and_clear(self):
+        self.bank.get_image(self.sheet, 0, 0, 16, 16, 1, c.BLACK)
+        stats = self.bank.stats()
+        self.assertEqual(stats['frames'], 1)
+        self.assertEqual(stats['misses'], 1)
+        self.assertGreaterEqual(stats['bytes'], 16 * 16 * 3)
+        self.bank.clear()
+        self.assertEqual(self.bank.stats(), {'frames': 0, 'hits': 0,
+                                             'misses': 0, 'bytes': 0})